@@ -2,14 +2,15 @@ import customtkinter as ctk
 import json
 import os
 import shutil
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import subprocess
 import sys
 import threading
 import queue
 import ctypes
 
-from project_store import ProjectStore, CleanState, MESH_ALIGNED, MESH_GRADED
+import perf_trace
+from project_store import ProjectStore, CleanState, MESH_ALIGNED, MESH_GRADED, TRACE_DIR
 
 # Hide the console window so running as .py looks like .pyw (no terminal).
 # A real (hidden) console still exists, so child processes (e.g. NumCalc.exe)
@@ -33,6 +34,60 @@ COLOR_ERROR = "#C0392B"
 HOVER_ACTIVE = "#209F69"
 HOVER_DONE = "#36719F"
 
+# perf_trace worker name -> workflow step shown in the Performance panel
+PERF_STEPS = {
+    "import_mesh": "Import Mesh",
+    "process_and_grade": "3. Process & Grade",
+    "generate_sofa_outputs": "7. Generate SOFA",
+}
+
+
+def _fmt_duration(seconds):
+    if seconds is None:
+        return "—"
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    m, s = divmod(int(round(seconds)), 60)
+    return f"{m // 60}h {m % 60:02d}m" if m >= 60 else f"{m}m {s:02d}s"
+
+
+def _fmt_mb(mb):
+    if mb is None:
+        return "—"
+    return f"{mb / 1024:.2f} GB" if mb >= 1024 else f"{mb:.0f} MB"
+
+
+def _fmt_change(seconds, before):
+    """'+35%' style change vs the previous run, '▲' prefixed when it is a
+    regression (perf_trace.is_regression)."""
+    if seconds is None or not before:
+        return ""
+    txt = f"{(seconds / before - 1) * 100:+.0f}%"
+    return "▲ " + txt if perf_trace.is_regression(seconds, before) else txt
+
+
+def _cpu_seconds(rec):
+    """CPU of a run or stage record: the worker's own plus its child
+    processes' (grading binary, Blender), or None when neither was recorded."""
+    if rec.get("cpu_s") is None and rec.get("child_cpu_s") is None:
+        return None
+    return rec.get("cpu_s", 0.0) + rec.get("child_cpu_s", 0.0)
+
+
+def _scripts_version():
+    """Release of these scripts (first '## vX.Y.Z' heading of CHANGELOG.md),
+    stored with each timed run so slowdowns after an upgrade stand out."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CHANGELOG.md")
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("## v"):
+                    return line[3:].split()[0]
+    except OSError:
+        pass
+    return None
+
+
 class Tooltip:
     """Lightweight tooltip bound to any tkinter/CTk widget."""
     def __init__(self, widget, text):
@@ -384,6 +439,136 @@ class AlignedMeshDialog(ctk.CTkToplevel):
     def on_cancel(self):    self.destroy()
 
 
+class PerfHistoryDialog(ctk.CTkToplevel):
+    """Per-project worker timings (perf_history.json). Top: one row per run,
+    newest first, with its change against the previous run of the same step.
+    Bottom: where the selected run's time went, stage by stage (nested stages
+    folded under their parent), each against the same stage of that previous
+    run. ▲ marks a regression (perf_trace.is_regression)."""
+    def __init__(self, parent, runs, open_traces):
+        super().__init__(parent)
+        self.title("Performance History")
+        self.geometry("900x600")
+        self.lift()
+        self.focus()
+        self.runs = []
+
+        style = ttk.Style(self)
+        style.theme_use("default")
+        style.configure("Perf.Treeview", background="#2B2B2B", fieldbackground="#2B2B2B",
+                        foreground="#DCE4EE", rowheight=22, borderwidth=0)
+        style.configure("Perf.Treeview.Heading", background="#3A3A3A", foreground="#DCE4EE")
+        style.map("Perf.Treeview", background=[("selected", COLOR_DONE)])
+
+        ctk.CTkLabel(self, text="Runs (newest first)", font=("Roboto Medium", 14)).pack(
+            anchor="w", padx=15, pady=(12, 2))
+        run_cols = [("when", "When", 140), ("step", "Step", 150), ("status", "Status", 80),
+                    ("total", "Total", 80), ("cpu", "CPU", 80), ("peak", "Peak RAM", 90),
+                    ("version", "Version", 80), ("change", "vs prev", 80)]
+        self.tree_runs = self._make_tree(run_cols, height=8, show="headings")
+        self.tree_runs.bind("<<TreeviewSelect>>", self._on_select_run)
+
+        self.lbl_breakdown = ctk.CTkLabel(self, text="Stage breakdown", font=("Roboto Medium", 14))
+        self.lbl_breakdown.pack(anchor="w", padx=15, pady=(10, 2))
+        stage_cols = [("wall", "Wall", 80), ("share", "% of run", 70), ("cpu", "CPU", 80),
+                      ("peak", "Peak RAM", 90), ("prev", "Previous", 80), ("change", "vs prev", 80)]
+        self.tree_stages = self._make_tree(stage_cols, height=10, show="tree headings")
+        self.tree_stages.heading("#0", text="Stage")
+        self.tree_stages.column("#0", width=260)
+
+        btn_frame = ctk.CTkFrame(self, fg_color="transparent")
+        btn_frame.pack(pady=10, fill="x")
+        ctk.CTkButton(btn_frame, text="Close", fg_color="transparent", border_width=1,
+                      text_color=("gray10", "#DCE4EE"), command=self.destroy).pack(side="right", padx=10)
+        ctk.CTkButton(btn_frame, text="Open Trace Files", command=open_traces).pack(side="right", padx=10)
+        ctk.CTkLabel(btn_frame, text="Trace files open in ui.perfetto.dev or chrome://tracing",
+                     text_color="gray60").pack(side="left", padx=15)
+
+        self.refresh(runs)
+
+    def _make_tree(self, cols, *, height, show):
+        frame = ctk.CTkFrame(self, fg_color="transparent")
+        frame.pack(fill="both", expand=True, padx=15)
+        tree = ttk.Treeview(frame, columns=[c for c, _, _ in cols], show=show,
+                            height=height, style="Perf.Treeview")
+        for col, text, width in cols:
+            tree.heading(col, text=text)
+            tree.column(col, width=width, anchor="e" if col not in ("when", "step", "status", "version") else "w")
+        tree.tag_configure("regression", foreground="#FF6B5B")
+        tree.tag_configure("failed", foreground="#F0B429")
+        bar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=bar.set)
+        tree.pack(side="left", fill="both", expand=True)
+        bar.pack(side="right", fill="y")
+        return tree
+
+    def _previous(self, i):
+        """The last successful run of the same step before runs[i], or None."""
+        worker = self.runs[i].get("worker")
+        for run in reversed(self.runs[:i]):
+            if run.get("worker") == worker and run.get("status") == "ok":
+                return run
+        return None
+
+    def refresh(self, runs):
+        self.runs = list(runs)
+        self.tree_runs.delete(*self.tree_runs.get_children())
+        for i in range(len(self.runs) - 1, -1, -1):
+            run, prev = self.runs[i], self._previous(i)
+            total = run.get("wall_s")
+            before = prev.get("wall_s") if prev else None
+            peak = max((m for m in (run.get("peak_rss_mb"), run.get("child_peak_rss_mb"))
+                        if m is not None), default=None)
+            tags = ()
+            if run.get("status") != "ok":
+                tags = ("failed",)
+            elif perf_trace.is_regression(total, before):
+                tags = ("regression",)
+            self.tree_runs.insert("", "end", iid=str(i), tags=tags, values=(
+                run.get("finished", "").replace("T", " "),
+                PERF_STEPS.get(run.get("worker"), run.get("worker")),
+                run.get("status", ""), _fmt_duration(total),
+                _fmt_duration(_cpu_seconds(run)), _fmt_mb(peak),
+                run.get("version") or "", _fmt_change(total, before)))
+        if self.runs:
+            last = str(len(self.runs) - 1)
+            self.tree_runs.selection_set(last)
+            self.tree_runs.focus(last)
+        else:
+            self.tree_stages.delete(*self.tree_stages.get_children())
+
+    def _on_select_run(self, event=None):
+        sel = self.tree_runs.selection()
+        if not sel:
+            return
+        i = int(sel[0])
+        run, prev = self.runs[i], self._previous(i)
+        stages = run.get("stages", [])
+        total = run.get("wall_s") or 0.0
+        before = perf_trace.previous_stage_times(stages, prev.get("stages", []) if prev else [])
+        self.lbl_breakdown.configure(
+            text=f"Stage breakdown — {PERF_STEPS.get(run.get('worker'), run.get('worker'))}, "
+                 f"{_fmt_duration(run.get('wall_s'))}")
+        self.tree_stages.delete(*self.tree_stages.get_children())
+        parents = [""]
+        for (depth, st), prev_wall in zip(perf_trace.stage_rows(stages), before):
+            del parents[depth + 1:]
+            wall = st.get("wall_s")
+            peak = max((m for m in (st.get("peak_rss_mb"), st.get("child_peak_rss_mb"))
+                        if m is not None), default=None)
+            tags = ("regression",) if perf_trace.is_regression(wall, prev_wall) else ()
+            if st.get("error"):
+                tags = ("failed",)
+            iid = self.tree_stages.insert(parents[-1], "end", text=st.get("stage", "?"),
+                                          open=True, tags=tags, values=(
+                _fmt_duration(wall),
+                f"{100 * wall / total:.0f}%" if wall is not None and total else "",
+                _fmt_duration(_cpu_seconds(st)),
+                _fmt_mb(peak), _fmt_duration(prev_wall) if prev_wall is not None else "",
+                _fmt_change(wall, prev_wall)))
+            parents.append(iid)
+
+
 class HRTFProjectManager(ctk.CTk):
     def __init__(self):
         super().__init__()
@@ -415,6 +600,11 @@ class HRTFProjectManager(ctk.CTk):
         self.log_queue = queue.Queue()
         self.is_running = False
 
+        # Worker [TRACE] lines -> perf_history.json (Performance panel)
+        self.trace_collector = perf_trace.TraceCollector()
+        self.perf_dialog = None
+        self.scripts_version = _scripts_version()
+
         # Layout Configuration
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(0, weight=0) 
@@ -444,6 +634,9 @@ class HRTFProjectManager(ctk.CTk):
         self.btn_refresh = ctk.CTkButton(self.frame_controls, text="Refresh", width=80, command=self.manual_refresh)
         self.btn_refresh.pack(side="right", padx=5)
 
+        self.btn_perf = ctk.CTkButton(self.frame_controls, text="Performance", width=100, fg_color="#444", command=self.open_perf_dialog)
+        self.btn_perf.pack(side="right", padx=5)
+
         self.btn_load = ctk.CTkButton(self.frame_controls, text="Open", width=80, fg_color="#444", command=self.load_project_json)
         self.btn_load.pack(side="right", padx=5)
 
@@ -655,6 +848,8 @@ class HRTFProjectManager(ctk.CTk):
             while True:
                 msg = self.log_queue.get_nowait()
                 if msg == "DONE":
+                    # a worker that died before its summary line still leaves its stages
+                    self._record_perf_run(self.trace_collector.abort())
                     self.manual_refresh()
                     self.btn_stop.configure(state="disabled")
                     if getattr(self, '_pending_mesh_check', False):
@@ -671,6 +866,7 @@ class HRTFProjectManager(ctk.CTk):
                         self.after(200, self._after_cutcap_revalidated)
                 else:
                     self.log(msg, timestamp=False)
+                    self._record_perf_run(self.trace_collector.feed(msg))
         except queue.Empty:
             pass
         self.after(100, self.check_log_queue)
@@ -729,12 +925,58 @@ class HRTFProjectManager(ctk.CTk):
         except Exception:
             pass  # Gracefully ignore if internal CTk API changes
 
+    # --- PERFORMANCE HISTORY ---
+    def _record_perf_run(self, run):
+        """Store a finished worker run (perf_trace.TraceCollector) in the
+        project's perf_history.json and refresh the Performance panel."""
+        if not run:
+            return
+        base = self.entry_base.get()
+        if not base or not os.path.isdir(base):
+            return
+        run["step"] = PERF_STEPS.get(run.get("worker"), run.get("worker"))
+        run["version"] = self.scripts_version
+        store = ProjectStore(base)
+        history = store.read_perf_history()
+        prev = next((r for r in reversed(history)
+                     if r.get("worker") == run.get("worker") and r.get("status") == "ok"), None)
+        try:
+            store.append_perf_run(run)
+        except OSError as e:
+            self.log(f"[!] Could not save timing history: {e}")
+            return
+        total, before = run.get("wall_s"), prev.get("wall_s") if prev else None
+        msg = f"[PERF] {run['step']}: {_fmt_duration(total)}"
+        if before:
+            msg += f" (previous run {_fmt_duration(before)}, {_fmt_change(total, before)})"
+        self.log(msg + " — details under Performance.")
+        if self.perf_dialog is not None and self.perf_dialog.winfo_exists():
+            self.perf_dialog.refresh(history + [run])
+
+    def open_perf_dialog(self):
+        base = self.entry_base.get()
+        if not base or not os.path.isdir(base):
+            return self.log("[!] No project folder loaded.")
+        runs = ProjectStore(base).read_perf_history()
+        if self.perf_dialog is not None and self.perf_dialog.winfo_exists():
+            self.perf_dialog.refresh(runs)
+            self.perf_dialog.lift()
+            return
+        self.perf_dialog = PerfHistoryDialog(
+            self, runs, lambda: self._open_in_file_browser(os.path.join(base, TRACE_DIR)))
+
     def open_project_folder(self, event=None):
         """Open the current project folder in the OS file browser (cross-platform)."""
         path = self.entry_base.get()
         if not path or not os.path.isdir(path):
             self.log("[!] No project folder loaded.")
             return
+        self._open_in_file_browser(path)
+
+    def _open_in_file_browser(self, path):
+        if not os.path.isdir(path):
+            self.log(f"[!] Folder not found: {path}")
+            return
         try:
             if sys.platform == "win32":
                 os.startfile(path)
@@ -931,15 +1173,11 @@ class HRTFProjectManager(ctk.CTk):
         if not self.entry_base.get():
             return messagebox.showerror("Error", "Please define a Project Folder first.")
 
-        # 2. Hard-require Blender (sliver dissolve only works via Blender).
+        # 2. Slivers are collapsed in-process (mesh_inspector.merge_by_distance);
+        #    a configured Blender is only passed along as the fallback engine.
         blender_exe = self.entry_blender.get()
         if not blender_exe or not os.path.exists(blender_exe):
-            return messagebox.showerror(
-                "Blender Required",
-                "A valid Blender path must be set in App Settings before importing a mesh.\n\n"
-                "Blender is required to remove tiny sliver triangles that pymeshlab\n"
-                "cannot fix. Please configure 'Blender Executable' above and try again.",
-            )
+            blender_exe = None
 
         # 3. Open file dialog
         kwargs = {"filetypes": [("3D Mesh", "*.obj *.ply *.stl")]}
@@ -1000,9 +1238,11 @@ class HRTFProjectManager(ctk.CTk):
             scripts_dir = os.path.dirname(os.path.abspath(__file__))
             inspector = os.path.join(scripts_dir, "mesh_inspector.py")
             self.log(f"--> Importing mesh: {os.path.basename(final_path)} "
-                     "(inspect → Blender dissolve → repair)...")
+                     "(inspect → sliver collapse → repair)...")
             self._pending_import_check = True
-            cmd = [sys.executable, "-u", inspector, "import_mesh", final_path, blender_exe]
+            cmd = [sys.executable, "-u", inspector, "import_mesh", final_path]
+            if blender_exe:
+                cmd.append(blender_exe)
             self.run_external_command(cmd)
 
         # 6. Move/Copy or use in place
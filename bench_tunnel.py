@@ -0,0 +1,441 @@
+"""bench_tunnel — timing / peak-memory benchmarks for the tunnel pipeline.
+
+The correctness tests (test_tunnel_loops.py) say nothing about speed; this
+module measures it on synthetic surfaces of known genus so runs on two commits
+can be compared:
+
+    python bench_tunnel.py                               # 1/3 handles x 10k/100k/1M
+    python bench_tunnel.py --sizes 10k 100k --handles 1 3 5 --noise 0 0.3
+    python bench_tunnel.py --compare old.json new.json   # exit 1 on a regression
+
+Surfaces (handle_sphere): a sphere with k handles, each a torus whose ring
+half sinks into the sphere -- the union is a closed genus-k surface whose
+necks are the tori's minor radii. It is contoured from the signed distance
+with VTK's flying edges at <= 256^3 samples and, for larger targets, linearly
+subdivided with the new vertices projected back onto the implicit surface, so
+1M faces never needs a 500^3 grid. Optional scan-like noise displaces the
+vertices along their normals. Lengths are in mm (sphere radius 30), the scale
+the cap remesh expects.
+
+Stages, each timed on its own (best of --repeat) and then run once more under
+tracemalloc for the peak Python + NumPy heap (native pymeshlab / pymeshfix
+buffers are not seen; the run's max RSS is in the metadata):
+
+    genus, topology, homology          per-mesh setup
+    extract_tight_cut_loops            local=True, topology prebuilt
+    select_cut_loop                    local=True (dual loops + classification)
+    dual_crossing_loop                 whole-mesh dual of every tight loop
+    cut_and_cap_loops                  the selected cut loops (needs pymeshfix);
+                                       cap_path: "local", or "whole" when the
+                                       local patch was rejected
+    genus_after_cut                    fast cut check of every tight loop
+    baseline_mesh_genus_nx             NetworkX references, skipped above
+    baseline_genus_after_cut_nx        --nx-max-faces
+
+Results are one JSON file: {"meta": {...}, "cases": [{"name", "handles",
+"faces", ..., "stages": {stage: {"seconds", "peak_mb", ...}}}]}, where a stage
+that could not run holds {"skipped": reason} or {"error": message}.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from tunnel_loop_extractor import (
+    PreparedMesh, MeshTopology, build_topology, homology_generators,
+    extract_tight_cut_loops, dual_crossing_loop, cut_and_cap_loops, CAP_FALLBACK_MSG,
+    _genus_after_cut, _genus_after_cut_nx, _mesh_genus_nx,
+)
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000}
+
+# flying-edges grid edge (samples per axis) above which we subdivide instead
+_MAX_GRID = 256
+# torus major radius, relative to the sphere radius
+_ARM = 0.35
+
+
+# ---------------------------------------------------------------------------
+# Synthetic genus-k surfaces
+# ---------------------------------------------------------------------------
+def handle_sphere(handles, faces=10_000, *, necks=None, radius=30.0, noise=0.0,
+                  seed=0):
+    """PreparedMesh of a sphere with `handles` handles and ~`faces` faces.
+
+    necks: neck (torus minor) radius of each handle relative to `radius`;
+    default evenly spread over 0.1 .. 0.25. noise: normal displacement,
+    Gaussian with sigma = noise * mean edge length. Raises ValueError if the
+    result is not one closed genus-`handles` surface (a neck too thin for the
+    sampling -- raise `faces` or the neck radii).
+    """
+    handles = int(handles)
+    if necks is None:
+        necks = np.linspace(0.1, 0.25, handles) if handles else []
+    necks = np.asarray(necks, dtype=np.float64)
+    if len(necks) != handles:
+        raise ValueError("handle_sphere: need one neck radius per handle")
+    dirs, tangents = _handle_frames(handles)
+    shape = (dirs, tangents, necks)
+
+    ext = 1.0 + _ARM + (necks.max() if handles else 0.0) + 0.1
+    # faces ~ c * n^2 for an n^3 grid; calibrate c on a small grid
+    c = len(_contour(48, ext, shape)[1]) / 48.0 ** 2
+    subdiv = 0
+    while np.sqrt(faces / (c * 4 ** subdiv)) > _MAX_GRID:
+        subdiv += 1
+    n = max(int(round(np.sqrt(faces / (c * 4 ** subdiv)))), 16)
+    pts, tri = _contour(n, ext, shape)
+    for _ in range(subdiv):
+        pts, tri = _subdivide(pts, tri)
+    if subdiv:
+        pts = _project(pts, shape)
+    if noise:
+        pts = _jitter(pts, tri, noise, seed)
+
+    mesh = PreparedMesh(pts * radius, tri)
+    if mesh.genus != handles or mesh.counts[3:] != (1, 0):
+        raise ValueError(
+            f"handle_sphere: got genus {mesh.genus}, {mesh.counts[3]} piece(s), "
+            f"{mesh.counts[4]} hole(s) for {handles} handle(s) at {len(tri)} faces "
+            f"(neck too thin for the sampling?)")
+    return mesh
+
+
+def _handle_frames(k):
+    """Fibonacci-sphere attachment directions and a tangent (torus axis) each."""
+    i = np.arange(k) + 0.5
+    phi = np.arccos(1.0 - 2.0 * i / max(k, 1))
+    th = np.pi * (1.0 + 5 ** 0.5) * i
+    dirs = np.c_[np.cos(th) * np.sin(phi), np.sin(th) * np.sin(phi), np.cos(phi)]
+    ref = np.where(np.abs(dirs[:, 2:3]) < 0.9, [[0.0, 0.0, 1.0]], [[1.0, 0.0, 0.0]])
+    tangents = np.cross(dirs, ref)
+    tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+    return dirs, tangents
+
+
+def _sdf(x, shape):
+    """Signed distance (exact for each part, min for the union) of the unit
+    sphere plus one torus per handle: centred on the sphere at dirs[i], axis
+    tangents[i], so half of the ring arches out of the sphere."""
+    dirs, tangents, necks = shape
+    d = np.linalg.norm(x, axis=1) - 1.0
+    for u, t, r in zip(dirs, tangents, necks):
+        q = x - u
+        h = q @ t
+        rho = np.linalg.norm(q - h[:, None] * t, axis=1)
+        d = np.minimum(d, np.hypot(rho - _ARM, h) - r)
+    return d
+
+
+def _contour(n, ext, shape):
+    """Zero level set of _sdf on an n^3 grid over [-ext, ext]^3, evaluated a
+    z-slab at a time. Returns (pts, faces)."""
+    import pyvista as pv
+    ax = np.linspace(-ext, ext, n)
+    X, Y = np.meshgrid(ax, ax, indexing="xy")
+    xy = np.c_[X.ravel(), Y.ravel()]
+    vals = np.empty(n ** 3)
+    for k, z in enumerate(ax):          # VTK point order: x fastest, then y, z
+        vals[k * n * n:(k + 1) * n * n] = _sdf(np.c_[xy, np.full(n * n, z)], shape)
+    grid = pv.ImageData(dimensions=(n, n, n), spacing=(ax[1] - ax[0],) * 3,
+                        origin=(-ext,) * 3)
+    grid["d"] = vals
+    surf = grid.contour([0.0], scalars="d", method="flying_edges")
+    surf = surf.triangulate().clean()
+    return (np.asarray(surf.points, dtype=np.float64),
+            surf.faces.reshape(-1, 4)[:, 1:].astype(np.int64))
+
+
+def _subdivide(pts, faces):
+    """Linear 1-to-4 split (one new vertex per edge); orientation kept."""
+    topo = MeshTopology(faces, n_v=len(pts))
+    mid = 0.5 * (pts[topo.edges[:, 0]] + pts[topo.edges[:, 1]])
+    m = topo.face_edges.astype(np.int64) + len(pts)      # (a,b), (b,c), (a,c)
+    a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+    ab, bc, ac = m[:, 0], m[:, 1], m[:, 2]
+    new = np.concatenate([np.c_[a, ab, ac], np.c_[ab, b, bc],
+                          np.c_[ac, bc, c], np.c_[ab, bc, ac]])
+    return np.vstack([pts, mid]), new
+
+
+def _project(pts, shape, steps=3, eps=1e-6):
+    """Newton steps onto the zero level set (central-difference gradient)."""
+    for _ in range(steps):
+        d = _sdf(pts, shape)
+        g = np.stack([(_sdf(pts + e, shape) - _sdf(pts - e, shape)) / (2 * eps)
+                      for e in np.eye(3) * eps], axis=1)
+        pts = pts - (d / np.maximum((g * g).sum(axis=1), 1e-12))[:, None] * g
+    return pts
+
+
+def _jitter(pts, faces, noise, seed):
+    """Scan-like noise: move each vertex along its normal by N(0, noise * mean
+    edge length). Connectivity, hence topology, is unchanged."""
+    tri = pts[faces]
+    fn = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    vn = np.zeros_like(pts)
+    for k in range(3):
+        np.add.at(vn, faces[:, k], fn)
+    vn /= np.maximum(np.linalg.norm(vn, axis=1, keepdims=True), 1e-12)
+    edge = np.linalg.norm(tri - np.roll(tri, 1, axis=1), axis=2).mean()
+    rng = np.random.default_rng(seed)
+    return pts + vn * rng.normal(0.0, noise * edge, len(pts))[:, None]
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+def measure(fn, *, repeat=1, memory=True):
+    """Run fn() `repeat` times: ({"seconds": best, "peak_mb": ...}, result of
+    the last run). The tracemalloc pass is separate so its overhead never
+    reaches the timing."""
+    best, out = np.inf, None
+    for _ in range(max(int(repeat), 1)):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    rec = {"seconds": round(best, 4)}
+    if memory:
+        tracemalloc.start()
+        try:
+            fn()
+            rec["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 2)
+        finally:
+            tracemalloc.stop()
+    return rec, out
+
+
+def bench_case(mesh, handles, *, repeat=1, memory=True, nx_max_faces=200_000,
+               stages=None, log=print):
+    """Time every stage on one PreparedMesh. Returns {stage: record}."""
+    pts, faces = mesh.arrays()
+    topo = build_topology(pts, faces)
+    out, state = {}, {}
+
+    def fresh():
+        return PreparedMesh(pts, faces, topo=topo)
+
+    def tight():
+        return state.get("tight") or []
+
+    def run(name, fn, info=None, skip=None):
+        if stages is not None and name not in stages:
+            return
+        if skip:
+            out[name] = {"skipped": skip}
+            log(f"  {name:<30} skipped ({skip})")
+            return
+        try:
+            rec, res = measure(fn, repeat=repeat, memory=memory)
+        except Exception as e:
+            out[name] = {"error": f"{type(e).__name__}: {e}"}
+            log(f"  {name:<30} ERROR {e}")
+            return
+        if info is not None:
+            rec.update(info(res))
+        out[name] = rec
+        mem = f"  peak {rec['peak_mb']:8.1f} MB" if "peak_mb" in rec else ""
+        log(f"  {name:<30} {rec['seconds']:9.3f} s{mem}")
+        return res
+
+    big = len(faces) > nx_max_faces
+    run("genus", lambda: PreparedMesh(pts, faces).genus, lambda g: {"genus": int(g)})
+    run("topology", lambda: build_topology(pts, faces))
+    run("homology", lambda: homology_generators(topo),
+        lambda r: {"generators": int(len(r[3]))})
+    state["tight"] = run(
+        "extract_tight_cut_loops",
+        lambda: extract_tight_cut_loops(fresh(), None, handles, local=True),
+        lambda r: {"loops": len(r), "loop_vertices": [int(len(lp)) for lp in r]})
+    if stages is not None and "extract_tight_cut_loops" not in stages:
+        state["tight"] = extract_tight_cut_loops(fresh(), None, handles, local=True)
+
+    from tunnel_loop_locator import select_cut_loop
+    state["pairs"] = run(
+        "select_cut_loop",
+        lambda: select_cut_loop(fresh(), None, handles, local=True),
+        lambda r: {"pairs": len(r)})
+    run("dual_crossing_loop",
+        lambda: [dual_crossing_loop(pts, faces, lp, topo=topo) for lp in tight()],
+        lambda r: {"found": sum(b is not None for b in r)},
+        skip=None if tight() else "no tight loops")
+
+    try:
+        import pymeshfix  # noqa: F401
+        import pymeshlab  # noqa: F401
+        cap_skip = None
+    except ImportError:
+        cap_skip = "pymeshfix/pymeshlab not installed"
+    if cap_skip is None and stages is not None and "cut_and_cap_loops" in stages \
+            and state.get("pairs") is None:
+        state["pairs"] = select_cut_loop(fresh(), None, handles, local=True)
+    cut = [p["cut"] for p in state.get("pairs") or []]
+    cap_msgs = []
+
+    def cap():
+        cap_msgs.clear()
+        return cut_and_cap_loops(fresh(), None, cut, progress_cb=cap_msgs.append)
+    run("cut_and_cap_loops", cap,
+        lambda r: {"faces_after": int(len(r[1])),
+                   "cap_path": "whole" if CAP_FALLBACK_MSG in cap_msgs else "local"},
+        skip=cap_skip or (None if cut else "no cut loops"))
+
+    run("genus_after_cut",
+        lambda: [_genus_after_cut(pts, faces, lp) for lp in tight()],
+        skip=None if tight() else "no tight loops")
+    nx_skip = f"over --nx-max-faces {nx_max_faces}" if big else None
+    run("baseline_mesh_genus_nx", lambda: _mesh_genus_nx(pts, faces), skip=nx_skip)
+    run("baseline_genus_after_cut_nx",
+        lambda: [_genus_after_cut_nx(pts, faces, lp) for lp in tight()],
+        skip=nx_skip or (None if tight() else "no tight loops"))
+    return out
+
+
+def run_benchmarks(sizes, handles, noises, *, repeat=1, memory=True,
+                   nx_max_faces=200_000, stages=None, log=print):
+    """Every (handles, size, noise) case. Returns the results dict."""
+    cases = []
+    t_start = time.time()
+    for k in handles:
+        for size in sizes:
+            for noise in noises:
+                name = f"g{k}_{size}_noise{noise:g}"
+                log(f"[{name}]")
+                case = {"name": name, "handles": int(k), "target_faces": SIZES[size],
+                        "noise": float(noise)}
+                t0 = time.perf_counter()
+                try:
+                    mesh = handle_sphere(k, SIZES[size], noise=noise)
+                except ValueError as e:
+                    case["error"] = str(e)
+                    log(f"  surface: {e}")
+                    cases.append(case)
+                    continue
+                case.update(faces=int(len(mesh.faces)), vertices=int(len(mesh.pts)),
+                            build_seconds=round(time.perf_counter() - t0, 3))
+                log(f"  surface: {case['faces']} faces, {case['vertices']} vertices "
+                    f"({case['build_seconds']:.1f} s)")
+                case["stages"] = bench_case(mesh, k, repeat=repeat, memory=memory,
+                                            nx_max_faces=nx_max_faces, stages=stages,
+                                            log=log)
+                cases.append(case)
+    meta = _meta()
+    meta.update(total_seconds=round(time.time() - t_start, 1), repeat=int(repeat),
+                memory=bool(memory), nx_max_faces=int(nx_max_faces),
+                max_rss_mb=_max_rss_mb())
+    return {"meta": meta, "cases": cases}
+
+
+def _meta():
+    import scipy
+    commit, dirty = None, None
+    try:
+        here = os.path.dirname(os.path.abspath(__file__))
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=here,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                                    cwd=here, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        pass
+    return {"timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit, "dirty": dirty, "python": platform.python_version(),
+            "numpy": np.__version__, "scipy": scipy.__version__,
+            "platform": platform.platform(), "cpus": os.cpu_count()}
+
+
+def _max_rss_mb():
+    try:
+        import resource
+    except ImportError:                 # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(rss / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+# ---------------------------------------------------------------------------
+# Comparing two result files
+# ---------------------------------------------------------------------------
+def compare(old, new, *, threshold=1.25, min_seconds=0.05):
+    """Rows (case, stage, old_s, new_s, ratio, regressed) for every stage timed
+    in both result dicts. A stage regresses when it is `threshold` times slower
+    AND at least `min_seconds` slower (sub-50 ms stages are timer noise)."""
+    rows = []
+    before = {c["name"]: c.get("stages", {}) for c in old.get("cases", [])}
+    for case in new.get("cases", []):
+        prev = before.get(case["name"])
+        if prev is None:
+            continue
+        for stage, rec in case.get("stages", {}).items():
+            ref = prev.get(stage, {})
+            if "seconds" not in rec or "seconds" not in ref:
+                continue
+            a, b = ref["seconds"], rec["seconds"]
+            ratio = b / a if a > 0 else np.inf
+            rows.append((case["name"], stage, a, b, ratio,
+                         ratio > threshold and b - a > min_seconds))
+    return rows
+
+
+def _print_comparison(rows, old_meta, new_meta):
+    print(f"old: {old_meta.get('commit')} ({old_meta.get('timestamp')})")
+    print(f"new: {new_meta.get('commit')} ({new_meta.get('timestamp')})")
+    print(f"{'case':<22} {'stage':<30} {'old s':>9} {'new s':>9} {'ratio':>7}")
+    for name, stage, a, b, ratio, bad in rows:
+        flag = "  REGRESSION" if bad else ""
+        print(f"{name:<22} {stage:<30} {a:9.3f} {b:9.3f} {ratio:7.2f}{flag}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        description="Benchmark the tunnel pipeline on synthetic genus-k surfaces.")
+    ap.add_argument("--sizes", nargs="+", default=list(SIZES), choices=list(SIZES),
+                    help="target face counts (default: all)")
+    ap.add_argument("--handles", nargs="+", type=int, default=[1, 3],
+                    help="handles per surface (default: 1 3)")
+    ap.add_argument("--noise", nargs="+", type=float, default=[0.0],
+                    help="normal noise, x mean edge length (default: 0)")
+    ap.add_argument("--stages", nargs="+", default=None,
+                    help="only these stages (default: all)")
+    ap.add_argument("--repeat", type=int, default=1, help="best of N timings")
+    ap.add_argument("--no-memory", action="store_true",
+                    help="skip the tracemalloc pass")
+    ap.add_argument("--nx-max-faces", type=int, default=200_000,
+                    help="skip the NetworkX baselines above this many faces")
+    ap.add_argument("--out", default=None,
+                    help="results JSON (default: bench_tunnel_<commit>.json)")
+    ap.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                    help="compare two result files instead of running")
+    ap.add_argument("--threshold", type=float, default=1.25,
+                    help="slowdown ratio flagged as a regression (default 1.25)")
+    args = ap.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        rows = compare(old, new, threshold=args.threshold)
+        _print_comparison(rows, old.get("meta", {}), new.get("meta", {}))
+        return 1 if any(r[5] for r in rows) else 0
+
+    results = run_benchmarks(args.sizes, args.handles, args.noise, repeat=args.repeat,
+                             memory=not args.no_memory,
+                             nx_max_faces=args.nx_max_faces, stages=args.stages)
+    out = args.out or f"bench_tunnel_{results['meta']['commit'] or 'local'}.json"
+    with open(out, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"wrote {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,9 @@ import scipy.fft as fft
 from scipy.spatial import ConvexHull
 import matplotlib.pyplot as plt
 
+import perf_trace
+from project_store import ProjectStore
+
 # ================= CONFIGURATION =================
 PROCESSING_LENGTH = 512
 OUTPUT_LENGTH = 256
@@ -35,7 +38,8 @@ def ensure_mesh2hrtf_import(m2h_path):
 def run_project_export(m2h, project_path):
     print(f"   -> Processing: {os.path.basename(project_path)}...")
     try:
-        m2h.output2hrtf(project_path)
+        with perf_trace.stage("export", project=os.path.basename(project_path)):
+            m2h.output2hrtf(project_path)
     except Exception as e:
         print(f"[ERROR] Export failed for {project_path}: {e}")
         sys.exit(1)
@@ -83,7 +87,11 @@ def calculate_geometric_weights(source_pos):
 
 def master_sofa(raw_sofa, target_fs, apply_dfeq, output_path):
     print(f"\n--- Generating: {os.path.basename(output_path)} ---")
-    
+    with perf_trace.stage("master", output=os.path.basename(output_path),
+                          fs=target_fs, dfeq=apply_dfeq):
+        _master_sofa(raw_sofa, target_fs, apply_dfeq, output_path)
+
+def _master_sofa(raw_sofa, target_fs, apply_dfeq, output_path):
     out_sofa = raw_sofa.copy()
     hrirs = out_sofa.Data_IR.copy()
     src_fs = float(out_sofa.Data_SamplingRate)
@@ -93,7 +101,8 @@ def master_sofa(raw_sofa, target_fs, apply_dfeq, output_path):
     if abs(src_fs - target_fs) > 1.0:
         print(f"   1. Resampling: {src_fs:.0f} -> {target_fs} Hz")
         new_N = int(N * target_fs / src_fs)
-        hrirs = signal.resample(hrirs, new_N, axis=-1)
+        with perf_trace.stage("resample"):
+            hrirs = signal.resample(hrirs, new_N, axis=-1)
         N = new_N
     else:
         print(f"   1. Rate matches ({src_fs:.0f} Hz).")
@@ -130,15 +139,17 @@ def master_sofa(raw_sofa, target_fs, apply_dfeq, output_path):
     # 3. Apply DFEQ
     if apply_dfeq:
         print("   2. Applying Diffuse Field EQ...")
-        weights = calculate_geometric_weights(out_sofa.SourcePosition)
-        H_f = fft.rfft(hrirs, n=N, axis=-1)
-        P_f = np.abs(H_f)**2
-        weights_expanded = weights[:, np.newaxis, np.newaxis]
-        df_power = np.sum(P_f * weights_expanded, axis=0) 
-        df_mag = np.sqrt(df_power)
-        inv_filter_mag = 1.0 / (df_mag + 1e-12)
-        H_f_eq = H_f * inv_filter_mag[None, :, :]
-        hrirs = fft.irfft(H_f_eq, n=N, axis=-1)
+        with perf_trace.stage("weights"):
+            weights = calculate_geometric_weights(out_sofa.SourcePosition)
+        with perf_trace.stage("dfeq_fft"):
+            H_f = fft.rfft(hrirs, n=N, axis=-1)
+            P_f = np.abs(H_f)**2
+            weights_expanded = weights[:, np.newaxis, np.newaxis]
+            df_power = np.sum(P_f * weights_expanded, axis=0) 
+            df_mag = np.sqrt(df_power)
+            inv_filter_mag = 1.0 / (df_mag + 1e-12)
+            H_f_eq = H_f * inv_filter_mag[None, :, :]
+            hrirs = fft.irfft(H_f_eq, n=N, axis=-1)
     else:
         print("   2. Skipping DFEQ.")
 
@@ -171,9 +182,11 @@ def master_sofa(raw_sofa, target_fs, apply_dfeq, output_path):
     # 6. Save
     out_sofa.Data_IR = hrirs.astype(np.float32)
     out_sofa.Data_SamplingRate = float(target_fs)
-    sf.write_sofa(output_path, out_sofa)
+    with perf_trace.stage("save"):
+        sf.write_sofa(output_path, out_sofa)
     print(f"   [+] Saved {os.path.basename(output_path)}")
 
+@perf_trace.traced("merge")
 def merge_sofas(path_l, path_r):
     print("\n=== Merging Left and Right Projects ===")
     l_sofa = sf.read_sofa(path_l)
@@ -232,6 +245,14 @@ def main():
         OUTPUT_LENGTH = 512
         print("=== Double Length Mode Enabled (1024/512) ===")
 
+    # Stage timings -> [TRACE] lines + <project>/Traces/generate_sofa_outputs.trace.json
+    # (standalone runs outside a project: <output>/Traces/)
+    store = ProjectStore.locate(args.output) or ProjectStore(args.output)
+    with perf_trace.Tracer("generate_sofa_outputs",
+                           store.trace_path("generate_sofa_outputs")):
+        _generate(args)
+
+def _generate(args):
     # --- DETERMINE MODE ---
     targets = []
     if args.input:
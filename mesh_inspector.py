@@ -1,4 +1,5 @@
 import pymeshlab
+import hashlib
 import json
 import os
 import sys
@@ -6,32 +7,39 @@ import subprocess
 
 import numpy as np
 
+import perf_trace
 from project_store import ProjectStore, MESH_ALIGNED, MESH_GRADED
 
 # =============================================================================
 # INSPECTION & REPAIR OVERVIEW
 #
 # INITIAL INSPECTION  (inspect_mesh)
-#   All checks use pymeshlab on the original mesh — nothing is modified.
+#   The file is parsed ONCE; every check runs on that in-memory mesh and
+#   nothing is modified.
 #
 #   1. pymeshlab get_topological_measures()
 #        holes, boundary_edges, connected components, non-manifold edges,
 #        non-manifold vertices, unreferenced vertices, genus
 #   2. pymeshlab get_geometric_measures()
 #        mesh volume — a negative value means normals point inward
-#   3. pymeshlab (throwaway copy) self-intersection filter
-#        counts self-intersecting faces
-#   4. pymeshlab (throwaway copy) meshing_remove_duplicate_vertices
-#        counts duplicate vertices by diffing vertex count before vs. after
-#   5. pymeshlab (throwaway copy) meshing_remove_null_faces
-#        counts degenerate/zero-area faces by diffing face count before vs. after
+#   3. pymeshlab (in-memory clone) self-intersection filter
+#        counts self-intersecting faces; this count gates "critical", so it
+#        stays on MeshLab's C++ filter (self_intersection's NumPy mask only
+#        draws the viewer overlay)
+#   4. numpy — duplicate vertices
+#        vertex count minus unique positions; the same exact-position rule
+#        (referenced or not) meshing_remove_duplicate_vertices applies
+#   5. numpy — null faces
+#        faces whose cross-product norm is exactly zero; the same test
+#        meshing_remove_null_faces applies
 #   6. numpy inline scan — tiny_faces
 #        counts faces whose shortest edge is below MERGE_DETECT_THRESH (unit-scaled).
 #        These sliver/degenerate faces are raw-scan artifacts that pymeshfix/pymeshlab
-#        cannot remove; only Blender's bmesh.ops.remove_doubles collapses them.
+#        cannot remove; only a merge-by-distance (import_mesh) collapses them.
 #
-#   Steps 3-5 apply the repair filter on a temporary MeshSet purely to count
-#   defects; the original mesh file is never written during inspection.
+#   Step 3 selects on a clone so the loaded mesh stays pristine; steps 4-5
+#   give the counts the repair filters would remove without running them. The
+#   original mesh file is never written during inspection.
 #
 # AUTO-REPAIR  (repair_mesh)
 #   Primary engine — pymeshfix:
@@ -55,14 +63,21 @@ from project_store import ProjectStore, MESH_ALIGNED, MESH_GRADED
 #   Runs at Browse-time before alignment.  Flow for each imported mesh:
 #
 #   1. inspect_mesh (full check, including tiny_faces count).
-#   2. If tiny_faces > 0:
-#        _run_blender_dissolve → blender_scripts/bmesh_cleanup.py (headless):
-#          a. bmesh.ops.remove_doubles(dist = MERGE_FIX_THRESH × unit-scale)
-#             Collapses vertices that are closer than `dist`, eliminating
-#             sliver triangles whose edges are all sub-threshold.
+#   2. If tiny_faces > 0, merge by distance (dist = MERGE_FIX_THRESH × unit-scale):
+#        merge_engine="numpy" (default) — merge_by_distance, in process:
+#          cKDTree pair search within `dist`, remove_doubles-style vertex
+#          clustering, face remap, degenerate/duplicate face removal. No
+#          Blender launch, no temp PLYs.
+#        merge_engine="blender" (or fallback if the NumPy engine errors and a
+#        Blender path was given) — _run_blender_dissolve →
+#        blender_scripts/bmesh_cleanup.py (headless):
+#          a. bmesh.ops.remove_doubles — collapses vertices that are closer
+#             than `dist`, eliminating sliver triangles whose edges are all
+#             sub-threshold.
 #          b. bmesh.ops.triangulate — re-triangulates any n-gons that
 #             remove_doubles may produce by collapsing an edge of a quad.
-#        Blender is a hard-require: CalledProcessError propagates unchanged.
+#        A failure of the chosen engine (CalledProcessError for Blender)
+#        propagates unchanged.
 #   3. pymeshfix repair (primary) / pymeshlab filter chain (fallback).
 #        Fixes self-intersections, non-manifold edges/vertices, open holes.
 #        Genus (topological tunnels) is preserved — tunnels cannot be removed
@@ -71,6 +86,14 @@ from project_store import ProjectStore, MESH_ALIGNED, MESH_GRADED
 #
 #   Genus/tunnel warnings at import are warn-only (exit 0).  They are flagged
 #   critical only in the Step 2 Inspect & Fix stage.
+#
+# REPORT CACHE
+#   inspect_mesh(path) stores its report in <mesh dir>/inspection_cache.json
+#   (owned by ProjectStore) keyed by a blake2b hash of the file CONTENT +
+#   INSPECTOR_VERSION + the parameters that change the report. An unchanged
+#   file is answered from the cache without parsing it; any edit, a version
+#   bump or ProjectStore.reset_mesh_artifacts() invalidates it. Bypass with
+#   use_cache=False / --no-cache.
 # =============================================================================
 
 # ================= CONFIGURATION =================
@@ -78,6 +101,13 @@ MERGE_DETECT_THRESH = .295
 MERGE_FIX_THRESH = .305
 # ================================================= 
 
+# sliver-collapse engines for import_mesh (--merge-engine)
+MERGE_ENGINES = ("numpy", "blender")
+
+# Bump whenever a change here alters what inspect_mesh reports for the same
+# file; every cached report then misses.
+INSPECTOR_VERSION = 4
+
 
 def _bbox_unit_scale(ms):
     """Return 1.0 if the mesh is in millimetres, 0.001 if in metres.
@@ -107,13 +137,122 @@ def _get_si_filter_name(ms):
     return None
 
 
-def inspect_mesh(path, *, max_freq_hz=None):
+def _load_meshset(src):
+    """New MeshSet holding `src`: a mesh file path, or a shared_mesh handle /
+    SharedMesh whose arrays are read straight from shared memory (no disk
+    reload in a worker process)."""
+    from shared_mesh import as_handle, attach_mesh
+    ms = pymeshlab.MeshSet()
+    handle = as_handle(src)
+    if handle is None:
+        ms.load_new_mesh(str(src))
+    else:
+        pts, faces = attach_mesh(handle)
+        ms.add_mesh(pymeshlab.Mesh(pts, faces))
+    return ms
+
+
+def _clone_meshset(ms):
+    """In-memory copy of the current mesh for filters that must not touch the
+    loaded one (saves a second parse of the file)."""
+    clone = pymeshlab.MeshSet()
+    clone.add_mesh(ms.current_mesh())
+    return clone
+
+
+def _duplicate_vertex_count(vm):
+    """Vertices sharing an exact position with an earlier one (what
+    meshing_remove_duplicate_vertices would delete)."""
+    if len(vm) < 2:
+        return 0
+    # lexicographic row sort puts equal positions next to each other; the
+    # float compare treats -0.0 == 0.0, as MeshLab does
+    s = vm[np.lexsort(vm.T[::-1])]
+    return int(np.count_nonzero((s[1:] == s[:-1]).all(axis=1)))
+
+
+def _null_face_count(vm, fm):
+    """Faces with zero double-area, |(v1-v0) x (v2-v0)| == 0 (what
+    meshing_remove_null_faces would delete)."""
+    if len(fm) == 0:
+        return 0
+    v0 = vm[fm[:, 0]]
+    n = np.cross(vm[fm[:, 1]] - v0, vm[fm[:, 2]] - v0)
+    return int(np.count_nonzero(np.einsum("ij,ij->i", n, n) <= 0.0))
+
+
+def _file_digest(path, chunk=1 << 20):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _inspection_cache_key(path, max_freq_hz):
+    """Content hash + INSPECTOR_VERSION + every input that changes the report."""
+    params = {"max_freq_hz": max_freq_hz, "merge_detect": MERGE_DETECT_THRESH}
+    return (f"v{INSPECTOR_VERSION}:{_file_digest(path)}:"
+            f"{json.dumps(params, sort_keys=True)}")
+
+
+def inspect_mesh(path, *, max_freq_hz=None, use_cache=True):
     """
     Inspect a mesh for issues that would cause NumCalc (BEM) to crash.
     Returns a report dict with severity, critical/minor issue lists, counts, summary.
+
+    path may also be a shared_mesh handle (or SharedMesh) published by the
+    caller, so pool workers inspect without reloading the file.
+
+    Reports for files are cached in the mesh dir (see REPORT CACHE above) and
+    returned without re-inspecting while the content is unchanged;
+    use_cache=False always inspects (and does not touch the cache). A cache
+    that cannot be read or written never fails the inspection.
     """
-    ms = pymeshlab.MeshSet()
-    ms.load_new_mesh(str(path))
+    if not use_cache or not isinstance(path, (str, os.PathLike)):
+        return _inspect_mesh(path, max_freq_hz=max_freq_hz)
+
+    key, cached = cached_inspection(path, max_freq_hz=max_freq_hz)
+    if cached is not None:
+        return cached
+    report = _inspect_mesh(path, max_freq_hz=max_freq_hz)
+    store_inspection(path, key, report)
+    return report
+
+
+def cached_inspection(path, *, max_freq_hz=None):
+    """(key, report) for the mesh file at `path`: the cache key of its current
+    content and the cached report, None on a miss. key is None when the cache
+    cannot be used. Callers that inspect elsewhere (a pool process) look up
+    here and store with store_inspection(), so the cache is only ever written
+    from one process."""
+    try:
+        store = ProjectStore.for_mesh_dir(os.path.dirname(os.path.abspath(str(path))))
+        key = _inspection_cache_key(path, max_freq_hz)
+    except Exception:
+        return None, None
+    try:
+        return key, store.read_cached_inspection(key)
+    except Exception:
+        return key, None
+
+
+def store_inspection(path, key, report):
+    """Cache `report` under `key` (from cached_inspection) in the mesh dir of
+    `path`; a no-op for key None. Never raises. The cache is an unlocked
+    read-modify-write: concurrent writers must be serialised by the caller."""
+    if key is None:
+        return
+    try:
+        ProjectStore.for_mesh_dir(os.path.dirname(os.path.abspath(str(path)))
+                                  ).write_cached_inspection(key, report)
+    except Exception:
+        pass
+
+
+def _inspect_mesh(path, *, max_freq_hz=None):
+    """inspect_mesh body: always inspects, never consults the cache."""
+    ms = _load_meshset(path)
 
     counts = {
         "holes": 0,
@@ -167,6 +306,8 @@ def inspect_mesh(path, *, max_freq_hz=None):
         pass
 
     # --- Geometric measures (volume sign → normal orientation) ---
+    # computed once; the wavelength check below reuses avg_edge_length
+    geo = {}
     try:
         geo = ms.get_geometric_measures()
         v = geo.get("mesh_volume", None)
@@ -175,47 +316,39 @@ def inspect_mesh(path, *, max_freq_hz=None):
     except Exception:
         pass
 
+    vm = ms.current_mesh().vertex_matrix()
+    fm = ms.current_mesh().face_matrix()
+
     # --- Self-intersections ---
+    # PyMeshLab's selection filter on a clone, so the selection never leaks.
+    # Not the NumPy engine: this count decides "critical", and that one flags
+    # coplanar overlaps MeshLab passes (and is slower on dense scans).
     try:
-        ms2 = pymeshlab.MeshSet()
-        ms2.load_new_mesh(str(path))
-        si_name = _get_si_filter_name(ms2)
-        if si_name:
+        ms2 = _clone_meshset(ms)
+        if _get_si_filter_name(ms2):
             counts["si_faces"] = int(ms2.current_mesh().selected_face_number())
     except Exception:
         pass
 
     # --- Duplicate vertices (minor) ---
     try:
-        ms3 = pymeshlab.MeshSet()
-        ms3.load_new_mesh(str(path))
-        n_before = ms3.current_mesh().vertex_number()
-        ms3.meshing_remove_duplicate_vertices()
-        n_after = ms3.current_mesh().vertex_number()
-        counts["dup_verts"] = max(0, n_before - n_after)
+        counts["dup_verts"] = _duplicate_vertex_count(vm)
     except Exception:
         pass
 
     # --- Null / degenerate faces (minor) ---
     try:
-        ms4 = pymeshlab.MeshSet()
-        ms4.load_new_mesh(str(path))
-        n_before = ms4.current_mesh().face_number()
-        ms4.meshing_remove_null_faces()
-        n_after = ms4.current_mesh().face_number()
-        counts["null_faces"] = max(0, n_before - n_after)
+        counts["null_faces"] = _null_face_count(vm, fm)
     except Exception:
         pass
 
     # --- Tiny / sliver faces (minor) ---
     # Counts faces whose shortest edge is below MERGE_DETECT_THRESH (unit-scaled).
     # These are raw-scan artifacts that pymeshfix/pymeshlab cannot remove;
-    # only Blender's bmesh.ops.remove_doubles collapses them reliably.
+    # only a merge-by-distance (import_mesh's sliver collapse) removes them.
     try:
         unit_scale = _bbox_unit_scale(ms)
         tiny_threshold = MERGE_DETECT_THRESH * unit_scale  # Detection threshold slightly weaker than fix threshold
-        vm = ms.current_mesh().vertex_matrix()
-        fm = ms.current_mesh().face_matrix()
         if len(fm) > 0:
             v0 = vm[fm[:, 0]]
             v1 = vm[fm[:, 1]]
@@ -233,8 +366,7 @@ def inspect_mesh(path, *, max_freq_hz=None):
     wavelength_warning = None
     if max_freq_hz and counts.get("volume") is not None:
         try:
-            geo2 = ms.get_geometric_measures()
-            avg_edge = geo2.get("avg_edge_length", None)
+            avg_edge = geo.get("avg_edge_length", None)
             if avg_edge:
                 speed_of_sound = 343.0
                 wavelength_min = speed_of_sound / max_freq_hz
@@ -290,7 +422,7 @@ def inspect_mesh(path, *, max_freq_hz=None):
         minor.append({
             "issue": (
                 f"{counts['tiny_faces']} tiny/sliver face(s) (min edge < {MERGE_DETECT_THRESH} mm) — "
-                "Blender merge-by-distance (remove_doubles) required to fix"
+                "merge-by-distance (sliver collapse on import) required to fix"
             ),
             "count": counts["tiny_faces"],
         })
@@ -386,7 +518,7 @@ def _repair_pymeshlab(in_path, out_path):
     ms.save_current_mesh(str(out_path))
 
 
-def repair_mesh(in_path, out_path):
+def repair_mesh(in_path, out_path, *, use_cache=True):
     """
     Repair in_path, saving to out_path. Uses pymeshfix as the primary engine
     (removes self-intersections + non-manifold + boundaries, preserves genus),
@@ -397,7 +529,7 @@ def repair_mesh(in_path, out_path):
     success = no critical issues remain OTHER than topological tunnels (genus>0),
     which are removed in the separate tunnel-loop / cut+cap step.
     """
-    before = inspect_mesh(in_path)
+    before = inspect_mesh(in_path, use_cache=use_cache)
 
     engine = "pymeshfix"
     try:
@@ -406,7 +538,7 @@ def repair_mesh(in_path, out_path):
         engine = "pymeshlab"
         _repair_pymeshlab(in_path, out_path)
 
-    after = inspect_mesh(out_path)
+    after = inspect_mesh(out_path, use_cache=use_cache)
     non_tunnel_criticals = [c for c in after.get("critical", []) if not _is_tunnel_issue(c["issue"])]
     success = len(non_tunnel_criticals) == 0
     return {"before": before, "after": after, "success": success, "engine": engine}
@@ -415,12 +547,91 @@ def repair_mesh(in_path, out_path):
 _CREATE_NO_WINDOW = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
 
 
+def merge_by_distance(pts, faces, dist):
+    """In-process Merge by Distance for a triangle mesh — the NumPy/SciPy
+    equivalent of blender_scripts/bmesh_cleanup.py (remove_doubles +
+    triangulate), without launching Blender or writing temp PLYs.
+
+    Clustering follows remove_doubles (Blender's KD-tree duplicate search)
+    rather than a transitive union-find: vertices are visited in index order
+    and each one not yet merged claims every still-unclaimed vertex within
+    `dist` (inclusive). The claimer keeps its own position — nothing is
+    averaged — so a chain of close vertices does not collapse into one blob.
+
+    Faces are remapped onto the surviving vertices; faces left with fewer than
+    three distinct vertices, and exact duplicates of an earlier face, are
+    removed. Merged-away vertices are dropped; all others (including ones that
+    were already unreferenced) keep their relative order, as in Blender.
+    triangulate is a no-op here: welding a triangle never yields an n-gon.
+
+    Returns (pts, faces, n_merged) with n_merged = number of vertices removed.
+    """
+    from scipy.spatial import cKDTree
+
+    pts = np.asarray(pts, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    n = len(pts)
+    target = np.arange(n)
+    if n > 1 and dist > 0:
+        pairs = cKDTree(pts).query_pairs(dist, output_type="ndarray")
+        if len(pairs):
+            # CSR neighbour lists (ascending) of the vertices that have any
+            both = np.concatenate([pairs, pairs[:, ::-1]])
+            both = both[np.lexsort((both[:, 1], both[:, 0]))]
+            owners, starts = np.unique(both[:, 0], return_index=True)
+            ends = np.append(starts[1:], len(both))
+            claim = np.full(n, -1)
+            for v, a, b in zip(owners.tolist(), starts.tolist(), ends.tolist()):
+                if claim[v] not in (-1, v):
+                    continue            # already merged into an earlier vertex
+                nb = both[a:b, 1]
+                nb = nb[claim[nb] == -1]
+                if len(nb):
+                    claim[nb] = v
+                    claim[v] = v
+            merged = claim >= 0
+            target[merged] = claim[merged]
+
+    f = target[faces]
+    ok = (f[:, 0] != f[:, 1]) & (f[:, 1] != f[:, 2]) & (f[:, 0] != f[:, 2])
+    f = f[ok]
+    if len(f):
+        _, first = np.unique(np.sort(f, axis=1), axis=0, return_index=True)
+        f = f[np.sort(first)]
+
+    keep = target == np.arange(n)
+    new_id = np.cumsum(keep) - 1
+    return pts[keep], new_id[f], int(n - keep.sum())
+
+
+def _blender_dissolve_in_place(dest_path, blender_exe, dist):
+    """merge_engine='blender': round-trip dest_path through temp PLYs and the
+    headless Blender worker, saving the result back in its original format."""
+    tmp_in  = str(dest_path) + "_bm_in.ply"
+    tmp_out = str(dest_path) + "_bm_out.ply"
+    try:
+        ms_exp = pymeshlab.MeshSet()
+        ms_exp.load_new_mesh(str(dest_path))
+        ms_exp.save_current_mesh(tmp_in)
+
+        _run_blender_dissolve(tmp_in, tmp_out, blender_exe, dist)
+
+        ms_res = pymeshlab.MeshSet()
+        ms_res.load_new_mesh(tmp_out)
+        ms_res.save_current_mesh(str(dest_path))
+    finally:
+        for p in (tmp_in, tmp_out):
+            if os.path.exists(p):
+                os.remove(p)
+
+
 def _run_blender_dissolve(in_path, out_path, blender_exe, dist):
     """Run bmesh_cleanup.py headlessly in Blender to collapse sliver/tiny faces via
     merge-by-distance (bmesh.ops.remove_doubles + bmesh.ops.triangulate).
 
-    Blocking call. Raises subprocess.CalledProcessError on failure (hard-require:
-    callers must not silently skip — sliver collapse only works in Blender).
+    Blocking call. Raises subprocess.CalledProcessError on failure (callers must
+    not silently skip). Only used by merge_engine='blender' or as the fallback
+    when the in-process merge_by_distance fails.
 
     Args:
         in_path:     Input mesh path (PLY).
@@ -444,17 +655,25 @@ def _run_blender_dissolve(in_path, out_path, blender_exe, dist):
     subprocess.run(cmd, check=True, creationflags=_CREATE_NO_WINDOW)
 
 
-def import_mesh(dest_path, blender_exe):
-    """Front-door mesh import: inspect → Blender sliver collapse (if needed) →
+def import_mesh(dest_path, blender_exe=None, *, merge_engine="numpy", use_cache=True):
+    """Front-door mesh import: inspect → sliver collapse (if needed) →
     pymeshfix repair → re-inspect. Overwrites dest_path in place on success.
 
     Writes import_report.json to the mesh directory. Prints ASCII progress lines
     so the GUI log stream stays informative. Returns the report dict.
 
-    success semantics: Blender merge-by-distance failure raises (hard-require). A
-    surviving genus (topological tunnel) is warn-only — the import still succeeds
-    because tunnels can only be fixed post-align via the cut & cap step.
+    merge_engine: "numpy" (default) collapses slivers in-process with
+    merge_by_distance; if that fails and blender_exe is given, Blender runs
+    instead. "blender" always uses the headless Blender worker (the previous
+    behaviour; requires blender_exe).
+
+    success semantics: a sliver-collapse failure raises. A surviving genus
+    (topological tunnel) is warn-only — the import still succeeds because
+    tunnels can only be fixed post-align via the cut & cap step.
     """
+    if merge_engine not in MERGE_ENGINES:
+        raise ValueError(f"merge_engine must be one of {MERGE_ENGINES}, got {merge_engine!r}")
+
     def log(msg):
         print(msg, flush=True)
 
@@ -462,50 +681,61 @@ def import_mesh(dest_path, blender_exe):
     filename = os.path.basename(str(dest_path))
 
     log(f"--> Import: inspecting {filename}...")
-    before = inspect_mesh(dest_path)
+    with perf_trace.stage("inspect"):
+        before = inspect_mesh(dest_path, use_cache=use_cache)
     log(format_report(before))
 
     # Derive unit scale for the merge distance from the raw mesh bbox diagonal.
-    ms_tmp = pymeshlab.MeshSet()
-    ms_tmp.load_new_mesh(str(dest_path))
+    with perf_trace.stage("load"):
+        ms_tmp = pymeshlab.MeshSet()
+        ms_tmp.load_new_mesh(str(dest_path))
     unit_scale = _bbox_unit_scale(ms_tmp)
     dissolve_dist = MERGE_FIX_THRESH * unit_scale
 
     blender_ran = False
+    engine_used = None
 
     if before["counts"].get("tiny_faces", 0) > 0:
         log(f"--> {before['counts']['tiny_faces']} tiny/sliver face(s) detected — "
-            f"running Blender merge-by-distance collapse (dist={dissolve_dist:.6f})...")
-
-        # Convert to a temp PLY for Blender (handles non-PLY originals gracefully).
-        tmp_in  = str(dest_path) + "_bm_in.ply"
-        tmp_out = str(dest_path) + "_bm_out.ply"
-        try:
-            ms_exp = pymeshlab.MeshSet()
-            ms_exp.load_new_mesh(str(dest_path))
-            ms_exp.save_current_mesh(tmp_in)
+            f"running merge-by-distance collapse (engine={merge_engine}, "
+            f"dist={dissolve_dist:.6f})...")
 
-            _run_blender_dissolve(tmp_in, tmp_out, blender_exe, dissolve_dist)
+        if merge_engine == "numpy":
+            try:
+                with perf_trace.stage("merge", engine="numpy"):
+                    cm = ms_tmp.current_mesh()
+                    pts, faces, n_merged = merge_by_distance(
+                        cm.vertex_matrix(), cm.face_matrix(), dissolve_dist)
+                    ms_res = pymeshlab.MeshSet()
+                    ms_res.add_mesh(pymeshlab.Mesh(pts, faces))
+                    ms_res.save_current_mesh(str(dest_path))
+                engine_used = "numpy"
+                log(f"   [OK] Merge-by-distance collapse complete "
+                    f"({n_merged} vertex/vertices merged).")
+            except Exception as e:
+                if not blender_exe:
+                    raise
+                log(f"   [!] NumPy merge-by-distance failed ({e}) — "
+                    "falling back to Blender.")
+
+        if engine_used is None:
+            if not blender_exe:
+                raise ValueError("merge_engine='blender' needs a Blender executable")
+            with perf_trace.stage("merge", engine="blender"):
+                _blender_dissolve_in_place(dest_path, blender_exe, dissolve_dist)
             blender_ran = True
-
-            # Load result and save back to dest_path (preserving original format).
-            ms_res = pymeshlab.MeshSet()
-            ms_res.load_new_mesh(tmp_out)
-            ms_res.save_current_mesh(str(dest_path))
+            engine_used = "blender"
             log("   [OK] Blender merge-by-distance collapse complete.")
-        finally:
-            for p in (tmp_in, tmp_out):
-                if os.path.exists(p):
-                    os.remove(p)
     else:
-        log("   [i] No tiny faces detected — Blender sliver collapse skipped.")
+        log("   [i] No tiny faces detected — sliver collapse skipped.")
 
     # pymeshfix repair (preserves genus; handles SI/non-manifold/boundaries).
     log("--> Auto-repair (pymeshfix primary)...")
     base, ext = os.path.splitext(str(dest_path))
     repaired_path = base + "_repaired" + (ext if ext else ".ply")
 
-    result = repair_mesh(dest_path, repaired_path)
+    with perf_trace.stage("repair"):
+        result = repair_mesh(dest_path, repaired_path, use_cache=use_cache)
     if result["success"]:
         os.replace(repaired_path, str(dest_path))
         log(f"   [OK] Repair succeeded (engine={result['engine']}).")
@@ -516,12 +746,14 @@ def import_mesh(dest_path, blender_exe):
 
     # Re-inspect the final cleaned file.
     log("--> Re-inspecting cleaned mesh...")
-    after = inspect_mesh(dest_path)
+    with perf_trace.stage("reinspect"):
+        after = inspect_mesh(dest_path, use_cache=use_cache)
     log(format_report(after))
 
     report = {
         "filename": filename,
         "blender_dissolve_run": blender_ran,
+        "merge_engine": engine_used,
         "engine": result["engine"],
         "before": {
             "severity": before["severity"],
@@ -545,7 +777,7 @@ def import_mesh(dest_path, blender_exe):
     return report
 
 
-def repair_graded(mesh_dir):
+def repair_graded(mesh_dir, *, use_cache=True):
     """
     Repair both Left_Graded.ply and Right_Graded.ply in mesh_dir.
     Overwrites originals on success. Rewrites mesh_check.json.
@@ -565,7 +797,7 @@ def repair_graded(mesh_dir):
 
         repaired = orig + "_repaired.ply"
         log(f"--> Repairing {side}_Graded.ply...")
-        result = repair_mesh(orig, repaired)
+        result = repair_mesh(orig, repaired, use_cache=use_cache)
 
         log(format_report(result["after"]))
 
@@ -597,7 +829,7 @@ def _write_aligned_check(mesh_dir, report):
         MESH_ALIGNED, {"aligned": (report["severity"], report["counts"])})
 
 
-def inspect_aligned(mesh_dir):
+def inspect_aligned(mesh_dir, *, use_cache=True):
     """
     Inspect aligned_head.ply in mesh_dir, print the report, and write
     aligned_check.json. Exits non-zero if critical (used by the GUI's
@@ -611,13 +843,13 @@ def inspect_aligned(mesh_dir):
         log("[!] aligned_head.ply not found.")
         sys.exit(1)
 
-    report = inspect_mesh(path)
+    report = inspect_mesh(path, use_cache=use_cache)
     log(format_report(report))
     _write_aligned_check(mesh_dir, report)
     sys.exit(0 if report["severity"] != "critical" else 1)
 
 
-def repair_aligned(mesh_dir):
+def repair_aligned(mesh_dir, *, use_cache=True):
     """
     Repair aligned_head.ply in place (pymeshfix primary), then rewrite
     aligned_check.json from a fresh inspection. Geometry criticals (self-
@@ -635,7 +867,7 @@ def repair_aligned(mesh_dir):
 
     repaired = orig + "_repaired.ply"
     log("--> Repairing aligned_head.ply...")
-    result = repair_mesh(orig, repaired)
+    result = repair_mesh(orig, repaired, use_cache=use_cache)
     log(format_report(result["after"]))
 
     if result["success"]:
@@ -647,7 +879,7 @@ def repair_aligned(mesh_dir):
         log("   Critical (non-tunnel) issues remain after repair.")
 
     # Re-inspect the (possibly updated) file for the authoritative severity.
-    report = inspect_mesh(orig)
+    report = inspect_mesh(orig, use_cache=use_cache)
     _write_aligned_check(mesh_dir, report)
     if report["severity"] == "critical":
         log("[MESH_CHECK] Critical issues remain (tunnels require the cut+cap step).")
@@ -679,19 +911,27 @@ if __name__ == "__main__":
     p_rali.add_argument("mesh_dir", help="Directory containing aligned_head.ply")
 
     p_imp = sub.add_parser("import_mesh",
-                            help="Front-door import: inspect, Blender sliver collapse (merge-by-distance), repair, re-inspect")
+                            help="Front-door import: inspect, sliver collapse (merge-by-distance), repair, re-inspect")
     p_imp.add_argument("dest_path", help="Mesh file to clean in place (already copied to Meshes folder)")
-    p_imp.add_argument("blender_exe", help="Absolute path to blender(.exe)")
+    p_imp.add_argument("blender_exe", nargs="?", default=None,
+                       help="Absolute path to blender(.exe); optional with --merge-engine numpy "
+                            "(used as the fallback if the in-process merge fails)")
+    p_imp.add_argument("--merge-engine", choices=MERGE_ENGINES, default="numpy",
+                       help="Sliver-collapse engine: in-process NumPy/SciPy (default) or headless Blender")
+
+    for p in (p_inspect, p_repair, p_graded, p_iali, p_rali, p_imp):
+        p.add_argument("--no-cache", dest="use_cache", action="store_false",
+                       help="Always re-inspect; ignore and keep out of inspection_cache.json")
 
     args = parser.parse_args()
 
     if args.cmd == "inspect":
-        report = inspect_mesh(args.path)
+        report = inspect_mesh(args.path, use_cache=args.use_cache)
         print(format_report(report))
         sys.exit(0 if report["severity"] != "critical" else 1)
 
     elif args.cmd == "repair":
-        result = repair_mesh(args.in_path, args.out_path)
+        result = repair_mesh(args.in_path, args.out_path, use_cache=args.use_cache)
         print("BEFORE:")
         print(format_report(result["before"]))
         print("\nAFTER:")
@@ -699,18 +939,23 @@ if __name__ == "__main__":
         sys.exit(0 if result["success"] else 1)
 
     elif args.cmd == "repair_graded":
-        repair_graded(args.mesh_dir)
+        repair_graded(args.mesh_dir, use_cache=args.use_cache)
 
     elif args.cmd == "inspect_aligned":
-        inspect_aligned(args.mesh_dir)
+        inspect_aligned(args.mesh_dir, use_cache=args.use_cache)
 
     elif args.cmd == "repair_aligned":
-        repair_aligned(args.mesh_dir)
+        repair_aligned(args.mesh_dir, use_cache=args.use_cache)
 
     elif args.cmd == "import_mesh":
-        report = import_mesh(args.dest_path, args.blender_exe)
+        mesh_dir = os.path.dirname(os.path.abspath(args.dest_path))
+        with perf_trace.Tracer("import_mesh",
+                               ProjectStore.for_mesh_dir(mesh_dir).trace_path("import_mesh"),
+                               log=lambda msg: print(msg, flush=True)):
+            report = import_mesh(args.dest_path, args.blender_exe,
+                                 merge_engine=args.merge_engine, use_cache=args.use_cache)
         # Genus (tunnel) is warn-only — exit 0 even when genus > 0.
-        # Non-zero only on hard failure (Blender crash propagates as exception).
+        # Non-zero only on hard failure (a sliver-collapse error propagates as exception).
         sys.exit(0)
 
     else:
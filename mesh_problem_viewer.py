@@ -3,7 +3,6 @@ import os
 import argparse
 import numpy as np
 import pyvista as pv
-from collections import defaultdict, deque
 
 
 # ---------------------------------------------------------------------------
@@ -24,7 +23,7 @@ def _topological_tunnel_loops(pv_mesh, genus, *, max_pins=5):
         b1  = 2g  (first Betti number = number of homology generators)
 
     Algorithm:
-    1. Build undirected edge index and edge→face incidence.
+    1. Build undirected edge index and edge→face incidence (MeshTopology).
     2. Primal spanning forest (BFS on vertices).  Edges used = primal tree.
     3. Dual  spanning forest (BFS on faces, only crossing non-tree interior
        edges).  Edges used = cotree.
@@ -38,137 +37,32 @@ def _topological_tunnel_loops(pv_mesh, genus, *, max_pins=5):
         pins  — list of np.ndarray(3,) pin positions
         loops — list of np.ndarray(K, 3) closed-polyline vertex arrays
     Returns ([], []) when nothing found or on any error.
+    pv_mesh may already be a PreparedMesh (see _prepare_mesh).
     """
     try:
-        mesh = pv_mesh.triangulate().clean()
-        pts  = np.asarray(mesh.points, dtype=np.float64)
-        N    = mesh.n_points
-        if N < 4:
+        mesh = _prepare_mesh(pv_mesh)
+        pts  = mesh.pts
+        if len(pts) < 4:
             return [], []
 
-        faces = mesh.faces.reshape(-1, 4)[:, 1:]
-        M     = len(faces)
-
-        # ------------------------------------------------------------------
-        # 1. Build undirected edge index and edge → face incidence
-        # ------------------------------------------------------------------
-        eid   = {}                  # (u,v) u<v → edge id
-        elist = []                  # edge id → (u, v)
-        e2f   = defaultdict(list)   # edge id → [face ids]
-        adj   = defaultdict(list)   # vertex → [(neighbour, edge_id)]
-
-        def ekey(a, b):
-            return (a, b) if a < b else (b, a)
-
-        for fi, tri in enumerate(faces):
-            a, b, c = int(tri[0]), int(tri[1]), int(tri[2])
-            for u, v in [(a, b), (b, c), (a, c)]:
-                k = ekey(u, v)
-                if k not in eid:
-                    eid[k] = len(elist)
-                    elist.append(k)
-                e2f[eid[k]].append(fi)
-
-        for ei, (u, v) in enumerate(elist):
-            adj[u].append((v, ei))
-            adj[v].append((u, ei))
-
-        E = len(elist)
-
-        # ------------------------------------------------------------------
-        # 2. Primal spanning forest (BFS over vertices)
-        # ------------------------------------------------------------------
-        parent   = [-1] * N   # parent vertex (-1 = root)
-        intree_e = set()
-        seen_v   = [False] * N
-
-        for start in range(N):
-            if seen_v[start]:
-                continue
-            seen_v[start] = True
-            dq = deque([start])
-            while dq:
-                x = dq.popleft()
-                for (y, ei) in adj[x]:
-                    if not seen_v[y]:
-                        seen_v[y]  = True
-                        parent[y]  = x
-                        intree_e.add(ei)
-                        dq.append(y)
-
-        # ------------------------------------------------------------------
-        # 3. Dual spanning forest (BFS over faces, non-tree interior edges)
-        # ------------------------------------------------------------------
-        dadj = defaultdict(list)   # face → [(face, edge_id)]
-        for ei, (u, v) in enumerate(elist):
-            if ei in intree_e:
-                continue
-            fs = e2f[ei]
-            if len(fs) == 2:
-                dadj[fs[0]].append((fs[1], ei))
-                dadj[fs[1]].append((fs[0], ei))
-
-        cotree_e = set()
-        seen_f   = [False] * M
-        for start in range(M):
-            if seen_f[start]:
-                continue
-            seen_f[start] = True
-            dq = deque([start])
-            while dq:
-                x = dq.popleft()
-                for (y, ei) in dadj[x]:
-                    if not seen_f[y]:
-                        seen_f[y] = True
-                        cotree_e.add(ei)
-                        dq.append(y)
-
         # ------------------------------------------------------------------
-        # 4. Generators = interior edges in neither forest
+        # 1-4. Edge/face incidence, primal + dual forests, generators
+        #      (array-backed, shared with tunnel_loop_extractor)
         # ------------------------------------------------------------------
-        gens = [
-            ei for ei in range(E)
-            if ei not in intree_e
-            and ei not in cotree_e
-            and len(e2f[ei]) == 2
-        ]
-        if not gens:
+        from tunnel_loop_extractor import homology_generators, _loose_loop
+        topo = mesh.topo
+        parent, _, _, gens = homology_generators(topo)
+        if not len(gens):
             return [], []
 
         # ------------------------------------------------------------------
         # 5. Extract loop for each generator via primal-tree path u → v
         # ------------------------------------------------------------------
-        def tree_path(u, v):
-            """Ordered vertex list from u to v through the primal tree (LCA)."""
-            # Collect ancestors of u with depth
-            au = {}
-            x  = u
-            d  = 0
-            while x != -1:
-                au[x] = d
-                x = parent[x]
-                d += 1
-            # Walk v upward to LCA
-            pv_side = []
-            x = v
-            while x not in au:
-                pv_side.append(x)
-                x = parent[x]
-            lca = x
-            # u-side: u → lca
-            pu_side = []
-            x = u
-            while x != lca:
-                pu_side.append(x)
-                x = parent[x]
-            pu_side.append(lca)
-            return pu_side + pv_side[::-1]
-
         gen_data = []   # (loop_pts ndarray, midpoint ndarray, loop_length float)
-        for ei in gens:
-            u, v = elist[ei]
+        for ei in gens.tolist():
+            u, v = topo.edges[ei].tolist()
             try:
-                path = tree_path(u, v)
+                path = _loose_loop(ei, topo.edges, parent)
                 if len(path) < 2:
                     continue
                 loop_pts = pts[path]
@@ -219,16 +113,16 @@ def _tight_cut_loops(pv_mesh, genus, max_pins=5):
     the cleaned mesh so the export coordinates are exact.
 
     Falls back to ([], [], [], None) on any error so the caller can use the
-    loose-loop method instead. Tightening costs ~10-15 s on a 35k-vertex scan;
-    that is acceptable for a one-shot inspection window.
+    loose-loop method instead. Tightening (CSR Dijkstra + local cut verifier)
+    measured 0.9 s on a 31k-vertex genus-1 mesh and 5 s on a 35k-vertex
+    pinched torus. pv_mesh may already be a PreparedMesh (see _prepare_mesh).
     """
     try:
-        import numpy as _np
         from tunnel_loop_extractor import extract_tight_cut_loops
-        mesh = pv_mesh.triangulate().clean()
-        pts = _np.asarray(mesh.points, dtype=_np.float64)
-        faces = mesh.faces.reshape(-1, 4)[:, 1:].astype(_np.int64)
-        idx_loops = extract_tight_cut_loops(pts, faces, genus, max_pins=max_pins)
+        mesh = _prepare_mesh(pv_mesh)
+        pts = mesh.pts
+        idx_loops = extract_tight_cut_loops(mesh, None, genus, max_pins=max_pins,
+                                            local=True)
         if not idx_loops:
             return [], [], [], None
         pins = [pts[lp].mean(axis=0) for lp in idx_loops]
@@ -246,15 +140,14 @@ def _dual_cut_pairs(pv_mesh, genus, max_pins=5):
     classifier's cut/avoid labels (tunnel_loop_locator.select_cut_loop).
     Returns (pairs, pts) where pairs is a list of dicts with 'cut'/'avoid' index
     arrays (see select_cut_loop) and pts are the cleaned-mesh points so export
-    coordinates are exact. Returns ([], None) on any error.
+    coordinates are exact. Returns ([], None) on any error. pv_mesh may
+    already be a PreparedMesh (see _prepare_mesh).
     """
     try:
-        import numpy as _np
         from tunnel_loop_locator import select_cut_loop
-        mesh = pv_mesh.triangulate().clean()
-        pts = _np.asarray(mesh.points, dtype=_np.float64)
-        faces = mesh.faces.reshape(-1, 4)[:, 1:].astype(_np.int64)
-        pairs = select_cut_loop(pts, faces, genus, max_loops=max_pins)
+        mesh = _prepare_mesh(pv_mesh)
+        pts, faces = mesh.arrays()
+        pairs = select_cut_loop(mesh, None, genus, max_loops=max_pins, local=True)
         return (pairs, pts, faces) if pairs else ([], None, None)
     except Exception as e:
         print(f"[tunnel] dual-pair path unavailable ({e}); using single loop",
@@ -342,10 +235,13 @@ class TunnelSelector:
     """
 
     def __init__(self, plotter, pts, pairs, mesh_path=None, faces=None,
-                 on_success=None):
+                 on_success=None, mesh=None):
         self.pl = plotter
         self.pts = np.asarray(pts)
         self.faces = None if faces is None else np.asarray(faces)
+        # PreparedMesh of (pts, faces) when the caller has one: the cut & cap
+        # then reuses its Euler counts instead of recounting
+        self.mesh = mesh
         self.mesh_path = mesh_path
         self.on_success = on_success  # callable: invoked after a successful cut & cap
         self.center = self.pts.mean(0)
@@ -491,7 +387,7 @@ class TunnelSelector:
             return
         try:
             from tunnel_loop_locator import export_loops_for_blender
-            cut_loops = [h["loops"][h["sel"]] for h in self.handles]
+            cut_loops = self.chosen_loops()
             prefix = os.path.splitext(self.mesh_path)[0] + "_cut"
             _, self.export_txt = export_loops_for_blender(self.pts, cut_loops, prefix)
         except Exception as e:
@@ -505,66 +401,82 @@ class TunnelSelector:
         except Exception:
             pass
 
-    def apply_cut_and_cap(self):
-        """Delete the chosen cut loops' bands and cap the holes in-app, producing
-        a watertight genus-0 mesh. Saves over mesh_path, writes a sentinel
-        cutcap_report.json so the GUI can trigger auto re-inspect + repair, then
-        calls self.on_success() to close the viewer. Falls back to the exported
-        loops (manual Blender) on any failure, leaving the original file untouched."""
+    def chosen_loops(self):
+        """The selected cut loop of every handle."""
+        return [h["loops"][h["sel"]] for h in self.handles]
+
+    def cut_input(self):
+        """(pts, faces) argument pair for compute_cut_and_cap."""
+        return (self.mesh, None) if self.mesh is not None else (self.pts, self.faces)
+
+    def can_cut_and_cap(self):
         if self.faces is None or not self.mesh_path:
             self._status("Cut & cap unavailable (no mesh data)", "#e6a09f")
+            return False
+        return True
+
+    def apply_cut_and_cap(self):
+        """Delete the chosen cut loops' bands and cap the holes in-app, producing
+        a watertight genus-0 mesh (compute_cut_and_cap: saved atomically over
+        mesh_path, plus the cutcap_report.json sentinel so the GUI can trigger
+        auto re-inspect + repair), then report through cut_and_cap_done.
+
+        This runs synchronously; the Qt viewer instead runs compute_cut_and_cap
+        in a _CutCapWorker so the window stays responsive, and hands the result
+        to cut_and_cap_done itself."""
+        if not self.can_cut_and_cap():
             return
+        self._status("Applying cut & cap...", "#e6d79f")
         try:
-            from tunnel_loop_extractor import cut_and_cap_loops
-            cut_loops = [h["loops"][h["sel"]] for h in self.handles]
-            self._status("Applying cut & cap...", "#e6d79f")
-            new_pts, new_faces = cut_and_cap_loops(self.pts, self.faces, cut_loops)
-
-            faces_pv = np.hstack(
-                [np.full((len(new_faces), 1), 3, dtype=np.int64),
-                 new_faces.astype(np.int64)]).ravel()
-            out = pv.PolyData(new_pts, faces_pv)
-            out.save(self.mesh_path)
-
-            # Write a sentinel file so the GUI knows cut & cap ran (not just
-            # that the viewer was closed). The GUI picks this up via
-            # _after_tunnel_viewer() and runs repair_aligned automatically.
-            import json as _json
-            sentinel = os.path.join(os.path.dirname(self.mesh_path),
-                                    "cutcap_report.json")
-            with open(sentinel, "w") as _f:
-                _json.dump({"applied": True,
-                            "mesh": os.path.basename(self.mesh_path)}, _f)
-
-            self._status("Tunnel removed — closing and re-validating…", "#9fe6a0")
-            print("[tunnel] cut & cap applied; mesh saved watertight (genus 0).",
-                  flush=True)
-
-            # Auto-close so the GUI can run the post-cap re-inspect + repair.
-            if callable(self.on_success):
-                try:
-                    self.on_success()
-                except Exception as e:
-                    print(f"[tunnel] on_success callback failed: {e}", file=sys.stderr)
+            result = compute_cut_and_cap(*self.cut_input(), self.chosen_loops(),
+                                         self.mesh_path)
         except Exception as e:
+            result = e
+        self.cut_and_cap_done(result)
+
+    def cut_and_cap_done(self, result):
+        """Report a finished cut & cap: result is (new_pts, new_faces) or the
+        exception it stopped with. On success calls self.on_success() to close
+        the viewer; on failure or cancel the original file is untouched and the
+        exported loops remain for a manual Blender cut."""
+        if isinstance(result, CutCapCancelled):
+            self._status("Cut & cap cancelled — mesh unchanged.", "#e6d79f")
+            print("[tunnel] cut & cap cancelled; mesh unchanged.", flush=True)
+            return
+        if isinstance(result, Exception):
             self._status(
-                f"Auto cut & cap failed: {e}\n"
+                f"Auto cut & cap failed: {result}\n"
                 "Use the exported loop for a manual Blender cut instead.",
                 "#e6a09f")
-            print(f"[tunnel] cut & cap failed: {e}", file=sys.stderr)
+            print(f"[tunnel] cut & cap failed: {result}", file=sys.stderr)
+            return
 
+        self._status("Tunnel removed — closing and re-validating…", "#9fe6a0")
+        print("[tunnel] cut & cap applied; mesh saved watertight (genus 0).",
+              flush=True)
+
+        # Auto-close so the GUI can run the post-cap re-inspect + repair.
+        if callable(self.on_success):
+            try:
+                self.on_success()
+            except Exception as e:
+                print(f"[tunnel] on_success callback failed: {e}", file=sys.stderr)
 
-def _mesh_to_arrays(pv_mesh):
-    """Triangulate+clean a pyvista mesh to (pts, faces) ndarrays. Do this on the
-    MAIN thread (it uses VTK data filters) and hand the arrays to the worker so
-    the worker stays VTK-free."""
-    mesh = pv_mesh.triangulate().clean()
-    pts = np.asarray(mesh.points, dtype=np.float64)
-    faces = mesh.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
-    return pts, faces
 
+def _prepare_mesh(pv_mesh):
+    """Triangulate+clean a pyvista mesh ONCE into a PreparedMesh (arrays, plus
+    topology and genus computed on first use and then shared by every tunnel
+    step). Do this on the MAIN thread (it uses VTK data filters) and hand the
+    result to the worker so the worker stays VTK-free. A PreparedMesh is
+    returned as is."""
+    from tunnel_loop_extractor import PreparedMesh
+    if isinstance(pv_mesh, PreparedMesh):
+        return pv_mesh
+    return PreparedMesh.from_pyvista(pv_mesh)
 
-def compute_tunnel_data(pts, faces, genus, *, max_pins=5, progress_cb=None):
+
+def compute_tunnel_data(pts, faces, genus, *, max_pins=5, progress_cb=None,
+                        mesh_path=None, use_cache=True):
     """Worker-safe (no VTK rendering): compute the cut-loop data to overlay.
 
     Returns a dict describing what to draw:
@@ -572,21 +484,56 @@ def compute_tunnel_data(pts, faces, genus, *, max_pins=5, progress_cb=None):
       {"mode":"tight", idx_loops, pts, faces} -- single tight loops (export only)
       {"mode":"none"}
     Used by the viewer's background thread; pts/faces must already be the cleaned
-    arrays (see _mesh_to_arrays). Heavy work (tree-cotree, tighten, dual loop) is
-    pure numpy/scipy/networkx and is safe off the GUI thread.
+    arrays, or pts a PreparedMesh with faces=None (see _prepare_mesh) -- its
+    topology and genus are then reused, and it is passed on as data["mesh"]
+    for the cut & cap. Heavy work (tree-cotree, tighten, dual loop) is pure
+    numpy/scipy/networkx and is safe off the GUI thread.
+
+    mesh_path: when given, the select_cut_loop pairs are cached next to the
+    mesh (ProjectStore.tunnel_cache_path), keyed by a hash of the cleaned
+    pts/faces, so reopening an unchanged mesh skips the computation. An edited
+    mesh hashes differently and misses. use_cache=False always recomputes.
     """
+    from tunnel_loop_extractor import _prepared
+    mesh = _prepared(pts, faces)
+    pts, faces = mesh.arrays()
+    store = key = None
+    if mesh_path and use_cache:
+        try:
+            from project_store import ProjectStore
+            from tunnel_loop_locator import cut_loop_cache_key, cut_pairs_from_json
+            store = ProjectStore.for_mesh_dir(os.path.dirname(os.path.abspath(mesh_path)))
+            key = cut_loop_cache_key(pts, faces, genus, max_loops=max_pins, local=True)
+            cached = store.read_cached_cut_pairs(mesh_path, key)
+            if cached:
+                if progress_cb:
+                    progress_cb("Loaded cached cut loops.")
+                return {"mode": "pairs", "pairs": cut_pairs_from_json(cached),
+                        "pts": pts, "faces": faces, "mesh": mesh}
+        except Exception as e:
+            print(f"[tunnel] cut-loop cache unavailable ({e})", file=sys.stderr)
+            store = None
+
     try:
         from tunnel_loop_locator import select_cut_loop
-        pairs = select_cut_loop(pts, faces, genus, max_loops=max_pins,
-                                progress_cb=progress_cb)
+        pairs = select_cut_loop(mesh, None, genus, max_loops=max_pins,
+                                progress_cb=progress_cb, local=True)
         if pairs:
-            return {"mode": "pairs", "pairs": pairs, "pts": pts, "faces": faces}
+            if store is not None:
+                try:
+                    from tunnel_loop_locator import cut_pairs_to_json
+                    store.write_cached_cut_pairs(mesh_path, key, cut_pairs_to_json(pairs))
+                except Exception as e:
+                    print(f"[tunnel] cut-loop cache write failed ({e})", file=sys.stderr)
+            return {"mode": "pairs", "pairs": pairs, "pts": pts, "faces": faces,
+                    "mesh": mesh}
     except Exception as e:
         print(f"[tunnel] dual-pair path failed ({e})", file=sys.stderr)
 
     try:
         from tunnel_loop_extractor import extract_tight_cut_loops
-        idx_loops = extract_tight_cut_loops(pts, faces, genus, max_pins=max_pins)
+        idx_loops = extract_tight_cut_loops(mesh, None, genus, max_pins=max_pins,
+                                            local=True)
         if idx_loops:
             return {"mode": "tight", "idx_loops": idx_loops, "pts": pts, "faces": faces}
     except Exception as e:
@@ -595,6 +542,73 @@ def compute_tunnel_data(pts, faces, genus, *, max_pins=5, progress_cb=None):
     return {"mode": "none"}
 
 
+class CutCapCancelled(Exception):
+    """Raised at a stage boundary of compute_cut_and_cap once cancelled."""
+
+
+# delete band, cap, remesh, verify, smooth (cut_and_cap_loops) + save
+CUT_CAP_STAGES = 6
+
+
+def compute_cut_and_cap(pts, faces, cut_loops, mesh_path, *, progress_cb=None,
+                        cancelled=None):
+    """Worker-safe (no VTK): cut & cap the chosen loops and save the result
+    over mesh_path.
+
+    progress_cb(step, msg) reports each stage as it starts, step counting
+    1..CUT_CAP_STAGES (a stage cut_and_cap_loops retries is not counted twice).
+    cancelled: optional callable polled at every stage boundary; once it returns
+    True the run stops with CutCapCancelled. The mesh is written to a temp file
+    next to mesh_path and only os.replace'd over it after the genus has been
+    verified and the last cancellation check passed, so a failed or cancelled
+    run leaves the original file untouched. Also writes the cutcap_report.json
+    sentinel the GUI watches for. Returns (new_pts, new_faces).
+    pts may be a PreparedMesh (faces=None): its Euler counts are reused.
+    """
+    from tunnel_loop_extractor import cut_and_cap_loops, CAP_FALLBACK_MSG
+    seen = []
+
+    def stage(msg):
+        if cancelled is not None and cancelled():
+            raise CutCapCancelled("cut & cap cancelled")
+        if msg == CAP_FALLBACK_MSG:
+            # shown, not counted: the whole-mesh cap repeats the cap stages
+            print(f"[cut&cap] {msg}", file=sys.stderr)
+            if progress_cb is not None:
+                progress_cb(max(len(seen), 1), msg)
+            return
+        if msg not in seen:
+            seen.append(msg)
+        if progress_cb is not None:
+            progress_cb(min(seen.index(msg) + 1, CUT_CAP_STAGES), msg)
+
+    new_pts, new_faces = cut_and_cap_loops(pts, faces, cut_loops, progress_cb=stage)
+
+    stage("Saving...")
+    root, ext = os.path.splitext(mesh_path)
+    tmp = f"{root}.cutcap.{os.getpid()}.tmp{ext}"
+    try:
+        import pymeshlab
+        ms = pymeshlab.MeshSet()
+        ms.add_mesh(pymeshlab.Mesh(new_pts, new_faces))
+        ms.save_current_mesh(tmp)
+        stage("Saving...")                  # last chance to cancel
+        os.replace(tmp, mesh_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+    # Write a sentinel file so the GUI knows cut & cap ran (not just that the
+    # viewer was closed). The GUI picks this up via _after_tunnel_viewer() and
+    # runs repair_aligned automatically.
+    import json as _json
+    sentinel = os.path.join(os.path.dirname(mesh_path), "cutcap_report.json")
+    with open(sentinel + ".tmp", "w") as f:
+        _json.dump({"applied": True, "mesh": os.path.basename(mesh_path)}, f)
+    os.replace(sentinel + ".tmp", sentinel)
+    return new_pts, new_faces
+
+
 def render_tunnel_data(plotter, data, mesh_path=None, on_success=None):
     """Main-thread: draw the computed tunnel data onto the plotter. Returns the
     same dict shape add_tunnel_overlay used (rendered, tight, export_txt,
@@ -609,7 +623,8 @@ def render_tunnel_data(plotter, data, mesh_path=None, on_success=None):
     if mode == "pairs":
         pts, faces, pairs = data["pts"], data["faces"], data["pairs"]
         selector = TunnelSelector(plotter, pts, pairs, mesh_path=mesh_path,
-                                  faces=faces, on_success=on_success)
+                                  faces=faces, on_success=on_success,
+                                  mesh=data.get("mesh"))
         return {"rendered": True, "tight": True,
                 "export_txt": selector.export_txt, "n_loops": len(pairs),
                 "focus": selector.focus_points(), "selector": selector}
@@ -644,8 +659,8 @@ def add_tunnel_overlay(plotter, pv_mesh, genus, max_pins=5, mesh_path=None):
     uses compute_tunnel_data (in a worker) + render_tunnel_data (main thread).
     Returns {rendered, tight, export_txt, n_loops, focus, selector} or False.
     """
-    pts, faces = _mesh_to_arrays(pv_mesh)
-    data = compute_tunnel_data(pts, faces, genus, max_pins=max_pins)
+    data = compute_tunnel_data(_prepare_mesh(pv_mesh), None, genus, max_pins=max_pins,
+                               mesh_path=mesh_path)
     return render_tunnel_data(plotter, data, mesh_path=mesh_path)
 
 
@@ -691,10 +706,9 @@ def _orient_camera_to(pl, mesh, issue_point):
         print(f"[tunnel] camera orient skipped: {e}", file=sys.stderr)
 
 
-def _add_static_overlays(pl, mesh, mesh_path):
-    """Render the FAST problem overlays (base mesh, boundary/non-manifold edges,
-    components, self-intersections) on the plotter and return legend lines.
-    These are quick, so they go up immediately while the tunnel loops compute."""
+def _add_base_surface(pl, mesh):
+    """Render the base mesh immediately; every problem overlay is computed in
+    a worker (the compute_* functions below) and added as it finishes."""
     # Base mesh — semi-transparent surface. Recompute outward-pointing normals so
     # a mesh with inverted/inconsistent normals (solid black in MeshLab) still
     # shades correctly; ambient light so it can never go fully dark.
@@ -706,61 +720,95 @@ def _add_static_overlays(pl, mesh, mesh_path):
     pl.add_mesh(mesh_disp, color="#a0c4ff", opacity=0.65, show_edges=False,
                 ambient=0.35, diffuse=0.6, specular=0.05, name="surface")
 
-    legend_lines = []
-    try:
-        problem_edges = mesh.extract_feature_edges(
-            boundary_edges=True, non_manifold_edges=True,
-            feature_edges=False, manifold_edges=False)
-        if problem_edges.n_points > 0:
-            pl.add_mesh(problem_edges, color="red", line_width=3,
-                        name="problem_edges", render_lines_as_tubes=True)
-            legend_lines.append("Red lines: boundary/non-manifold edges")
-        else:
-            legend_lines.append("[OK] No boundary or non-manifold edges")
-    except Exception as e:
-        legend_lines.append(f"Edge check error: {e}")
-
-    try:
-        labeled = mesh.connectivity(largest=False)
-        n_regions = (int(labeled.get_array("RegionId").max()) + 1
-                     if labeled.n_points > 0 else 1)
-        if n_regions > 1:
-            pl.add_mesh(labeled, scalars="RegionId", cmap="tab10",
-                        opacity=0.7, show_scalar_bar=False, name="components")
-            legend_lines.append(f"Colours: {n_regions} disconnected components")
-        else:
-            legend_lines.append("[OK] Single connected component")
-    except Exception as e:
-        legend_lines.append(f"Component check error: {e}")
-
-    try:
-        import pymeshlab
-        ms = pymeshlab.MeshSet()
-        ms.load_new_mesh(mesh_path)
-        for fname in ('compute_selection_by_self_intersections_per_face',
-                      'select_self_intersecting_faces'):
-            try:
-                ms.apply_filter(fname)
-                break
-            except Exception:
-                continue
-        n_si = ms.current_mesh().selected_face_number()
-        if n_si > 0:
-            face_ids = [i for i in range(mesh.n_cells)
-                        if ms.current_mesh().face_is_selected(i)]
-            si_mesh = mesh.extract_cells(face_ids) if face_ids else None
-            if si_mesh and si_mesh.n_points > 0:
-                pl.add_mesh(si_mesh, color="yellow", opacity=0.85, name="si_faces")
-                legend_lines.append(f"Yellow faces: {n_si} self-intersection(s)")
-        else:
-            legend_lines.append("[OK] No self-intersecting faces")
-    except Exception as e:
-        legend_lines.append(f"Self-intersection check: {e}")
-
-    return legend_lines
 
+# ---------------------------------------------------------------------------
+# Staged problem overlays. Each check is split into a worker-safe compute_*
+# (numpy/scipy/pymeshlab only -- never VTK) and a main-thread render_* that
+# draws the result and returns its legend line. _overlay_arrays runs once on
+# the main thread and feeds every stage the same (pts, faces).
+# ---------------------------------------------------------------------------
 
-def _enable_loop_keys(pl, selector):
+def _overlay_arrays(mesh):
+    """Main-thread: (tri_mesh, pts, faces) for the overlay workers.
+    tri_mesh is `mesh` itself when it is all triangles (the usual case), so
+    face masks index the displayed cells; otherwise a triangulated copy."""
+    tri_mesh = mesh if mesh.is_all_triangles else mesh.triangulate()
+    pts = np.asarray(tri_mesh.points, dtype=np.float64)
+    faces = tri_mesh.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
+    return tri_mesh, pts, faces
+
+
+def compute_problem_edges(pts, faces):
+    """Worker-safe: (E, 2) vertex pairs of the boundary (1 face) and
+    non-manifold (> 2 faces) edges -- what extract_feature_edges reports."""
+    e = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    uniq, count = np.unique(e, axis=0, return_counts=True)
+    return uniq[count != 2]
+
+
+def render_problem_edges(pl, pts, edges):
+    if len(edges) == 0:
+        return "[OK] No boundary or non-manifold edges"
+    lines = np.column_stack([np.full(len(edges), 2), edges]).ravel()
+    pl.add_mesh(pv.PolyData(pts, lines=lines), color="red", line_width=3,
+                name="problem_edges", render_lines_as_tubes=True)
+    return "Red lines: boundary/non-manifold edges"
+
+
+def compute_components(pts, faces):
+    """Worker-safe: (n_regions, per-point region id) over the face-connected
+    vertices, like pyvista's connectivity(). Unreferenced points get -1."""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    n = len(pts)
+    e = faces[:, [0, 1, 1, 2]].reshape(-1, 2)
+    graph = coo_matrix((np.ones(len(e), dtype=np.int8), (e[:, 0], e[:, 1])),
+                       shape=(n, n))
+    _, labels = connected_components(graph, directed=False)
+    used = np.zeros(n, dtype=bool)
+    used[faces.ravel()] = True
+    region = np.full(n, -1, dtype=np.int64)
+    uniq, region[used] = np.unique(labels[used], return_inverse=True)
+    return len(uniq), region
+
+
+def render_components(pl, tri_mesh, result):
+    n_regions, region = result
+    if n_regions <= 1:
+        return "[OK] Single connected component"
+    labeled = tri_mesh.copy(deep=False)
+    labeled.point_data["RegionId"] = np.maximum(region, 0)
+    pl.add_mesh(labeled, scalars="RegionId", cmap="tab10",
+                opacity=0.7, show_scalar_bar=False, name="components")
+    return f"Colours: {n_regions} disconnected components"
+
+
+def compute_si_mask(pts, faces):
+    """Worker-safe (numpy only): per-face self-intersection mask, as one
+    boolean array -- no per-face calls into PyMeshLab."""
+    from self_intersection import self_intersecting_faces
+    return self_intersecting_faces(pts, faces)
+
+
+def render_si_overlay(pl, tri_mesh, mask):
+    """Main-thread: draw the yellow self-intersection faces from the mask and
+    return the legend line."""
+    n_si = int(np.count_nonzero(mask))
+    if n_si == 0:
+        return "[OK] No self-intersecting faces"
+    si_mesh = tri_mesh.extract_cells(np.flatnonzero(mask))
+    if si_mesh.n_points > 0:
+        pl.add_mesh(si_mesh, color="yellow", opacity=0.85, name="si_faces")
+    return f"Yellow faces: {n_si} self-intersection(s)"
+
+
+def compute_genus(mesh_path):
+    """Worker-safe: genus from mesh_inspector (usually a report-cache hit)."""
+    import mesh_inspector
+    return int(mesh_inspector.inspect_mesh(mesh_path)["counts"].get("genus", 0))
+
+
+def _enable_loop_keys(pl, selector, apply=None):
     """Wire keyboard controls for loop selection and cut & cap.
 
     Left-click is intentionally NOT wired for selection — it reverts to pure
@@ -774,8 +822,12 @@ def _enable_loop_keys(pl, selector):
     The Tab/Space keys are intercepted at the Qt level (see _ProblemViewerWindow
     eventFilter) so they never reach pyvista's VTK key handler or Qt's focus
     traversal. C stays here on the pyvista key event for compatibility.
+
+    apply: what C runs (default selector.apply_cut_and_cap, synchronous); the
+    Qt viewer passes its worker-backed _start_cut_and_cap.
     """
-    pl.add_key_event('c', lambda: selector.apply_cut_and_cap())
+    apply = apply or selector.apply_cut_and_cap
+    pl.add_key_event('c', lambda: apply())
 
 
 def view_mesh_problems(mesh_path):
@@ -783,12 +835,14 @@ def view_mesh_problems(mesh_path):
     Open a PySide6 window showing all detected mesh problems:
       - Red lines    : boundary / non-manifold edges
       - Colour bands : disconnected components
-      - Yellow faces : self-intersecting faces (requires pymeshlab)
+      - Yellow faces : self-intersecting faces
       - Green/red rings : topological tunnel cut loops (genus > 0)
 
-    The window appears immediately with the base mesh + the fast overlays, and a
-    progress bar runs while the (slow) cut-loop computation happens in a worker
-    thread. Press R to reset the camera; close the window to exit.
+    The window appears immediately with the base mesh. Edges, components,
+    self-intersections and genus are each computed in their own worker thread
+    and drawn as they finish (the panel lists the checks still running); a
+    non-zero genus then starts the (slow) cut-loop worker, with a progress bar.
+    Press R to reset the camera; close the window to exit.
     """
     if not os.path.exists(mesh_path):
         print(f"Error: file not found: {mesh_path}", file=sys.stderr)
@@ -821,19 +875,60 @@ def _build_qt_classes():
         progress = QtCore.Signal(str)
         done = QtCore.Signal(object)
 
-        def __init__(self, pts, faces, genus):
+        def __init__(self, pts, faces, genus, mesh_path=None):
             super().__init__()
             self._pts, self._faces, self._genus = pts, faces, genus
+            self._mesh_path = mesh_path
 
         def run(self):
             try:
                 data = compute_tunnel_data(self._pts, self._faces, self._genus,
-                                           progress_cb=self.progress.emit)
+                                           progress_cb=self.progress.emit,
+                                           mesh_path=self._mesh_path)
             except Exception as e:
                 print(f"[tunnel] worker error: {e}", file=sys.stderr)
                 data = {"mode": "none"}
             self.done.emit(data)
 
+    class _StageWorker(QtCore.QThread):
+        """Runs one overlay stage's compute function off the GUI thread."""
+        done = QtCore.Signal(str, object)   # stage key, result or the exception
+
+        def __init__(self, key, fn, *args):
+            super().__init__()
+            self._key, self._fn, self._args = key, fn, args
+
+        def run(self):
+            try:
+                result = self._fn(*self._args)
+            except Exception as e:
+                print(f"[{self._key}] worker error: {e}", file=sys.stderr)
+                result = e
+            self.done.emit(self._key, result)
+
+    class _CutCapWorker(QtCore.QThread):
+        """Runs compute_cut_and_cap off the GUI thread; cancel() stops it at
+        the next stage boundary (the mesh file is then left untouched)."""
+        progress = QtCore.Signal(int, str)  # step 1..CUT_CAP_STAGES, message
+        done = QtCore.Signal(object)        # (new_pts, new_faces) or the exception
+
+        def __init__(self, pts, faces, cut_loops, mesh_path):
+            super().__init__()
+            self._args = (pts, faces, cut_loops, mesh_path)
+            self._cancelled = False
+
+        def cancel(self):
+            self._cancelled = True
+
+        def run(self):
+            try:
+                result = compute_cut_and_cap(*self._args,
+                                             progress_cb=self.progress.emit,
+                                             cancelled=lambda: self._cancelled)
+            except Exception as e:
+                result = e
+            self.done.emit(result)
+
     class _ProblemViewerWindow(QtWidgets.QMainWindow):
         def __init__(self, mesh_path):
             super().__init__()
@@ -883,12 +978,22 @@ def _build_qt_classes():
                 "font-size: 14px; font-weight: bold; color: white; background: transparent;")
             self._overlay_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
             self._overlay_label.setWordWrap(True)
-            ov_bar = QtWidgets.QProgressBar()
-            ov_bar.setRange(0, 0)
-            ov_bar.setFixedHeight(8)
+            self._overlay_bar = QtWidgets.QProgressBar()
+            self._overlay_bar.setRange(0, 0)
+            self._overlay_bar.setFixedHeight(8)
+            self._overlay_bar.setTextVisible(False)
             ov_lay.addWidget(self._overlay_label)
-            ov_lay.addWidget(ov_bar)
+            ov_lay.addWidget(self._overlay_bar)
+            # only shown while a cut & cap runs (see _start_cut_and_cap)
+            self._btn_cancel = QtWidgets.QPushButton("Cancel")
+            self._btn_cancel.clicked.connect(self._cancel_cut_and_cap)
+            self._btn_cancel.hide()
+            ov_lay.addWidget(self._btn_cancel)
             self._overlay.hide()
+            self._cut_worker = None
+            self._worker = None     # cut-loop search (_TunnelWorker)
+            self._workers = []      # overlay stages (_StageWorker)
+            self._closing = False
 
             # Right: control panel
             panel = QtWidgets.QFrame()
@@ -919,6 +1024,13 @@ def _build_qt_classes():
                 f"color: #ccc; font-size: 11px; background: transparent;")
             panel_layout.addWidget(self._panel_status)
 
+            # one entry per overlay stage still running (see _start_stages)
+            self._stage_status = QtWidgets.QLabel("")
+            self._stage_status.setWordWrap(True)
+            self._stage_status.setStyleSheet(
+                f"color: #888; font-size: 11px; background: transparent;")
+            panel_layout.addWidget(self._stage_status)
+
             panel_layout.addStretch()
 
             self._btn_cut = QtWidgets.QPushButton("Apply Cut && Cap  [C]")
@@ -952,38 +1064,13 @@ def _build_qt_classes():
                 self._panel_status.setText(f"Error: {e}")
                 return
 
-            self.legend_lines = _add_static_overlays(self.plotter, self.mesh, mesh_path)
-            self._refresh_legend()
+            _add_base_surface(self.plotter, self.mesh)
             self.plotter.add_text("Press R to reset camera", position="lower_left",
                                   font_size=9, color="#aaaaaa", name="resethint")
             self.plotter.add_key_event('r', lambda: self.plotter.reset_camera())
             self.plotter.reset_camera()
-
-            # genus check, then launch the worker for the slow loop compute
-            genus = 0
-            try:
-                import mesh_inspector
-                genus = mesh_inspector.inspect_mesh(mesh_path)["counts"].get("genus", 0)
-            except Exception as e:
-                self.legend_lines.append(f"Tunnel check: {e}")
-                self._refresh_legend()
-
-            if genus <= 0:
-                self.status_label.setText("No tunnels (genus 0).")
-                self._panel_status.setText("No tunnels detected.")
-                self._btn_reset.setEnabled(True)
-                self._btn_close.setEnabled(True)
-                return
-
-            self.status_label.setText(f"genus={genus}: computing cut loops...")
-            self._panel_status.setText(f"genus={genus}: computing cut loops...")
-            pts, faces = _mesh_to_arrays(self.mesh)
-            self._worker = _TunnelWorker(pts, faces, genus)
-            self._worker.progress.connect(self._on_progress)
-            self._worker.done.connect(self._on_done)
-            self._worker.start()
-            self._overlay.show()
-            self._overlay.raise_()
+            self.legend_lines = []
+            self._start_stages()
 
         def eventFilter(self, obj, event):
             """Intercept Tab/Shift+Tab/Space key presses on the plotter widget
@@ -1008,11 +1095,133 @@ def _build_qt_classes():
         def resizeEvent(self, ev):
             super().resizeEvent(ev)
             if hasattr(self, '_overlay'):
-                r = self.plotter_container.rect()
-                w, h = 400, 80
-                self._overlay.setGeometry(
-                    (r.width() - w) // 2, (r.height() - h) // 2, w, h)
-                self._overlay.raise_()
+                self._place_overlay()
+
+        def _place_overlay(self):
+            r = self.plotter_container.rect()
+            w, h = 400, max(80, self._overlay.sizeHint().height())
+            self._overlay.setGeometry(
+                (r.width() - w) // 2, (r.height() - h) // 2, w, h)
+            self._overlay.raise_()
+
+        def closeEvent(self, ev):
+            # never let the window (and with it a running QThread) go away
+            # mid-run -- Qt aborts the process on destroying a running thread.
+            # Cancel the cut & cap, drop every worker's pending results and
+            # wait for the overlay stages and the cut-loop search to finish.
+            self._closing = True
+            if self._cut_worker is not None:
+                self._cut_worker.cancel()
+                self._cut_worker.wait()
+            workers = [w for w in (*self._workers, self._worker) if w is not None]
+            for worker in workers:
+                signals = [worker.done]
+                if worker is self._worker:
+                    signals.append(worker.progress)
+                for signal in signals:
+                    try:
+                        signal.disconnect()
+                    except (RuntimeError, TypeError):
+                        pass
+            for worker in workers:
+                worker.wait()
+            super().closeEvent(ev)
+
+        # (key, label, compute fn) -- each stage gets a legend slot holding
+        # "<label>: checking..." until its worker reports back
+        _STAGES = (
+            ("edges", "Boundary/non-manifold edges", compute_problem_edges),
+            ("components", "Components", compute_components),
+            ("si", "Self-intersections", compute_si_mask),
+            ("genus", "Tunnels", compute_genus),
+        )
+
+        def _start_stages(self):
+            """Launch every overlay stage in its own worker; results are drawn
+            in _on_stage_done as they arrive, in whatever order they finish."""
+            self._slots, self._pending, self._workers = {}, {}, []
+            self._panel_status.setText("Checking mesh...")
+            try:
+                self._tri_mesh, pts, faces = _overlay_arrays(self.mesh)
+            except Exception as e:
+                self.legend_lines.append(f"Mesh arrays: {e}")
+                self._tri_mesh = pts = faces = None
+            for key, label, fn in self._STAGES:
+                self._slots[key] = len(self.legend_lines)
+                if key == "genus":
+                    args = (self.mesh_path,)
+                elif pts is None:
+                    self.legend_lines.append(f"{label}: skipped")
+                    continue
+                else:
+                    args = (pts, faces)
+                self.legend_lines.append(f"{label}: checking...")
+                self._pending[key] = label
+                worker = _StageWorker(key, fn, *args)
+                worker.done.connect(self._on_stage_done)
+                self._workers.append(worker)
+                worker.start()
+            self._pts = pts
+            self._refresh_legend()
+            self._refresh_stage_status()
+
+        def _refresh_stage_status(self):
+            self._stage_status.setText("\n".join(
+                f"{label}: checking..." for label in self._pending.values()))
+
+        def _on_stage_done(self, key, result):
+            if self._closing:
+                return
+            label = self._pending.pop(key, key)
+            if key == "genus":
+                self._on_genus(result)
+                self._refresh_stage_status()
+                return
+            if isinstance(result, Exception):
+                line = f"{label} check: {result}"
+            else:
+                try:
+                    if key == "edges":
+                        line = render_problem_edges(self.plotter, self._pts, result)
+                    elif key == "components":
+                        line = render_components(self.plotter, self._tri_mesh, result)
+                    else:
+                        line = render_si_overlay(self.plotter, self._tri_mesh, result)
+                except Exception as e:
+                    line = f"{label} check: {e}"
+            self.legend_lines[self._slots[key]] = line
+            self._refresh_legend()
+            self._refresh_stage_status()
+
+        def _on_genus(self, genus):
+            """Genus stage finished: either done (genus 0) or launch the
+            cut-loop worker."""
+            slot = self._slots["genus"]
+            if isinstance(genus, Exception):
+                self.legend_lines[slot] = f"Tunnel check: {genus}"
+                genus = 0
+            elif genus <= 0:
+                self.legend_lines[slot] = "[OK] No tunnels (genus 0)"
+            self._refresh_legend()
+
+            if genus <= 0:
+                self.status_label.setText("No tunnels (genus 0).")
+                self._panel_status.setText("No tunnels detected.")
+                self._btn_reset.setEnabled(True)
+                self._btn_close.setEnabled(True)
+                return
+
+            self.legend_lines[slot] = f"Tunnels: genus={genus}"
+            self._refresh_legend()
+            self.status_label.setText(f"genus={genus}: computing cut loops...")
+            self._panel_status.setText(f"genus={genus}: computing cut loops...")
+            self._worker = _TunnelWorker(_prepare_mesh(self.mesh), None, genus,
+                                         self.mesh_path)
+            self._worker.progress.connect(self._on_progress)
+            self._worker.done.connect(self._on_done)
+            self._worker.start()
+            self._overlay.show()
+            self._overlay.raise_()
 
         def _refresh_legend(self):
             self.plotter.add_text(_build_legend(self.legend_lines),
@@ -1020,11 +1229,15 @@ def _build_qt_classes():
                                   color="white", name="legend")
 
         def _on_progress(self, msg):
+            if self._closing:
+                return
             self.status_label.setText(msg)
             self._overlay_label.setText(msg)
             self._panel_status.setText(msg)
 
         def _on_done(self, data):
+            if self._closing:
+                return
             self._overlay.hide()
             self._btn_reset.setEnabled(True)
             self._btn_close.setEnabled(True)
@@ -1034,9 +1247,9 @@ def _build_qt_classes():
             self._selector = found.get("selector") if isinstance(found, dict) else None
             if found and self._selector is not None:
                 sel = self._selector
-                _enable_loop_keys(self.plotter, sel)
+                _enable_loop_keys(self.plotter, sel, apply=self._start_cut_and_cap)
                 self._btn_cut.setEnabled(True)
-                self._btn_cut.clicked.connect(sel.apply_cut_and_cap)
+                self._btn_cut.clicked.connect(self._start_cut_and_cap)
                 self._btn_export.setEnabled(True)
                 self._btn_export.clicked.connect(sel.export)
                 msg = (f"{found['n_loops']} tunnel/handle(s) — dual pair shown. "
@@ -1068,6 +1281,52 @@ def _build_qt_classes():
                 _orient_camera_to(self.plotter, self.mesh,
                                   np.array(focus_pts[0], dtype=float))
 
+        def _start_cut_and_cap(self):
+            """C key / Apply button: run the cut & cap in a _CutCapWorker, with
+            the overlay showing its stages and a Cancel button."""
+            sel = self._selector
+            if sel is None or self._cut_worker is not None or not sel.can_cut_and_cap():
+                return
+            self._btn_cut.setEnabled(False)
+            sel._status("Applying cut & cap...", "#e6d79f")
+            self._cut_worker = _CutCapWorker(*sel.cut_input(), sel.chosen_loops(),
+                                             sel.mesh_path)
+            self._cut_worker.progress.connect(self._on_cut_progress)
+            self._cut_worker.done.connect(self._on_cut_done)
+            self._overlay_bar.setRange(0, CUT_CAP_STAGES)
+            self._overlay_bar.setValue(0)
+            self._overlay_label.setText("Applying cut & cap...")
+            self._btn_cancel.setEnabled(True)
+            self._btn_cancel.show()
+            self._overlay.show()
+            self._place_overlay()
+            self._cut_worker.start()
+
+        def _on_cut_progress(self, step, msg):
+            self._overlay_bar.setValue(step)
+            self._on_progress(f"Cut & cap {step}/{CUT_CAP_STAGES}: {msg}")
+
+        def _cancel_cut_and_cap(self):
+            if self._cut_worker is not None:
+                self._cut_worker.cancel()
+                self._btn_cancel.setEnabled(False)
+                self._on_progress("Cancelling after the current step...")
+
+        def _on_cut_done(self, result):
+            self._cut_worker = None
+            self._overlay.hide()
+            self._btn_cancel.hide()
+            self._overlay_bar.setRange(0, 0)
+            if isinstance(result, Exception):
+                self._btn_cut.setEnabled(True)
+                msg = ("Cut & cap cancelled - mesh unchanged."
+                       if isinstance(result, CutCapCancelled)
+                       else "Cut & cap failed - see the canvas message.")
+                self.status_label.setText(msg)
+                self._panel_status.setText(msg)
+            # success closes the window through the selector's on_success
+            self._selector.cut_and_cap_done(result)
+
     return _ProblemViewerWindow
 
 
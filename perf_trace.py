@@ -0,0 +1,457 @@
+"""perf_trace — per-stage wall time, CPU time and peak RSS for the workers.
+
+The worker subprocesses (`process_and_grade.py`, `mesh_inspector.py
+import_mesh`, `generate_sofa_outputs.py`) run for minutes and only printed
+free-text progress. A Tracer wraps one worker run; named stages inside it are
+timed and written two ways:
+
+- a Chrome-trace JSON file (open in https://ui.perfetto.dev or
+  chrome://tracing), one complete ("ph": "X") event per stage, nested stages
+  drawn under their parent, threads on their own tracks;
+- `[TRACE] ...` lines on stdout -- `worker=<name> status=running` when the
+  run starts, one `stage=<name> ...` per stage as it ends, and a closing
+  `worker=<name> status=ok|failed ...` summary -- in the same `[TAG]
+  key=value` form as the `[MESH_CHECK]` lines, so the GUI's log stream can
+  pick them up (parse_trace_line; TraceCollector turns a stream of them back
+  into one run record for the GUI's perf_history.json).
+
+    with perf_trace.Tracer("process_and_grade", trace_path, log=log):
+        with perf_trace.stage("remesh"):
+            ...
+
+    @perf_trace.traced("resample")
+    def resample(...): ...
+
+stage()/traced() record into the ACTIVE tracer (the innermost open one, shared
+by all threads) and do nothing when none is open, so library calls from tests
+or from the GUI process stay silent.
+
+Per stage:
+- wall_s        perf_counter
+- cpu_s         user + system CPU of this process, all threads (process_time)
+- child_cpu_s   CPU of child processes reaped during the stage (grading
+                binary, Blender); POSIX only, os.times() reports 0 on Windows
+- peak_rss_mb   the process's resident-set high-water mark when the stage
+                ended (getrusage, or PeakWorkingSetSize on Windows). It is a
+                running maximum: the stage that raised it is the one whose
+                value is above its predecessor's.
+- child_peak_rss_mb  largest RSS of any child reaped so far, reported by the
+                stage that raised it (POSIX only; on Linux a child's count
+                starts from the RSS it inherits at fork, so small children
+                of a big worker read as the worker's size)
+
+stdlib-only; never imports numpy / pymeshlab so any worker (and the GUI) can
+use it.
+"""
+
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+TRACE_TAG = "[TRACE]"
+
+_active = []                 # open tracers, innermost last
+_active_lock = threading.Lock()
+
+
+class Tracer:
+    """One worker run. Use as a context manager; on exit (also on an error or
+    sys.exit) the trace file is written to `path` (when given) and the summary
+    `[TRACE] worker=...` line is logged.
+
+    name: worker name, used as the trace's process name and in the summary.
+    path: Chrome-trace JSON destination (ProjectStore.trace_path); may also be
+    assigned after construction, before the run ends. None = log lines only.
+    log: line sink, print-compatible.
+    """
+
+    def __init__(self, name, path=None, *, log=print):
+        self.name = name
+        self.path = path
+        self.log = log
+        self.events = []
+        self.status = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._t0 = None
+        self._start = None
+        self._wall_start = None
+
+    # --- run ---
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        self._start = _snapshot()
+        self._wall_start = time.time()
+        with _active_lock:
+            _active.append(self)
+        self.log(format_trace_line(worker=self.name, status="running"))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        with _active_lock:
+            if self in _active:
+                _active.remove(self)
+        failed = exc_type is not None and not (
+            issubclass(exc_type, SystemExit) and exc.code in (None, 0))
+        self.status = "failed" if failed else "ok"
+        end = _snapshot()
+        total = _deltas(self._start, end, time.perf_counter() - self._t0)
+        if self.path:
+            try:
+                self.write(self.path)
+            except OSError as e:
+                self.log(f"   [!] Could not write trace file {self.path}: {e}")
+        self.log(format_trace_line(worker=self.name, status=self.status,
+                                   stages=len(self.events), **total,
+                                   trace=self.path))
+        return False
+
+    @contextmanager
+    def stage(self, name, *, parent=None, **args):
+        """Time the enclosed block as stage `name`; extra keyword args are
+        stored in the trace event (e.g. side="left", faces=123456).
+
+        The open-stage stack is per thread, so a block handed to another
+        thread would have no parent: pass `parent=` (current_stage() read on
+        the submitting thread) to record it under that stage."""
+        stack = self._stack()
+        if parent is None and stack:
+            parent = stack[-1]
+        stack.append(name)
+        t = time.perf_counter()
+        start = _snapshot()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            if not (isinstance(e, SystemExit) and e.code in (None, 0)):
+                error = type(e).__name__
+            raise
+        finally:
+            stack.pop()
+            wall = time.perf_counter() - t
+            self._record(name, parent, t, wall, _deltas(start, _snapshot(), wall),
+                         args, error)
+
+    def current_stage(self):
+        """Name of the calling thread's innermost open stage, or None."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def _stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, name, parent, t, wall, stats, args, error):
+        event_args = dict(stats)
+        event_args.update(args)
+        if error:
+            event_args["error"] = error
+        event = {"name": name, "cat": self.name, "ph": "X",
+                 "ts": round((t - self._t0) * 1e6, 1), "dur": round(wall * 1e6, 1),
+                 "pid": os.getpid(), "tid": threading.get_ident(),
+                 "args": event_args}
+        with self._lock:
+            self.events.append(event)
+        fields = {"stage": name}
+        if parent:
+            fields["parent"] = parent
+        fields["start_s"] = t - self._t0
+        fields.update(stats)
+        if error:
+            fields["error"] = error
+        self.log(format_trace_line(**fields))
+
+    # --- output ---
+    def chrome_trace(self):
+        """The run as a Chrome-trace / Perfetto JSON object."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+        tids = {e["tid"] for e in events} | {threading.main_thread().ident}
+        meta = [{"name": "process_name", "ph": "M", "pid": pid,
+                 "args": {"name": self.name}}]
+        for tid in sorted(tids):
+            label = "main" if tid == threading.main_thread().ident else f"thread {tid}"
+            meta.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                         "args": {"name": label}})
+        return {"traceEvents": meta + sorted(events, key=lambda e: e["ts"]),
+                "displayTimeUnit": "ms",
+                "otherData": {"worker": self.name, "status": self.status,
+                              "started": time.strftime(
+                                  "%Y-%m-%dT%H:%M:%S",
+                                  time.localtime(self._wall_start or time.time())),
+                              "argv": sys.argv}}
+
+    def write(self, path):
+        """Write chrome_trace() to `path` (directories created; atomic like the
+        ProjectStore caches)."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + f".{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        os.replace(tmp, path)
+
+
+def active():
+    """The innermost open Tracer, or None."""
+    with _active_lock:
+        return _active[-1] if _active else None
+
+
+@contextmanager
+def stage(name, *, parent=None, **args):
+    """Tracer.stage on the active tracer; a plain pass-through without one."""
+    tracer = active()
+    if tracer is None:
+        yield
+        return
+    with tracer.stage(name, parent=parent, **args):
+        yield
+
+
+def current_stage():
+    """Tracer.current_stage on the active tracer; None without one. Read it
+    before handing work to a thread and pass it as that thread's stage(...,
+    parent=)."""
+    tracer = active()
+    return tracer.current_stage() if tracer is not None else None
+
+
+def traced(name=None, **args):
+    """Decorator form of stage(); the stage name defaults to the function's."""
+    def wrap(fn):
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def inner(*a, **kw):
+            with stage(label, **args):
+                return fn(*a, **kw)
+        return inner
+    return wrap
+
+
+# --- [TRACE] lines ---
+
+_FIELD = re.compile(r'(\w+)=("([^"]*)"|\S+)')
+
+
+def format_trace_line(**fields):
+    """`[TRACE] key=value ...`; None values are dropped, floats get 3 decimals,
+    values containing spaces are double-quoted."""
+    parts = [TRACE_TAG]
+    for key, value in fields.items():
+        if value is None:
+            continue
+        if isinstance(value, float):
+            value = f"{value:.3f}"
+        value = str(value)
+        if not value or any(c.isspace() for c in value):
+            value = f'"{value}"'
+        parts.append(f"{key}={value}")
+    return " ".join(parts)
+
+
+def parse_trace_line(line):
+    """Fields of a `[TRACE]` line as a dict (numbers converted), or None for
+    any other line. Tolerates a log timestamp before the tag."""
+    idx = line.find(TRACE_TAG)
+    if idx < 0:
+        return None
+    out = {}
+    for m in _FIELD.finditer(line[idx + len(TRACE_TAG):]):
+        key, raw = m.group(1), m.group(3) if m.group(3) is not None else m.group(2)
+        try:
+            out[key] = int(raw)
+        except ValueError:
+            try:
+                out[key] = float(raw)
+            except ValueError:
+                out[key] = raw
+    return out
+
+
+# --- GUI side: [TRACE] stream -> run records ---
+
+_SPAN_EPS = 1e-3             # [TRACE] lines carry times to 3 decimals
+
+
+class TraceCollector:
+    """Rebuilds worker runs from their `[TRACE]` lines, one line at a time (the
+    GUI feeds it every log line). A run record is
+
+        {"worker", "finished", "status", "wall_s", "cpu_s", "peak_rss_mb",
+         ["child_cpu_s", "child_peak_rss_mb", "trace",] "stages": [...]}
+
+    with "stages" the parsed stage lines (stage, parent, start_s, wall_s, ...)
+    in the order they ended.
+    """
+
+    def __init__(self):
+        self.run = None
+
+    def feed(self, line):
+        """Take one log line; returns the finished run record when `line` is a
+        run's summary, else None."""
+        rec = parse_trace_line(line)
+        if rec is None:
+            return None
+        worker = rec.get("worker")
+        if worker is not None and rec.get("status") == "running":
+            self.run = {"worker": worker, "stages": []}
+            return None
+        if worker is not None:
+            run = self.run if self.run and self.run["worker"] == worker else {
+                "worker": worker, "stages": []}
+            self.run = None
+            rec.pop("stages", None)
+            run.update(rec)
+            run["finished"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+            return run
+        if "stage" in rec and self.run is not None:
+            self.run["stages"].append(rec)
+        return None
+
+    def abort(self):
+        """The open run, marked "incomplete", when its worker ended without a
+        summary (killed, crashed hard); None when no run is open."""
+        run, self.run = self.run, None
+        if run is None:
+            return None
+        run.update(status="incomplete", finished=time.strftime("%Y-%m-%dT%H:%M:%S"))
+        if run["stages"]:
+            run["wall_s"] = max(s.get("start_s", 0.0) + s.get("wall_s", 0.0)
+                                for s in run["stages"])
+        return run
+
+
+def stage_rows(stages):
+    """(depth, stage) pairs, depth first with siblings in start order. A stage
+    goes under the one its `parent` field names (the latest stage of that name
+    running when it started), so concurrent siblings -- the per-ear stages of
+    a parallel step -- stay siblings. Only a stage with no recorded parent
+    (or one whose parent is missing from the run) falls back to time
+    containment: under the innermost earlier stage that spans it, else at the
+    top."""
+    def span(s):
+        start = s.get("start_s", 0.0)
+        return start, start + s.get("wall_s", 0.0)
+
+    def runs_at(p, t):
+        p0, p1 = span(p)
+        return p0 - _SPAN_EPS <= t <= p1 + _SPAN_EPS
+
+    order = sorted(stages, key=lambda s: (s.get("start_s", 0.0), -s.get("wall_s", 0.0)))
+    children, placed = {}, []
+    for s in order:
+        start, end = span(s)
+        name = s.get("parent")
+        parent = next((p for p in reversed(placed)
+                       if name and p.get("stage") == name and runs_at(p, start)), None)
+        if parent is None:
+            parent = next((p for p in reversed(placed)
+                           if runs_at(p, start) and runs_at(p, end)), None)
+        children.setdefault(id(parent) if parent is not None else None, []).append(s)
+        placed.append(s)
+
+    rows = []
+
+    def walk(key, depth):
+        for s in children.get(key, []):
+            rows.append((depth, s))
+            walk(id(s), depth + 1)
+    walk(None, 0)
+    return rows
+
+
+def previous_stage_times(stages, previous):
+    """For each stage of stage_rows(stages), the wall time of the matching
+    stage in the `previous` run (same name, same occurrence in start order),
+    or None."""
+    seen, earlier = {}, {}
+    for _, s in stage_rows(previous):
+        earlier.setdefault(s.get("stage"), []).append(s.get("wall_s"))
+    out = []
+    for _, s in stage_rows(stages):
+        name = s.get("stage")
+        k = seen.get(name, 0)
+        seen[name] = k + 1
+        times = earlier.get(name, [])
+        out.append(times[k] if k < len(times) else None)
+    return out
+
+
+def is_regression(seconds, before, *, threshold=1.25, min_seconds=1.0):
+    """True when `seconds` is more than `threshold` times `before` AND at least
+    `min_seconds` slower -- sub-second jitter on short stages is not flagged.
+    Same ratio as bench_tunnel.compare, but a 1 s floor instead of its 50 ms:
+    worker stages run for seconds to minutes, not benchmark milliseconds."""
+    if seconds is None or before is None:
+        return False
+    return seconds > threshold * before and seconds - before >= min_seconds
+
+
+# --- measurements ---
+
+def _snapshot():
+    t = os.times()                   # children only: os.times ticks are ~10 ms
+    rss, child_rss = _peak_rss_mb()
+    return {"cpu": time.process_time(), "child_cpu": t.children_user + t.children_system,
+            "rss": rss, "child_rss": child_rss}
+
+
+def _deltas(start, end, wall):
+    out = {"wall_s": wall, "cpu_s": end["cpu"] - start["cpu"]}
+    child_cpu = end["child_cpu"] - start["child_cpu"]
+    if child_cpu > 0:
+        out["child_cpu_s"] = child_cpu
+    out["peak_rss_mb"] = end["rss"]
+    if end["child_rss"] and end["child_rss"] != start["child_rss"]:
+        out["child_peak_rss_mb"] = end["child_rss"]
+    return out
+
+
+def _peak_rss_mb():
+    """(this process, largest reaped child) RSS high-water marks in MB; None
+    where the platform cannot tell."""
+    try:
+        import resource              # POSIX only
+    except ImportError:
+        return _windows_peak_rss_mb(), None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1.0 / 2 ** 20 if sys.platform == "darwin" else 1.0 / 2 ** 10
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale)
+
+
+def _windows_peak_rss_mb():
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class _Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (f, ctypes.c_size_t) for f in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                    "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage",
+                    "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = _Counters()
+        counters.cb = ctypes.sizeof(counters)
+        get_info = ctypes.windll.psapi.GetProcessMemoryInfo
+        get_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(_Counters), wintypes.DWORD]
+        current = ctypes.windll.kernel32.GetCurrentProcess
+        current.restype = wintypes.HANDLE
+        if not get_info(current(),
+                        ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize / 2 ** 20
+    except Exception:
+        return None
@@ -2,13 +2,24 @@ import pymeshlab
 import json
 import os
 import argparse
+import multiprocessing
 import subprocess
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
+import perf_trace
 from project_store import ProjectStore, MESH_GRADED
 
+_log_lock = threading.Lock()
+_cache_lock = threading.Lock()   # both ears store into one inspection_cache.json
+
+INSPECTION_FAILED = "inspection failed"
+
 def log(msg):
-    print(msg, flush=True)
+    # both ears log from their own threads; keep each line whole
+    with _log_lock:
+        print(msg, flush=True)
 
 def get_percentage_class():
     if hasattr(pymeshlab, 'PercentageValue'):
@@ -17,7 +28,72 @@ def get_percentage_class():
         return pymeshlab.Percentage
     return None
 
-def run_processing(aligned_mesh_path, grading_bin_path):
+def _run_streamed(cmd, prefix):
+    """Run cmd, echoing its stdout+stderr line by line behind `prefix` so two
+    binaries running at once stay readable in the GUI log. Returns None on
+    success, else why it failed."""
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, errors="replace", bufsize=1)
+    except OSError as e:
+        return str(e)
+    with proc.stdout:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line:
+                log(prefix + line)
+    rc = proc.wait()
+    return f"exit code {rc}" if rc else None
+
+def _grade_and_inspect(side, cmd, out_path, inspector, inspect_pool, parent):
+    """One ear, on its own thread: run the grading binary, then (when
+    `inspector` -- the mesh_inspector module -- is given) inspect its output
+    in `inspect_pool`. The report cache is read and written here, in the
+    parent process, never by the pool. `parent` is the stage the ear's stages
+    are traced under. Returns (error, report); a failure here -- grading or
+    inspection -- never stops the other ear."""
+    prefix = f"      [{side}] "
+    log(f"      Grading {side} Ear...")
+    with perf_trace.stage(f"grade_{side.lower()}", parent=parent):
+        error = _run_streamed(cmd, prefix)
+    if error:
+        log(f"[ERROR] {side} grading binary failed: {error}")
+        return error, None
+    if inspector is None:
+        return None, None
+    if not os.path.exists(out_path):
+        log(f"   [!] {side}_Graded.ply not found, skipping check.")
+        return None, None
+    log(f"      Inspecting {side}_Graded.ply...")
+    path = os.path.abspath(out_path)
+    try:
+        with perf_trace.stage(f"inspect_{side.lower()}", parent=parent):
+            key, report = inspector.cached_inspection(path)
+            if report is None:
+                report = inspect_pool.submit(inspector.inspect_mesh, path,
+                                             use_cache=False).result()
+                with _cache_lock:
+                    inspector.store_inspection(path, key, report)
+    except Exception as e:
+        # broken pool, unreadable PLY, ...: this ear fails, the other's report stands
+        log(f"[ERROR] {side} inspection failed: {e}")
+        return f"{INSPECTION_FAILED}: {e}", None
+    return None, report
+
+def run_processing(aligned_mesh_path, grading_bin_path, max_parallel=None):
+    """Remesh, grade both ears and inspect the graded meshes.
+
+    max_parallel: how many ears are graded (and inspected) at once; 1 runs
+    them one after the other for low-RAM machines. None reads
+    `max_parallel_grading` from project.json, default 2.
+    """
+    # Stage timings -> [TRACE] lines + <project>/Traces/process_and_grade.trace.json
+    trace_path = ProjectStore.for_mesh_dir(
+        os.path.dirname(os.path.abspath(aligned_mesh_path))).trace_path("process_and_grade")
+    with perf_trace.Tracer("process_and_grade", trace_path, log=log):
+        _run_processing(aligned_mesh_path, grading_bin_path, max_parallel)
+
+def _run_processing(aligned_mesh_path, grading_bin_path, max_parallel):
     log(f"--- Starting Processing for: {aligned_mesh_path} ---")
     
     # 1. Load Alignment Info
@@ -53,87 +129,127 @@ def run_processing(aligned_mesh_path, grading_bin_path):
     log("   -> Step A: High-Res Isotropic Remeshing...")
     temp_highres_stl = aligned_mesh_path.replace(".ply", "_highres.stl")
     
-    try:
-        ms = pymeshlab.MeshSet()
-        ms.load_new_mesh(aligned_mesh_path)
+    with perf_trace.stage("remesh"):
+        try:
+            ms = pymeshlab.MeshSet()
+            ms.load_new_mesh(aligned_mesh_path)
         
-        bbox = ms.current_mesh().bounding_box()
-        diag = bbox.diagonal()
+            bbox = ms.current_mesh().bounding_box()
+            diag = bbox.diagonal()
         
-        if ear_width > 5.0: # Millimeters
-            target_mm = target_mm_base 
-            log(f"      (Units: mm | Diag: {diag:.2f} | Target: {target_mm}mm)")
-        else: # Meters
-            target_mm = target_mm_base / 1000.0
-            arg_min = str(float(arg_min) / 1000.0)
-            arg_max = str(float(arg_max) / 1000.0)
-            log(f"      (Units: m | Diag: {diag:.4f} | Target: {target_mm}m)")
-
-        target_percent_val = (target_mm / diag) * 100
+            if ear_width > 5.0: # Millimeters
+                target_mm = target_mm_base 
+                log(f"      (Units: mm | Diag: {diag:.2f} | Target: {target_mm}mm)")
+            else: # Meters
+                target_mm = target_mm_base / 1000.0
+                arg_min = str(float(arg_min) / 1000.0)
+                arg_max = str(float(arg_max) / 1000.0)
+                log(f"      (Units: m | Diag: {diag:.4f} | Target: {target_mm}m)")
+
+            target_percent_val = (target_mm / diag) * 100
         
-        PercentageClass = get_percentage_class()
-        if PercentageClass:
-            ms.meshing_isotropic_explicit_remeshing(iterations=3, targetlen=PercentageClass(target_percent_val))
-        else:
-            ms.apply_filter('meshing_isotropic_explicit_remeshing', iterations=3, targetlen=target_percent_val)
+            PercentageClass = get_percentage_class()
+            if PercentageClass:
+                ms.meshing_isotropic_explicit_remeshing(iterations=3, targetlen=PercentageClass(target_percent_val))
+            else:
+                ms.apply_filter('meshing_isotropic_explicit_remeshing', iterations=3, targetlen=target_percent_val)
         
-        ms.save_current_mesh(temp_highres_stl)
+            ms.save_current_mesh(temp_highres_stl)
         
-    except Exception as e:
-        log(f"[ERROR] Remeshing failed: {e}")
-        sys.exit(1)
+        except Exception as e:
+            log(f"[ERROR] Remeshing failed: {e}")
+            sys.exit(1)
 
-    # 4. Run Grading Tool
-    log("   -> Step B: Running Grading Binary...")
+    # 4. Run Grading Tool (+ inspection), both ears at once
     project_dir = os.path.dirname(aligned_mesh_path)
     out_L = os.path.join(project_dir, "Left_Graded.ply")
     out_R = os.path.join(project_dir, "Right_Graded.ply")
 
     cmd_left = [grading_bin_path, "-x", arg_min, "-y", arg_max, "-v", "-h", grad_ratio, "-s", "left", "-i", temp_highres_stl, "-o", out_L]
     cmd_right = [grading_bin_path, "-x", arg_min, "-y", arg_max, "-v", "-g", grad_ratio, "-s", "right", "-i", temp_highres_stl, "-o", out_R]
+    sides = [("Left", cmd_left, out_L), ("Right", cmd_right, out_R)]
 
-    try:
-        log(f"      Grading Left Ear...")
-        subprocess.run(cmd_left, check=True)
-        log(f"      Grading Right Ear...")
-        subprocess.run(cmd_right, check=True)
-        log("      Grading Finished.")
-    except Exception as e:
-        log(f"[ERROR] Grading binary failed: {e}")
-        sys.exit(1)
+    if max_parallel is None:
+        max_parallel = store.get("max_parallel_grading", 2) if store else 2
+    jobs = max(1, min(int(max_parallel), len(sides)))
+    log(f"   -> Step B: Running Grading Binary "
+        f"({'Left & Right in parallel' if jobs > 1 else 'one ear at a time'})...")
 
-    # Step C: Mesh Quality Inspection of graded outputs
-    log("   -> Step C: Inspecting Graded Meshes...")
     try:
         import mesh_inspector
-        mesh_check = {}
-        any_critical = False
-        for side, path in [("Left", out_L), ("Right", out_R)]:
-            if not os.path.exists(path):
-                log(f"   [!] {side}_Graded.ply not found, skipping check.")
-                continue
-            report = mesh_inspector.inspect_mesh(path)
-            log(mesh_inspector.format_report(report))
-            log(f"[MESH_CHECK] side={side} severity={report['severity']}")
-            mesh_check[side.lower()] = (report["severity"], report["counts"])
-            if report["severity"] == "critical":
-                any_critical = True
-
-        ProjectStore.for_mesh_dir(project_dir).write_check(MESH_GRADED, mesh_check)
-
-        if any_critical:
-            log("[MESH_CHECK] One or more graded meshes have critical issues. The Blender step is blocked.")
-            sys.exit(1)
-        else:
-            log("[MESH_CHECK] Graded meshes passed quality check.")
+        log("   -> Step C: Each graded mesh is inspected as soon as its grading finishes.")
     except ImportError:
+        mesh_inspector = None
         log("   [!] mesh_inspector.py not found — quality check skipped.")
 
+    # Grading binaries are separate processes; inspections go to a process
+    # pool (pymeshlab is neither GIL-free nor thread-safe). One thread per ear
+    # drives both, so `jobs` bounds the heavy work running at any time. The
+    # pool spawns its workers: it starts them lazily from an ear thread, and
+    # forking this multithreaded, pymeshlab-loaded process can deadlock.
+    inspect_pool = ProcessPoolExecutor(
+        max_workers=jobs, mp_context=multiprocessing.get_context("spawn")
+    ) if mesh_inspector else None
+    try:
+        with perf_trace.stage("grade_and_inspect", jobs=jobs), ThreadPoolExecutor(max_workers=jobs) as ex:
+            parent = perf_trace.current_stage()
+            futures = [ex.submit(_grade_and_inspect, side, cmd, out, mesh_inspector,
+                                 inspect_pool, parent)
+                       for side, cmd, out in sides]
+            results = [f.result() for f in futures]
+    finally:
+        if inspect_pool is not None:
+            inspect_pool.shutdown()
+
+    failed = [side for (side, _, _), (error, _) in zip(sides, results) if error]
+    not_graded = [side for (side, _, _), (error, _) in zip(sides, results)
+                  if error and not error.startswith(INSPECTION_FAILED)]
+    if not_graded:
+        log(f"[ERROR] Grading failed for: {', '.join(not_graded)}")
+    else:
+        log("      Grading Finished.")
+
+    if mesh_inspector is None:
+        if failed:
+            sys.exit(1)
+        log("--- Processing Complete ---")
+        return
+
+    mesh_check = {}
+    any_critical = False
+    for (side, _, _), (error, report) in zip(sides, results):
+        if error:
+            # blocks the Blender step until this ear is graded (or inspected) again
+            reason = ("inspection_failed" if error.startswith(INSPECTION_FAILED)
+                      else "grading_failed")
+            log(f"[MESH_CHECK] side={side} severity=critical")
+            mesh_check[side.lower()] = ("critical", {reason: 1})
+            any_critical = True
+            continue
+        if report is None:
+            continue
+        log(mesh_inspector.format_report(report))
+        log(f"[MESH_CHECK] side={side} severity={report['severity']}")
+        mesh_check[side.lower()] = (report["severity"], report["counts"])
+        if report["severity"] == "critical":
+            any_critical = True
+
+    ProjectStore.for_mesh_dir(project_dir).write_check(MESH_GRADED, mesh_check)
+
+    if any_critical:
+        log("[MESH_CHECK] One or more graded meshes have critical issues. The Blender step is blocked.")
+        sys.exit(1)
+    else:
+        log("[MESH_CHECK] Graded meshes passed quality check.")
+
     log("--- Processing Complete ---")
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("mesh", help="Path to aligned_head.ply")
     parser.add_argument("binary", help="Path to hrtf_mesh_grading binary")
+    parser.add_argument("--max-parallel", type=int, default=None,
+                        help="Ears graded at once (1 = sequential, for low-RAM machines); "
+                             "default: project.json max_parallel_grading, else 2")
     args = parser.parse_args()
-    run_processing(args.mesh, args.binary)
\ No newline at end of file
+    run_processing(args.mesh, args.binary, args.max_parallel)
\ No newline at end of file
@@ -10,7 +10,14 @@ This module is the single owner of:
 - the `{ <key>: {"severity", "counts"} }` check-file envelope,
 - the "is any entry critical?" rule (-> CleanState),
 - the project-root walk (absorbs the old `find_project_json`),
-- the `project_resolution` default.
+- the `project_resolution` default,
+- the inspection report cache file (`inspection_cache.json`; the cache KEY is
+  built by mesh_inspector, which owns the inspector version),
+- the per-mesh cut-loop cache (`<mesh stem>_tunnel_cache.json`; KEY built by
+  tunnel_loop_locator.cut_loop_cache_key),
+- the per-worker stage traces (`Traces/<worker>.trace.json`, written by
+  perf_trace.Tracer) and the GUI's run history built from their `[TRACE]`
+  lines (`perf_history.json`, project root).
 
 stdlib-only; never imports GUI / pymeshlab so workers and tests can use it.
 Output is byte-identical to the old hand-written `json.dump(..., indent=4)`
@@ -35,6 +42,35 @@ MESH_ALIGNED = "aligned"
 MESH_GRADED = "graded"
 _CHECK_FILE = {MESH_ALIGNED: "aligned_check.json", MESH_GRADED: "mesh_check.json"}
 
+INSPECTION_CACHE_FILE = "inspection_cache.json"
+# reports kept per mesh dir; oldest dropped first
+_INSPECTION_CACHE_MAX = 32
+
+# <mesh stem> + this: the viewer's select_cut_loop results for that mesh
+TUNNEL_CACHE_SUFFIX = "_tunnel_cache.json"
+
+# project-root subfolder for perf_trace Chrome-trace files, one per worker
+TRACE_DIR = "Traces"
+TRACE_SUFFIX = ".trace.json"
+
+PERF_HISTORY_FILE = "perf_history.json"
+# worker runs kept; oldest dropped first
+_PERF_HISTORY_MAX = 200
+
+
+def _write_json_atomic(path, data, **dump_kwargs):
+    """json.dump `data` to a temp file next to `path`, then os.replace it over
+    `path`, so a concurrent reader never sees a half-written file. The temp
+    file is removed if the dump fails (e.g. a non-serialisable value)."""
+    tmp = path + f".{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as f:
+            json.dump(data, f, **dump_kwargs)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
 
 class ProjectStore:
     def __init__(self, project_root, *, mesh_dir=None):
@@ -76,6 +112,24 @@ class ProjectStore:
     def _check_path(self, mesh):
         return os.path.join(self.mesh_dir, _CHECK_FILE[mesh])
 
+    @property
+    def inspection_cache_path(self):
+        return os.path.join(self.mesh_dir, INSPECTION_CACHE_FILE)
+
+    def tunnel_cache_path(self, mesh_path):
+        stem = os.path.splitext(os.path.basename(mesh_path))[0]
+        return os.path.join(self.mesh_dir, stem + TUNNEL_CACHE_SUFFIX)
+
+    def trace_path(self, worker):
+        """Chrome-trace file of the last `worker` run (perf_trace). Lives at
+        the project root, not the mesh dir, so a new mesh import does not wipe
+        the timings that led up to it."""
+        return os.path.join(self.project_root, TRACE_DIR, worker + TRACE_SUFFIX)
+
+    @property
+    def perf_history_path(self):
+        return os.path.join(self.project_root, PERF_HISTORY_FILE)
+
     # --- reads ---
     def read_check(self, mesh):
         """The CleanState of a check file (CLEAN / CRITICAL / NOT_RUN)."""
@@ -132,6 +186,73 @@ class ProjectStore:
         except FileNotFoundError:
             pass
 
+    # --- inspection report cache (mesh_inspector.inspect_mesh) ---
+    def _read_inspection_cache(self):
+        try:
+            with open(self.inspection_cache_path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception:
+            return {}
+
+    def read_cached_inspection(self, key):
+        """The report stored under `key`, or None (absent / corrupt cache folds
+        into a miss, like read_check_data)."""
+        return self._read_inspection_cache().get(key)
+
+    def write_cached_inspection(self, key, report):
+        """Store `report` under `key`. Entries are keyed by content (not file
+        name), so a repaired temp file that is renamed over the original still
+        hits; the oldest entries are dropped past _INSPECTION_CACHE_MAX. Written
+        via a temp file + os.replace so a concurrent reader never sees a
+        half-written cache."""
+        data = self._read_inspection_cache()
+        data.pop(key, None)
+        data[key] = report
+        while len(data) > _INSPECTION_CACHE_MAX:
+            data.pop(next(iter(data)))
+        _write_json_atomic(self.inspection_cache_path, data)
+
+    # --- cut-loop cache (mesh_problem_viewer.compute_tunnel_data) ---
+    def read_cached_cut_pairs(self, mesh_path, key):
+        """The cut pairs stored for `mesh_path`, or None when absent, corrupt or
+        stored under a different key (edited mesh, other parameters)."""
+        try:
+            with open(self.tunnel_cache_path(mesh_path)) as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        if not isinstance(data, dict) or data.get("key") != key:
+            return None
+        return data.get("pairs")
+
+    def write_cached_cut_pairs(self, mesh_path, key, pairs):
+        """Store JSON-safe `pairs` (tunnel_loop_locator.cut_pairs_to_json) for
+        `mesh_path`, replacing whatever was cached for it. One entry per mesh:
+        a cut & cap changes the mesh, so the old result is never wanted again.
+        Atomic like write_cached_inspection."""
+        _write_json_atomic(self.tunnel_cache_path(mesh_path),
+                           {"key": key, "pairs": pairs})
+
+    # --- worker timing history (_project_manager_gui performance panel) ---
+    def read_perf_history(self):
+        """Run records (perf_trace.TraceCollector), oldest first; [] when
+        absent or corrupt."""
+        try:
+            with open(self.perf_history_path) as f:
+                data = json.load(f)
+        except Exception:
+            return []
+        runs = data.get("runs") if isinstance(data, dict) else None
+        return runs if isinstance(runs, list) else []
+
+    def append_perf_run(self, run):
+        """Append one run record, dropping the oldest past _PERF_HISTORY_MAX.
+        Atomic like write_cached_inspection."""
+        runs = self.read_perf_history() + [run]
+        payload = {"runs": runs[-_PERF_HISTORY_MAX:]}
+        _write_json_atomic(self.perf_history_path, payload, indent=1)
+
     # --- mesh-prep artifact management (used on new-mesh import) ---
 
     def _mesh_artifact_paths(self):
@@ -150,11 +271,16 @@ class ProjectStore:
             self._check_path(MESH_GRADED),    # mesh_check.json
             # Step 2 sentinel + loop exports
             os.path.join(md, "cutcap_report.json"),
+            # cached inspect_mesh reports (content-keyed, but a new base mesh
+            # starts from a clean slate)
+            self.inspection_cache_path,
         ]
         # Step 3 graded meshes (e.g. Left_Graded.ply, Right_Graded.ply)
         candidates.extend(_glob.glob(os.path.join(md, "*_Graded.ply")))
         # Tunnel-loop exports: aligned_head_cut_loops.npy / .txt
         candidates.extend(_glob.glob(os.path.join(md, "aligned_head_cut*")))
+        # cached cut-loop results: aligned_head_tunnel_cache.json
+        candidates.extend(_glob.glob(os.path.join(md, "*" + TUNNEL_CACHE_SUFFIX)))
         return [p for p in candidates if os.path.exists(p)]
 
     def list_mesh_artifacts(self):
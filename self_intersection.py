@@ -0,0 +1,280 @@
+"""self_intersection — which faces of a triangle mesh cut through another face.
+
+NumPy replacement for PyMeshLab's `compute_selection_by_self_intersections_per_face`
+(vcg::tri::Clean::SelfIntersections) that works on arrays already in memory,
+so the inspector count and the viewer's yellow overlay need no second load of
+the file. Returns the per-face boolean MASK, not just a count.
+
+    mask = self_intersecting_faces(pts, faces)      # (F,) bool
+
+Pipeline:
+  1. Broad phase — uniform grid. Each face's AABB is rasterised into cells
+     (cell size = mean AABB extent, so a face touches a handful of cells);
+     faces sharing a cell are candidate pairs. A pair is kept only in the cell
+     holding the min corner of the two AABBs' overlap box, which both rejects
+     non-overlapping boxes and emits every pair exactly once (no dedup pass).
+  2. Narrow phase — vectorised, in chunks of `chunk` pairs, with the same
+     shared-vertex rules as MeshLab:
+       0 shared vertices -> Moller triangle-triangle interval test (with the
+                            2-D edge/containment test for coplanar pairs);
+       1 shared vertex   -> the edge opposite the shared vertex, pulled halfway
+                            towards it, must pierce the OTHER face's interior
+                            (catches folds without flagging a plain fan);
+       2 shared vertices -> never (edge neighbours);
+       3 shared vertices -> always (duplicate face).
+  Both faces of an intersecting pair are flagged.
+
+Distances are compared against a tolerance relative to the bbox diagonal, so
+mm and metre scans behave alike. Results match PyMeshLab except for
+touching/degenerate pairs within that tolerance.
+
+numpy only; never imports pymeshlab / VTK.
+"""
+
+import numpy as np
+
+# plane-distance tolerance, relative to the bbox diagonal
+_REL_EPS = 1e-10
+# barycentric margin for the shared-vertex fold test (MeshLab's EPSIL)
+_BARY_EPS = 1e-6
+
+
+def self_intersecting_faces(pts, faces, *, chunk=1_000_000):
+    """Boolean mask (F,) of faces that intersect at least one other face.
+
+    chunk bounds the number of candidate pairs held at once (memory stays
+    O(chunk), independent of the scan size).
+    """
+    pts = np.asarray(pts, dtype=np.float64)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    mask = np.zeros(len(faces), dtype=bool)
+    if len(faces) < 2:
+        return mask
+    tri = pts[faces]
+    used = tri.reshape(-1, 3)
+    eps = _REL_EPS * max(float(np.linalg.norm(used.max(0) - used.min(0))), 1e-300)
+    normals, ok = _unit_normals(tri)
+    for a, b in _candidate_pairs(tri, chunk):
+        hit = _pairs_intersect(pts, faces, tri, normals, ok, a, b, eps)
+        mask[a[hit]] = True
+        mask[b[hit]] = True
+    return mask
+
+
+# ---------------------------------------------------------------------------
+# BROAD PHASE: uniform grid over the face AABBs
+# ---------------------------------------------------------------------------
+def _candidate_pairs(tri, chunk):
+    """Yield (a, b) arrays of face-id pairs whose AABBs overlap, each pair once,
+    ~chunk cell co-occupancies per batch."""
+    lo, hi = tri.min(axis=1), tri.max(axis=1)
+    h = float((hi - lo).max(axis=1).mean())
+    if not h > 0:
+        h = 1.0
+    origin = lo.min(axis=0)
+    c0 = np.floor((lo - origin) / h).astype(np.int64)
+    c1 = np.floor((hi - origin) / h).astype(np.int64)
+    dims = c1.max(axis=0) + 1
+
+    # one (cell, face) entry per cell each face's box touches
+    span = c1 - c0 + 1
+    n = span.prod(axis=1)
+    idt = np.int32 if len(tri) < np.iinfo(np.int32).max else np.int64
+    fid = np.repeat(np.arange(len(tri), dtype=idt), n)
+    k = np.arange(len(fid)) - np.repeat(np.cumsum(n) - n, n)
+    sx, sy = span[fid, 0], span[fid, 1]
+    key = (((c0[fid, 0] + k % sx) * dims[1] + c0[fid, 1] + (k // sx) % sy) * dims[2]
+           + c0[fid, 2] + k // (sx * sy))
+    del k, sx, sy
+    order = np.argsort(key, kind="stable")
+    key, fid = key[order], fid[order]
+
+    # entry i pairs with the later entries of its cell: cnt[i] of them
+    starts = np.flatnonzero(np.r_[True, key[1:] != key[:-1]])
+    sizes = np.diff(np.r_[starts, len(key)])
+    grp = np.repeat(np.arange(len(starts)), sizes)
+    cnt = sizes[grp] - (np.arange(len(key)) - starts[grp]) - 1
+    del grp, starts, sizes
+    csum = np.cumsum(cnt)
+
+    # The pair's canonical cell holds the min corner of the boxes' overlap;
+    # floor is monotone, so that is the per-axis max of the two start cells --
+    # an integer test that drops repeats before any float work. Columns are
+    # kept as separate 1-D arrays: gathers and compares on them are much
+    # cheaper than reductions over a trailing axis of 3.
+    cx, cy, cz = (c0[:, j].astype(idt) for j in range(3))
+    box = [(lo[:, j].copy(), hi[:, j].copy()) for j in range(3)]
+    i0 = 0
+    while i0 < len(key):
+        base = csum[i0 - 1] if i0 else 0
+        i1 = max(int(np.searchsorted(csum, base + chunk, side="right")), i0 + 1)
+        c = cnt[i0:i1]
+        first = np.repeat(np.arange(i0, i1), c)
+        second = first + 1 + (np.arange(len(first)) - np.repeat(np.cumsum(c) - c, c))
+        i0 = i1
+        if not len(first):
+            continue
+        a, b = fid[first], fid[second]
+        cell = ((np.maximum(cx[a], cx[b]).astype(np.int64) * dims[1]
+                 + np.maximum(cy[a], cy[b])) * dims[2] + np.maximum(cz[a], cz[b]))
+        keep = np.flatnonzero(cell == key[first])
+        a, b = a[keep], b[keep]
+        keep = np.ones(len(a), dtype=bool)
+        for l, u in box:
+            keep &= np.maximum(l[a], l[b]) <= np.minimum(u[a], u[b])
+        yield a[keep], b[keep]
+
+
+# ---------------------------------------------------------------------------
+# NARROW PHASE
+# ---------------------------------------------------------------------------
+def _pairs_intersect(pts, faces, tri, normals, ok, a, b, eps):
+    fa, fb = faces[a], faces[b]
+    # eq[i][j]: vertex i of fa is vertex j of fb
+    eq = [[fa[:, i] == fb[:, j] for j in range(3)] for i in range(3)]
+    in_b = [e[0] | e[1] | e[2] for e in eq]          # vertex i of fa is in fb
+    in_a = [eq[0][j] | eq[1][j] | eq[2][j] for j in range(3)]
+    shared = in_b[0].astype(np.int8) + in_b[1] + in_b[2]
+    hit = shared == 3
+
+    m = np.flatnonzero(shared == 0)
+    if len(m):
+        am, bm = a[m], b[m]
+        hit[m] = _tri_tri(tri[am], tri[bm], normals[am], normals[bm],
+                          ok[am] & ok[bm], eps)
+
+    m = np.flatnonzero(shared == 1)
+    if len(m):
+        # index of the shared vertex within each face
+        i0 = np.where(in_b[0][m], 0, np.where(in_b[1][m], 1, 2))
+        i1 = np.where(in_a[0][m], 0, np.where(in_a[1][m], 1, 2))
+        hit[m] = _shared_vertex_fold(pts, faces, normals, a[m], b[m], i0, i1)
+    return hit
+
+
+def _shared_vertex_fold(pts, faces, normals, a, b, i0, i1):
+    """MeshLab's one-shared-vertex rule: the edge opposite the shared vertex,
+    moved halfway towards it, must pierce the other triangle's interior.
+
+    Prefilter: the pulled edge can only pierce the other face if its ends lie
+    on opposite sides of (or on) that face's plane; the shared vertex is on the
+    plane, so the sides are those of the two opposite vertices."""
+    hit = np.zeros(len(a), dtype=bool)
+    flat = faces.ravel()
+    for f, g, i in ((a, b, i0), (b, a, i1)):
+        f3 = f.astype(np.int64) * 3
+        s = pts[flat[f3 + i]]
+        w1 = pts[flat[f3 + (i + 1) % 3]] - s
+        w2 = pts[flat[f3 + (i + 2) % 3]] - s
+        n = normals[g]
+        d1 = np.einsum("ij,ij->i", w1, n)
+        d2 = np.einsum("ij,ij->i", w2, n)
+        m = np.flatnonzero(~hit & (d1 * d2 <= 0))
+        if len(m):
+            sm = s[m]
+            hit[m] = _segment_hits_interior(sm + 0.5 * w1[m], sm + 0.5 * w2[m],
+                                            pts[faces[g[m]]])
+    return hit
+
+
+def _segment_hits_interior(p, q, T):
+    """Moller-Trumbore segment [p, q] vs triangle T: hit strictly inside
+    (barycentrics > _BARY_EPS, sum < 1). Parallel segments never hit."""
+    e1, e2 = T[:, 1] - T[:, 0], T[:, 2] - T[:, 0]
+    d = q - p
+    pv = np.cross(d, e2)
+    det = np.einsum("ij,ij->i", e1, pv)
+    ok = np.abs(det) > 1e-300
+    inv = np.where(ok, 1.0 / np.where(ok, det, 1.0), 0.0)
+    s = p - T[:, 0]
+    u = np.einsum("ij,ij->i", s, pv) * inv
+    qv = np.cross(s, e1)
+    v = np.einsum("ij,ij->i", d, qv) * inv
+    t = np.einsum("ij,ij->i", e2, qv) * inv
+    return (ok & (t >= 0) & (t <= 1)
+            & (u > _BARY_EPS) & (v > _BARY_EPS) & (u + v < 1))
+
+
+def _unit_normals(T):
+    n = np.cross(T[:, 1] - T[:, 0], T[:, 2] - T[:, 0])
+    ln = np.linalg.norm(n, axis=1)
+    return n / np.where(ln > 0, ln, 1.0)[:, None], ln > 0
+
+
+def _plane_dists(T, n, P, eps):
+    d = np.einsum("ikj,ij->ik", P - T[:, :1], n)
+    d[np.abs(d) < eps] = 0.0
+    return d
+
+
+def _tri_tri(U, V, n1, n2, ok, eps):
+    """Moller's interval test for triangle pairs with no shared vertex (unit
+    normals n1 / n2; ok False for zero-area faces, which never intersect)."""
+    du = _plane_dists(V, n2, U, eps)
+    dv = _plane_dists(U, n1, V, eps)
+    # all three strictly on one side of the other's plane -> disjoint
+    live = (ok
+            & ~((du > 0).all(1) | (du < 0).all(1))
+            & ~((dv > 0).all(1) | (dv < 0).all(1)))
+    hit = np.zeros(len(U), dtype=bool)
+
+    copl = live & (du == 0).all(1)
+    if copl.any():
+        hit[copl] = _coplanar_tri_tri(U[copl], V[copl], n1[copl])
+
+    m = live & ~copl
+    if m.any():
+        D = np.cross(n1[m], n2[m])
+        ax = np.abs(D).argmax(axis=1)
+        r = np.arange(len(ax))
+        lo_u, hi_u = _interval(U[m][r, :, ax], du[m])
+        lo_v, hi_v = _interval(V[m][r, :, ax], dv[m])
+        hit[m] = ~((hi_u < lo_v) | (hi_v < lo_u))
+    return hit
+
+
+def _interval(p, d):
+    """[min, max] of where a triangle (vertex projections p, signed plane
+    distances d) crosses the other triangle's plane, along the shared line."""
+    lo = np.full(len(p), np.inf)
+    hi = np.full(len(p), -np.inf)
+    for i, j in ((0, 1), (1, 2), (2, 0)):
+        cross = d[:, i] * d[:, j] < 0
+        den = np.where(cross, d[:, i] - d[:, j], 1.0)
+        t = np.where(cross, p[:, i] + (p[:, j] - p[:, i]) * d[:, i] / den, np.nan)
+        on = d[:, i] == 0
+        t = np.where(on, p[:, i], t)
+        valid = cross | on
+        lo = np.where(valid, np.minimum(lo, t), lo)
+        hi = np.where(valid, np.maximum(hi, t), hi)
+    return lo, hi
+
+
+def _coplanar_tri_tri(U, V, n):
+    """2-D test for coplanar pairs: any edge crossing, or one triangle holding a
+    vertex of the other. Projected onto the plane dropping n's largest axis."""
+    drop = np.abs(n).argmax(axis=1)
+    keep = np.repeat(np.array([[1, 2], [0, 2], [0, 1]])[drop][:, None, :], 3, axis=1)
+    u = np.take_along_axis(U, keep, axis=2)
+    v = np.take_along_axis(V, keep, axis=2)
+
+    def orient(a, b, c):
+        return ((b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1])
+                - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0]))
+
+    hit = np.zeros(len(U), dtype=bool)
+    for i in range(3):
+        p, q = u[:, i], u[:, (i + 1) % 3]
+        for j in range(3):
+            s, t = v[:, j], v[:, (j + 1) % 3]
+            o1, o2 = orient(p, q, s), orient(p, q, t)
+            o3, o4 = orient(s, t, p), orient(s, t, q)
+            boxes = ((np.minimum(p, q) <= np.maximum(s, t))
+                     & (np.minimum(s, t) <= np.maximum(p, q))).all(axis=1)
+            hit |= (o1 * o2 <= 0) & (o3 * o4 <= 0) & boxes
+
+    def contains(tri, x):
+        o = np.stack([orient(tri[:, k], tri[:, (k + 1) % 3], x) for k in range(3)], 1)
+        return (o >= 0).all(1) | (o <= 0).all(1)
+
+    return hit | contains(v, u[:, 0]) | contains(u, v[:, 0])
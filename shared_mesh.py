@@ -0,0 +1,164 @@
+"""shared_mesh — hand mesh arrays to worker processes without copying them.
+
+A process pool that pickles `(pts, faces)` for every task copies hundreds of
+MB per handle on a raw scan. Instead the parent PUBLISHES the arrays once into
+`multiprocessing.shared_memory` blocks and sends each task a small picklable
+handle; workers ATTACH to the blocks and get zero-copy NumPy views.
+
+    with SharedMesh(pts, faces, topo=topo) as shm:   # parent
+        pool.submit(task, shm.handle, ...)
+
+    pts, faces = attach_mesh(handle)                 # worker
+    topo = attach_topology(handle)                   # MeshTopology or None
+
+The handle is a plain dict of `(block name, shape, dtype)` specs, plus the
+MeshTopology arrays when a topology was published, so workers skip the
+rebuild as well as the reload. The consumers (mesh_inspector.inspect_mesh,
+tunnel_loop_locator.locate_cut_loops / select_cut_loop) accept a handle in
+place of a path / arrays.
+
+Cleanup: the parent owns the blocks and unlinks them on close(). If close() is
+never reached (exception, dropped reference, interpreter exit) a
+weakref.finalize hook -- which also runs at exit -- unlinks them; if the
+parent is killed outright, multiprocessing's resource tracker unlinks the
+blocks it still has registered. Workers only keep their views alive for the
+life of the process (re-attaching the same handle is free).
+
+stdlib + numpy only; never imports pymeshlab / VTK.
+"""
+
+import multiprocessing
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+
+# owner-side: block name -> SharedMemory for blocks THIS process published
+_OWNED = {}
+
+
+def _publish(arr):
+    """Copy `arr` into a new shared block. Returns (block, spec)."""
+    arr = np.ascontiguousarray(arr)
+    # zero-size blocks are not allowed; one spare byte keeps empty arrays legal
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    view = np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)
+    view[...] = arr
+    del view
+    _OWNED[shm.name] = shm
+    return shm, (shm.name, tuple(arr.shape), arr.dtype.str)
+
+
+def _unlink_blocks(blocks):
+    """Unlink + close every block; safe to call more than once."""
+    while blocks:
+        shm = blocks.pop()
+        _OWNED.pop(shm.name, None)
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+        try:
+            shm.close()
+        except BufferError:
+            # views attached in this process are still alive; the mapping goes
+            # with them (the name is already unlinked)
+            pass
+
+
+class SharedMesh:
+    """Parent-side owner of the shared `pts` / `faces` (and topology) blocks.
+
+    `handle` is what workers receive. Use as a context manager (or call
+    close()) so the blocks are unlinked when the pool is done; the finalizer
+    is the safety net, not the normal path.
+
+    topo: optional tunnel_loop_extractor.MeshTopology of the same mesh; its
+    arrays are published too (see attach_topology).
+    """
+
+    def __init__(self, pts, faces, topo=None):
+        self._blocks = []
+        self._finalizer = weakref.finalize(self, _unlink_blocks, self._blocks)
+        self.handle = {}
+        try:
+            for key, arr in (("pts", np.asarray(pts, dtype=np.float64)),
+                             ("faces", np.asarray(faces, dtype=np.int64))):
+                self.handle[key] = self._add(arr)
+            if topo is not None:
+                self.handle["topo"] = {
+                    "n_v": int(topo.n_v), "n_f": int(topo.n_f),
+                    "arrays": {name: self._add(getattr(topo, name))
+                               for name in topo.ARRAYS},
+                }
+        except Exception:
+            self.close()
+            raise
+
+    def _add(self, arr):
+        shm, spec = _publish(arr)
+        self._blocks.append(shm)
+        return spec
+
+    def close(self):
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_handle(obj):
+    """True for a SharedMesh handle (the dict workers receive)."""
+    return isinstance(obj, dict) and "pts" in obj and "faces" in obj
+
+
+def as_handle(obj):
+    """SharedMesh -> its handle; a handle passes through; anything else None."""
+    if isinstance(obj, SharedMesh):
+        return obj.handle
+    return obj if is_handle(obj) else None
+
+
+# worker-side: block name -> SharedMemory, kept open so the views stay valid
+_ATTACHED = {}
+
+
+def _attach(spec):
+    name, shape, dtype = spec
+    shm = _OWNED.get(name) or _ATTACHED.get(name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=name)
+        # Attaching registers the block with the resource tracker. Pool workers
+        # share the owner's tracker, where that is a harmless duplicate; any
+        # other process has its own tracker, which would unlink the owner's
+        # block (and warn) when this process exits -- so opt out there.
+        if multiprocessing.parent_process() is None:
+            try:
+                resource_tracker.unregister(shm._name, "shared_memory")
+            except Exception:
+                pass
+        _ATTACHED[name] = shm
+    view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    # the owner's data: a stray in-place edit in a worker must not corrupt it
+    view.flags.writeable = False
+    return view
+
+
+def attach_mesh(handle):
+    """Worker side: zero-copy, read-only (pts, faces) views of a handle."""
+    return _attach(handle["pts"]), _attach(handle["faces"])
+
+
+def attach_topology(handle):
+    """Worker side: the published MeshTopology (views, no rebuild), or None
+    when the handle was created without one."""
+    t = handle.get("topo")
+    if t is None:
+        return None
+    from tunnel_loop_extractor import MeshTopology
+    arrays = {name: _attach(spec) for name, spec in t["arrays"].items()}
+    return MeshTopology.from_arrays(arrays, t["n_v"], t["n_f"])
@@ -0,0 +1,87 @@
+"""
+test_bench_tunnel.py
+====================
+
+Tests for bench_tunnel, the tunnel-pipeline benchmark. The synthetic surfaces
+must really have the genus they are built for (with and without noise, and
+through the subdivide-and-project path used for large targets), a benchmark
+case must produce a JSON-serialisable record per stage, and the comparison
+must flag only real slowdowns.
+
+Run with:   pytest test_bench_tunnel.py -v
+or simply:  python test_bench_tunnel.py
+"""
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyvista")
+
+import bench_tunnel
+from bench_tunnel import handle_sphere, bench_case, compare
+from tunnel_loop_extractor import mesh_genus
+
+
+@pytest.mark.parametrize("handles", [0, 1, 3])
+def test_handle_sphere_has_requested_genus(handles):
+    mesh = handle_sphere(handles, 8000)
+    assert mesh.genus == handles
+    assert mesh.counts[3:] == (1, 0)            # one closed piece
+    assert 4000 < len(mesh.faces) < 16000
+    noisy = handle_sphere(handles, 8000, noise=0.3)
+    assert noisy.genus == handles
+    np.testing.assert_array_equal(noisy.faces, mesh.faces)
+    assert not np.allclose(noisy.pts, mesh.pts)
+
+
+def test_subdivided_surface_keeps_genus_and_shape(monkeypatch):
+    monkeypatch.setattr(bench_tunnel, "_MAX_GRID", 60)
+    mesh = handle_sphere(2, 50000)
+    assert mesh.genus == 2 and mesh.counts[3:] == (1, 0)
+    assert len(mesh.faces) > 4 * 60 ** 2
+    # projected onto the implicit surface: every vertex on the zero level set
+    shape = (*bench_tunnel._handle_frames(2), np.linspace(0.1, 0.25, 2))
+    assert np.abs(bench_tunnel._sdf(mesh.pts / 30.0, shape)).max() < 1e-6
+    assert mesh_genus(mesh.pts, mesh.faces) == 2
+
+
+def test_thin_neck_is_reported():
+    with pytest.raises(ValueError, match="genus"):
+        handle_sphere(1, 2000, necks=[0.005])
+
+
+def test_bench_case_records_every_stage():
+    mesh = handle_sphere(1, 6000)
+    out = bench_case(mesh, 1, log=lambda msg: None, nx_max_faces=1000)
+    assert set(out) == {
+        "genus", "topology", "homology", "extract_tight_cut_loops",
+        "select_cut_loop", "dual_crossing_loop", "cut_and_cap_loops",
+        "genus_after_cut", "baseline_mesh_genus_nx", "baseline_genus_after_cut_nx"}
+    assert out["genus"]["genus"] == 1
+    assert out["extract_tight_cut_loops"]["loops"] == 1
+    assert out["genus_after_cut"]["seconds"] >= 0
+    assert "peak_mb" in out["topology"]
+    assert "skipped" in out["baseline_mesh_genus_nx"]     # over nx_max_faces
+    json.dumps(out)
+    only = bench_case(mesh, 1, log=lambda msg: None, memory=False,
+                      stages=["genus_after_cut"])
+    assert list(only) == ["genus_after_cut"] and "peak_mb" not in only["genus_after_cut"]
+
+
+def test_compare_flags_only_real_slowdowns():
+    def results(**secs):
+        return {"cases": [{"name": "g1_10k_noise0",
+                           "stages": {k: {"seconds": v} for k, v in secs.items()}}]}
+    old = results(topology=1.0, homology=0.01, genus=1.0)
+    new = results(topology=1.5, homology=0.03, genus=1.1)
+    rows = {r[1]: r for r in compare(old, new)}
+    assert rows["topology"][5]                 # 1.5x and 0.5 s slower
+    assert not rows["homology"][5]             # 3x, but only 20 ms
+    assert not rows["genus"][5]                # within the threshold
+    assert compare(old, {"cases": []}) == []
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,157 @@
+"""
+test_mesh_inspector.py
+======================
+
+Tests for mesh_inspector.inspect_mesh — the single-load inspection engine.
+The NumPy duplicate-vertex / null-face counts must equal what the PyMeshLab
+repair filters they replace would remove, the file must be parsed once, and
+an unchanged file must be answered from the report cache without parsing.
+Skips when pymeshlab is not installed.
+
+Run with:   python test_mesh_inspector.py
+or:         pytest test_mesh_inspector.py
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+try:
+    import pymeshlab
+    import mesh_inspector
+except ImportError:  # pragma: no cover - depends on the environment
+    pymeshlab = None
+
+
+def _messy_mesh():
+    """Two interpenetrating octahedra plus the defects the counts look for:
+    exact and signed-zero duplicate vertices, unreferenced duplicates, a
+    repeated-index face, a collinear face and a sub-epsilon (but non-zero)
+    sliver that MeshLab keeps."""
+    octa = np.array([[1, 0, 0], [-1, 0, 0], [0, 1, 0], [0, -1, 0],
+                     [0, 0, 1], [0, 0, -1]], dtype=float) * 10.0
+    tris = np.array([[0, 2, 4], [2, 1, 4], [1, 3, 4], [3, 0, 4],
+                     [2, 0, 5], [1, 2, 5], [3, 1, 5], [0, 3, 5]])
+    pts = np.vstack([octa, octa + 3.0])
+    faces = np.vstack([tris, tris + 6])
+    n = len(pts)
+    extra = np.array([[10.0, 0, 0],              # duplicate of vertex 0
+                      [-0.0, 10.0, 0],           # -0.0 duplicate of vertex 2
+                      [7.0, 7.0, 7.0], [7.0, 7.0, 7.0],   # unreferenced pair
+                      [0, 0, 0], [1, 1, 1], [2, 2, 2],    # collinear
+                      [0, 0, 0.0], [1, 0, 0], [0, 1e-30, 0]])  # tiny sliver
+    pts = np.vstack([pts, extra])
+    faces = np.vstack([faces,
+                       [[n, 2, 4], [n + 1, 0, 4], [0, 0, 1],
+                        [n + 4, n + 5, n + 6], [n + 7, n + 8, n + 9]]])
+    return pts, faces
+
+
+@unittest.skipIf(pymeshlab is None, "pymeshlab not installed")
+class TestInspectMesh(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        pts, faces = _messy_mesh()
+        self.pts, self.faces = pts, faces
+        self.path = os.path.join(self.tmp, "messy.ply")
+        ms = pymeshlab.MeshSet()
+        ms.add_mesh(pymeshlab.Mesh(pts, faces))
+        ms.save_current_mesh(self.path)
+
+    def _filter_delta(self, name):
+        ms = pymeshlab.MeshSet()
+        ms.load_new_mesh(self.path)
+        m = ms.current_mesh()
+        before = (m.vertex_number(), m.face_number())
+        getattr(ms, name)()
+        m = ms.current_mesh()
+        return before[0] - m.vertex_number(), before[1] - m.face_number()
+
+    def test_numpy_counts_match_repair_filters(self):
+        counts = mesh_inspector.inspect_mesh(self.path)["counts"]
+        dv, _ = self._filter_delta("meshing_remove_duplicate_vertices")
+        _, nf = self._filter_delta("meshing_remove_null_faces")
+        self.assertEqual(counts["dup_verts"], dv)
+        self.assertEqual(counts["null_faces"], nf)
+        self.assertGreater(counts["dup_verts"], 0)
+        self.assertGreater(counts["null_faces"], 0)
+        self.assertGreater(counts["si_faces"], 0)
+
+    def _count_loads(self, **kwargs):
+        """(report, number of file parses) for one inspect_mesh call."""
+        real = pymeshlab.MeshSet.load_new_mesh
+        calls = []
+
+        def counting_load(ms, *args, **kw):
+            calls.append(args)
+            return real(ms, *args, **kw)
+
+        with mock.patch.object(pymeshlab.MeshSet, "load_new_mesh", counting_load):
+            report = mesh_inspector.inspect_mesh(self.path, **kwargs)
+        return report, len(calls)
+
+    def test_file_parsed_once(self):
+        _, loads = self._count_loads(max_freq_hz=18000, use_cache=False)
+        self.assertEqual(loads, 1)
+
+    def test_cached_report_returned_without_parsing(self):
+        first, loads = self._count_loads()
+        self.assertEqual(loads, 1)
+        again, loads = self._count_loads()
+        self.assertEqual(loads, 0)
+        self.assertEqual(again, first)
+        # other parameters are a different key
+        _, loads = self._count_loads(max_freq_hz=18000)
+        self.assertEqual(loads, 1)
+        # bypass always inspects
+        _, loads = self._count_loads(use_cache=False)
+        self.assertEqual(loads, 1)
+
+    def test_changed_content_misses(self):
+        first, _ = self._count_loads()
+        ms = pymeshlab.MeshSet()
+        ms.add_mesh(pymeshlab.Mesh(self.pts[:12], self.faces[:16]))
+        ms.save_current_mesh(self.path)
+        report, loads = self._count_loads()
+        self.assertEqual(loads, 1)
+        self.assertNotEqual(report["counts"], first["counts"])
+
+
+@unittest.skipIf(pymeshlab is None, "pymeshlab not installed")
+class TestMergeByDistance(unittest.TestCase):
+
+    def test_chain_follows_remove_doubles_not_union_find(self):
+        # 0 claims 1 (0.2 away); 2 is 0.2 from 1 but 0.4 from 0 and 1 is
+        # already merged, so 2 survives -- a transitive union-find would
+        # collapse all three.
+        pts = np.array([[0, 0, 0], [0.2, 0, 0], [0.4, 0, 0], [0, 5, 0]], float)
+        faces = np.array([[0, 2, 3], [1, 2, 3]])
+        out_pts, out_faces, n = mesh_inspector.merge_by_distance(pts, faces, 0.3)
+        self.assertEqual(n, 1)
+        np.testing.assert_array_equal(out_pts, pts[[0, 2, 3]])
+        # face (1,2,3) became (0,2,3): a duplicate of the first face
+        np.testing.assert_array_equal(out_faces, [[0, 1, 2]])
+
+    def test_sliver_removed_and_survivor_keeps_position(self):
+        pts = np.array([[0, 0, 0], [10, 0, 0], [0, 10, 0], [10, 10, 0],
+                        [10.1, 10.1, 0]], float)
+        faces = np.array([[0, 1, 2], [1, 3, 2], [1, 4, 3], [2, 3, 4]])
+        out_pts, out_faces, n = mesh_inspector.merge_by_distance(pts, faces, 0.305)
+        self.assertEqual(n, 1)
+        np.testing.assert_array_equal(out_pts, pts[:4])
+        np.testing.assert_array_equal(out_faces, [[0, 1, 2], [1, 3, 2]])
+
+    def test_no_pairs_is_identity(self):
+        pts, faces = _messy_mesh()
+        pts, faces = pts[:12], faces[:16]      # the two clean octahedra
+        out_pts, out_faces, n = mesh_inspector.merge_by_distance(pts, faces, 1e-3)
+        self.assertEqual(n, 0)
+        np.testing.assert_array_equal(out_pts, pts)
+        np.testing.assert_array_equal(out_faces, faces)
+
+
+if __name__ == "__main__":
+    unittest.main()
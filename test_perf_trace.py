@@ -0,0 +1,211 @@
+"""
+test_perf_trace.py
+==================
+
+Tests for perf_trace, the workers' per-stage timing. Stages must nest and
+record wall/CPU time and peak RSS, every stage and the run summary must come
+out as a `[TRACE]` line that parse_trace_line reads back, the Chrome-trace
+file must be valid JSON with one complete event per stage (also for stages
+run on other threads, which keep the parent handed to them, and for a run
+that fails), and stage()/traced() must be silent pass-throughs when no tracer
+is open. On the GUI side, TraceCollector must rebuild a run record from the
+log stream, also for a worker killed before its summary, and stage_rows must
+nest stages by their recorded parent (overlapping siblings of a parallel step
+stay siblings).
+
+Run with:   pytest test_perf_trace.py -v
+or simply:  python test_perf_trace.py
+"""
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import perf_trace
+from perf_trace import (Tracer, TraceCollector, stage, traced, format_trace_line,
+                        parse_trace_line, stage_rows, previous_stage_times,
+                        is_regression)
+
+
+def _busy(seconds):
+    end = time.process_time() + seconds
+    while time.process_time() < end:
+        pass
+
+
+def test_stages_nest_and_are_written(tmp_path):
+    path = str(tmp_path / "Traces" / "worker.trace.json")
+    lines = []
+    with Tracer("worker", path, log=lines.append) as tr:
+        with stage("outer", side="left"):
+            _busy(0.02)
+            with stage("inner"):
+                time.sleep(0.01)
+    rows = [parse_trace_line(l) for l in lines]
+    assert [r.get("stage") for r in rows] == [None, "inner", "outer", None]
+    start, inner, outer, summary = rows
+    assert start == {"worker": "worker", "status": "running"}
+    assert inner["start_s"] >= outer["start_s"]
+    assert inner["parent"] == "outer" and "parent" not in outer
+    assert inner["wall_s"] >= 0.009 and outer["wall_s"] >= inner["wall_s"]
+    assert outer["cpu_s"] >= 0.015
+    assert outer["peak_rss_mb"] > 0
+    assert summary["worker"] == "worker" and summary["status"] == "ok"
+    assert summary["stages"] == 2 and summary["trace"] == path
+    assert tr.status == "ok"
+
+    with open(path) as f:
+        data = json.load(f)
+    events = [e for e in data["traceEvents"] if e["ph"] == "X"]
+    assert [e["name"] for e in events] == ["outer", "inner"]       # by start
+    ev = events[0]
+    assert ev["args"]["side"] == "left" and ev["dur"] >= events[1]["dur"]
+    assert events[1]["ts"] >= ev["ts"]
+    assert data["otherData"]["status"] == "ok"
+    assert not [f for f in os.listdir(tmp_path / "Traces") if f.endswith(".tmp")]
+
+
+def test_failed_run_records_error_and_still_writes(tmp_path):
+    path = str(tmp_path / "t.json")
+    lines = []
+    with pytest.raises(SystemExit):
+        with Tracer("w", path, log=lines.append):
+            with stage("grade_left"):
+                raise SystemExit(1)
+    row = parse_trace_line(lines[1])
+    assert row["stage"] == "grade_left" and row["error"] == "SystemExit"
+    assert parse_trace_line(lines[-1])["status"] == "failed"
+    with open(path) as f:
+        assert json.load(f)["otherData"]["status"] == "failed"
+
+    lines.clear()
+    with pytest.raises(SystemExit):
+        with Tracer("w", log=lines.append):
+            raise SystemExit(0)
+    assert parse_trace_line(lines[-1])["status"] == "ok"
+
+
+def test_threads_get_their_own_tracks(tmp_path):
+    lines = []
+    with Tracer("w", log=lines.append) as tr:
+        def work(side, parent):
+            with stage(f"inspect_{side}", parent=parent):
+                time.sleep(0.01)
+        with stage("inspection"):
+            parent = perf_trace.current_stage()
+            threads = [threading.Thread(target=work, args=(s, parent))
+                       for s in ("left", "right")]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+    data = tr.chrome_trace()
+    events = {e["name"]: e for e in data["traceEvents"] if e["ph"] == "X"}
+    assert set(events) == {"inspection", "inspect_left", "inspect_right"}
+    assert events["inspect_left"]["tid"] != events["inspection"]["tid"]
+    names = {e["tid"] for e in data["traceEvents"] if e["name"] == "thread_name"}
+    assert {e["tid"] for e in events.values()} <= names
+    recs = {r["stage"]: r for r in map(parse_trace_line, lines) if r and "stage" in r}
+    assert recs["inspect_left"]["parent"] == recs["inspect_right"]["parent"] == "inspection"
+    assert perf_trace.current_stage() is None
+
+
+def test_stage_and_traced_without_tracer_are_silent(capsys):
+    assert perf_trace.active() is None
+
+    @traced()
+    def resample(x):
+        return 2 * x
+
+    with stage("outside"):
+        assert resample(3) == 6
+    assert capsys.readouterr().out == ""
+
+    lines = []
+    with Tracer("w", log=lines.append):
+        assert resample(4) == 8
+    assert parse_trace_line(lines[1])["stage"] == "resample"
+    assert perf_trace.active() is None
+
+
+def test_trace_line_round_trip():
+    line = format_trace_line(stage="save", wall_s=1.23456, stages=3, skipped=None,
+                             trace=r"C:\My Project\Traces\w.trace.json")
+    assert "skipped" not in line and "wall_s=1.235" in line
+    assert parse_trace_line("12:00:01 " + line) == {
+        "stage": "save", "wall_s": 1.235, "stages": 3,
+        "trace": r"C:\My Project\Traces\w.trace.json"}
+    assert parse_trace_line("[MESH_CHECK] side=Left severity=ok") is None
+
+
+def _worker_lines():
+    lines = []
+    with Tracer("process_and_grade", log=lines.append):
+        with stage("remesh"):
+            time.sleep(0.005)
+        with stage("inspection"):
+            with stage("inspect_left"):
+                time.sleep(0.005)
+            with stage("inspect_right"):
+                time.sleep(0.005)
+    return lines
+
+
+def test_collector_rebuilds_runs_from_the_log_stream():
+    lines = _worker_lines()
+    col = TraceCollector()
+    done = [col.feed("12:00:00 " + l) for l in ["--> Starting...", *lines, "[+] Success."]]
+    run = done[-2]
+    assert done[-1] is None and all(d is None for d in done[:-2])
+    assert run["worker"] == "process_and_grade" and run["status"] == "ok"
+    assert run["wall_s"] >= 0 and "finished" in run
+    assert [s["stage"] for s in run["stages"]] == [
+        "remesh", "inspect_left", "inspect_right", "inspection"]
+    rows = stage_rows(run["stages"])
+    assert [(d, s["stage"]) for d, s in rows] == [
+        (0, "remesh"), (0, "inspection"), (1, "inspect_left"), (1, "inspect_right")]
+    assert col.abort() is None
+
+    # killed after two stages: the partial run is kept as "incomplete"
+    for l in lines[:3]:
+        assert col.feed(l) is None
+    partial = col.abort()
+    assert partial["status"] == "incomplete" and len(partial["stages"]) == 2
+    assert partial["wall_s"] >= 0
+
+
+def test_stage_rows_keep_overlapping_siblings_apart():
+    def st(name, start, wall, parent=None):
+        rec = {"stage": name, "start_s": start, "wall_s": wall}
+        if parent:
+            rec["parent"] = parent
+        return rec
+    # both ears graded at once, each inspected when its grading ends
+    stages = [st("remesh", 0, 10),
+              st("grade_left", 10, 100, "grade_and_inspect"),
+              st("grade_right", 10, 120, "grade_and_inspect"),
+              st("inspect_left", 110, 30, "grade_and_inspect"),
+              st("inspect_right", 130, 15, "grade_and_inspect"),
+              st("grade_and_inspect", 10, 135)]
+    assert [(d, s["stage"]) for d, s in stage_rows(stages)] == [
+        (0, "remesh"), (0, "grade_and_inspect"), (1, "grade_right"), (1, "grade_left"),
+        (1, "inspect_left"), (1, "inspect_right")]
+
+
+def test_previous_stage_times_and_regressions():
+    def st(name, start, wall):
+        return {"stage": name, "start_s": start, "wall_s": wall}
+    now = [st("master", 0, 10), st("resample", 1, 5), st("master", 10, 4)]
+    before = [st("master", 0, 6), st("master", 6, 3.5)]
+    assert previous_stage_times(now, before) == [6, None, 3.5]
+    assert is_regression(10, 6)                 # 1.67x and 4 s slower
+    assert not is_regression(4, 3.5)            # within the threshold
+    assert not is_regression(0.3, 0.1)          # 3x but only 0.2 s
+    assert not is_regression(5, None)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -0,0 +1,127 @@
+"""
+test_process_and_grade.py
+=========================
+
+Tests for process_and_grade.run_processing with a stand-in grading binary (a
+small Python script that copies the remeshed STL to the graded PLY and logs
+when it ran). Both ears must be graded at the same time unless limited to one
+job, their output must reach the log prefixed per ear, and a failing ear --
+grading or inspection -- must not stop the other one from being graded and
+inspected.
+
+Run with:   pytest test_process_and_grade.py -v
+or simply:  python test_process_and_grade.py
+"""
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pymeshlab")
+pv = pytest.importorskip("pyvista")
+
+if sys.platform == "win32":
+    pytest.skip("the stand-in grading binary is a shebang script", allow_module_level=True)
+
+import process_and_grade
+from project_store import ProjectStore, MESH_GRADED
+
+FAKE_GRADER = """#!{python}
+import json, os, sys, time
+import pymeshlab
+def arg(flag):
+    return sys.argv[sys.argv.index(flag) + 1]
+side = arg("-s")
+t0 = time.time()
+print(f"grading {{side}}", flush=True)
+time.sleep(0.5)
+if side == os.environ.get("FAKE_GRADER_FAIL"):
+    print("out of memory", flush=True)
+    sys.exit(3)
+ms = pymeshlab.MeshSet()
+ms.load_new_mesh(arg("-i"))
+ms.save_current_mesh(arg("-o"))
+with open(os.path.join(os.path.dirname(arg("-o")), side + ".times"), "w") as f:
+    json.dump([t0, time.time()], f)
+print(f"done {{side}}", flush=True)
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    mesh_dir = tmp_path / "Meshes"
+    mesh_dir.mkdir()
+    (tmp_path / "project.json").write_text(json.dumps({"project_resolution": "lowres"}))
+    aligned = mesh_dir / "aligned_head.ply"
+    pv.Sphere(radius=80, theta_resolution=24, phi_resolution=24).save(str(aligned))
+    (mesh_dir / "aligned_head_info.json").write_text(json.dumps({"ear_width": 150.0}))
+    grader = tmp_path / "fake_grader"
+    grader.write_text(FAKE_GRADER.format(python=sys.executable))
+    grader.chmod(0o755)
+    return str(aligned), str(grader), mesh_dir
+
+
+def _times(mesh_dir, side):
+    return json.loads((mesh_dir / f"{side}.times").read_text())
+
+
+def test_ears_graded_in_parallel_with_prefixed_output(project, capsys):
+    aligned, grader, mesh_dir = project
+    process_and_grade.run_processing(aligned, grader)
+    out = capsys.readouterr().out
+    assert "      [Left] grading left" in out and "      [Right] done right" in out
+    (l0, l1), (r0, r1) = _times(mesh_dir, "left"), _times(mesh_dir, "right")
+    assert l0 < r1 and r0 < l1                        # the runs overlapped
+    store = ProjectStore.for_mesh_dir(str(mesh_dir))
+    assert set(store.read_check_data(MESH_GRADED)) == {"left", "right"}
+    assert "[TRACE] stage=inspect_right parent=grade_and_inspect" in out
+    assert "[TRACE] stage=grade_left parent=grade_and_inspect" in out
+    assert os.path.exists(store.trace_path("process_and_grade"))
+
+
+def test_max_parallel_one_grades_sequentially(project):
+    aligned, grader, mesh_dir = project
+    process_and_grade.run_processing(aligned, grader, max_parallel=1)
+    (l0, l1), (r0, r1) = _times(mesh_dir, "left"), _times(mesh_dir, "right")
+    assert l1 <= r0
+
+
+def test_failing_ear_does_not_stop_the_other(project, capsys, monkeypatch):
+    aligned, grader, mesh_dir = project
+    monkeypatch.setenv("FAKE_GRADER_FAIL", "left")
+    with pytest.raises(SystemExit) as exc:
+        process_and_grade.run_processing(aligned, grader)
+    assert exc.value.code == 1
+    out = capsys.readouterr().out
+    assert "[Left] out of memory" in out
+    assert "[ERROR] Grading failed for: Left" in out
+    assert (mesh_dir / "Right_Graded.ply").exists()
+    check = ProjectStore.for_mesh_dir(str(mesh_dir)).read_check_data(MESH_GRADED)
+    assert check["left"] == {"severity": "critical", "counts": {"grading_failed": 1}}
+    assert check["right"]["severity"] != "critical"
+
+
+
+def test_failing_inspection_does_not_lose_the_other_ear(project, capsys, monkeypatch):
+    aligned, grader, mesh_dir = project
+    import mesh_inspector
+    real = mesh_inspector.cached_inspection
+
+    def cached_inspection(path, **kw):
+        if os.path.basename(path) == "Right_Graded.ply":
+            raise OSError("truncated PLY")
+        return real(path, **kw)
+    monkeypatch.setattr(mesh_inspector, "cached_inspection", cached_inspection)
+    with pytest.raises(SystemExit) as exc:
+        process_and_grade.run_processing(aligned, grader)
+    assert exc.value.code == 1
+    out = capsys.readouterr().out
+    assert "[ERROR] Right inspection failed: truncated PLY" in out
+    assert "Grading failed for" not in out
+    check = ProjectStore.for_mesh_dir(str(mesh_dir)).read_check_data(MESH_GRADED)
+    assert check["right"] == {"severity": "critical", "counts": {"inspection_failed": 1}}
+    assert check["left"]["severity"] != "critical"
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))
@@ -15,7 +15,8 @@ import tempfile
 import unittest
 
 from project_store import (
-    ProjectStore, CleanState, MESH_ALIGNED, MESH_GRADED,
+    ProjectStore, CleanState, MESH_ALIGNED, MESH_GRADED, INSPECTION_CACHE_FILE,
+    TUNNEL_CACHE_SUFFIX, PERF_HISTORY_FILE,
 )
 
 
@@ -274,5 +275,136 @@ class Resolution(unittest.TestCase):
             self.assertEqual(ProjectStore(root).resolution(), "standard")
 
 
+class InspectionCache(unittest.TestCase):
+    def test_miss_then_hit(self):
+        with tempfile.TemporaryDirectory() as md:
+            s = ProjectStore(md, mesh_dir=md)
+            self.assertIsNone(s.read_cached_inspection("k1"))
+            report = {"severity": "ok", "counts": {"genus": 0, "volume": None}}
+            s.write_cached_inspection("k1", report)
+            self.assertEqual(s.read_cached_inspection("k1"), report)
+            self.assertIsNone(s.read_cached_inspection("k2"))
+
+    def test_corrupt_cache_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as md:
+            with open(os.path.join(md, INSPECTION_CACHE_FILE), "w") as f:
+                f.write("{not json")
+            s = ProjectStore(md, mesh_dir=md)
+            self.assertIsNone(s.read_cached_inspection("k"))
+            s.write_cached_inspection("k", {"severity": "ok"})
+            self.assertEqual(s.read_cached_inspection("k"), {"severity": "ok"})
+
+    def test_oldest_entries_dropped(self):
+        with tempfile.TemporaryDirectory() as md:
+            s = ProjectStore(md, mesh_dir=md)
+            for i in range(40):
+                s.write_cached_inspection(f"k{i}", {"i": i})
+            self.assertIsNone(s.read_cached_inspection("k0"))
+            self.assertEqual(s.read_cached_inspection("k39"), {"i": 39})
+            # re-writing a key refreshes it
+            s.write_cached_inspection("k8", {"i": 8})
+            for i in range(40, 63):
+                s.write_cached_inspection(f"k{i}", {"i": i})
+            self.assertEqual(s.read_cached_inspection("k8"), {"i": 8})
+
+    def test_reset_mesh_artifacts_invalidates(self):
+        with tempfile.TemporaryDirectory() as md:
+            s = ProjectStore(md, mesh_dir=md)
+            s.write_cached_inspection("k", {"severity": "ok"})
+            self.assertIn(INSPECTION_CACHE_FILE, s.list_mesh_artifacts())
+            self.assertIn(INSPECTION_CACHE_FILE, s.reset_mesh_artifacts())
+            self.assertIsNone(s.read_cached_inspection("k"))
+
+    def test_failed_write_leaves_no_temp_file(self):
+        # same for the cut-pair cache and the perf history (shared writer)
+        with tempfile.TemporaryDirectory() as md:
+            s = ProjectStore(md, mesh_dir=md)
+            s.write_cached_inspection("k", {"severity": "ok"})
+            before = sorted(os.listdir(md))
+            bad = {"value": object()}
+            with self.assertRaises(TypeError):
+                s.write_cached_inspection("k2", bad)
+            with self.assertRaises(TypeError):
+                s.write_cached_cut_pairs(os.path.join(md, "aligned_head.ply"), "k", [bad])
+            with self.assertRaises(TypeError):
+                s.append_perf_run(bad)
+            self.assertEqual(sorted(os.listdir(md)), before)
+            self.assertEqual(s.read_cached_inspection("k"), {"severity": "ok"})
+
+
+class TunnelCache(unittest.TestCase):
+    def test_key_must_match(self):
+        with tempfile.TemporaryDirectory() as md:
+            s = ProjectStore(md, mesh_dir=md)
+            mesh = os.path.join(md, "aligned_head.ply")
+            self.assertIsNone(s.read_cached_cut_pairs(mesh, "k1"))
+            pairs = [{"cut": [1, 2, 3], "avoid": None, "scores": {"cut": 0.9}}]
+            s.write_cached_cut_pairs(mesh, "k1", pairs)
+            self.assertEqual(s.read_cached_cut_pairs(mesh, "k1"), pairs)
+            # a hash mismatch (edited mesh) is a miss, and one write replaces it
+            self.assertIsNone(s.read_cached_cut_pairs(mesh, "k2"))
+            s.write_cached_cut_pairs(mesh, "k2", [])
+            self.assertIsNone(s.read_cached_cut_pairs(mesh, "k1"))
+            # per mesh stem
+            other = os.path.join(md, "Left_Graded.ply")
+            self.assertIsNone(s.read_cached_cut_pairs(other, "k2"))
+
+    def test_corrupt_cache_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as md:
+            s = ProjectStore(md, mesh_dir=md)
+            mesh = os.path.join(md, "aligned_head.ply")
+            with open(s.tunnel_cache_path(mesh), "w") as f:
+                f.write("[1, 2")
+            self.assertIsNone(s.read_cached_cut_pairs(mesh, "k"))
+
+    def test_reset_mesh_artifacts_clears(self):
+        with tempfile.TemporaryDirectory() as md:
+            s = ProjectStore(md, mesh_dir=md)
+            mesh = os.path.join(md, "aligned_head.ply")
+            s.write_cached_cut_pairs(mesh, "k", [])
+            name = "aligned_head" + TUNNEL_CACHE_SUFFIX
+            self.assertIn(name, s.list_mesh_artifacts())
+            self.assertIn(name, s.reset_mesh_artifacts())
+            self.assertIsNone(s.read_cached_cut_pairs(mesh, "k"))
+
+
+
+class PerfHistory(unittest.TestCase):
+    def test_append_and_read_in_order(self):
+        with tempfile.TemporaryDirectory() as root:
+            s = ProjectStore(root)
+            self.assertEqual(s.read_perf_history(), [])
+            s.append_perf_run({"worker": "a", "wall_s": 1.0, "stages": []})
+            s.append_perf_run({"worker": "b", "wall_s": 2.0, "stages": []})
+            self.assertEqual([r["worker"] for r in s.read_perf_history()], ["a", "b"])
+            self.assertEqual(s.perf_history_path, os.path.join(root, PERF_HISTORY_FILE))
+
+    def test_corrupt_history_starts_over(self):
+        with tempfile.TemporaryDirectory() as root:
+            with open(os.path.join(root, PERF_HISTORY_FILE), "w") as f:
+                f.write("{broken")
+            s = ProjectStore(root)
+            self.assertEqual(s.read_perf_history(), [])
+            s.append_perf_run({"worker": "a"})
+            self.assertEqual(s.read_perf_history(), [{"worker": "a"}])
+
+    def test_oldest_runs_dropped_and_not_a_mesh_artifact(self):
+        with tempfile.TemporaryDirectory() as root:
+            s = ProjectStore(root, mesh_dir=root)
+            for i in range(205):
+                s.append_perf_run({"i": i})
+            runs = s.read_perf_history()
+            self.assertEqual((len(runs), runs[0]["i"], runs[-1]["i"]), (200, 5, 204))
+            self.assertNotIn(PERF_HISTORY_FILE, s.reset_mesh_artifacts())
+
+    def test_trace_path_under_project_root(self):
+        with tempfile.TemporaryDirectory() as root:
+            os.makedirs(os.path.join(root, "Meshes"))
+            _write_json(os.path.join(root, "project.json"), {})
+            s = ProjectStore.for_mesh_dir(os.path.join(root, "Meshes"))
+            self.assertEqual(s.trace_path("import_mesh"),
+                             os.path.join(root, "Traces", "import_mesh.trace.json"))
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+"""
+test_self_intersection.py
+=========================
+
+Tests for self_intersection.self_intersecting_faces, the NumPy replacement
+for PyMeshLab's per-face self-intersection selection. The mask must follow
+MeshLab's shared-vertex rules (fans and edge neighbours are never flagged, a
+fold through a shared vertex is, a duplicate face always is), must not depend
+on the scale of the mesh or on the chunk size, and must select the same
+faces as the PyMeshLab filter when pymeshlab is installed.
+
+Run with:   pytest test_self_intersection.py -v
+or simply:  python test_self_intersection.py
+"""
+import numpy as np
+import pytest
+
+from self_intersection import self_intersecting_faces
+
+
+def _sphere(center=(0.0, 0.0, 0.0), radius=10.0, nu=32, nv=16):
+    """Closed UV sphere (poles as single vertices), outward-facing."""
+    th = np.linspace(0, np.pi, nv + 1)[1:-1]
+    ph = np.linspace(0, 2 * np.pi, nu, endpoint=False)
+    T, P = np.meshgrid(th, ph, indexing="ij")
+    ring = np.c_[(np.sin(T) * np.cos(P)).ravel(), (np.sin(T) * np.sin(P)).ravel(),
+                 np.cos(T).ravel()]
+    pts = np.vstack([[0, 0, 1], ring, [0, 0, -1]]) * radius + np.asarray(center)
+    south = len(pts) - 1
+    faces = []
+    for j in range(nu):
+        k = (j + 1) % nu
+        faces.append([0, 1 + j, 1 + k])
+        faces.append([south, 1 + (nv - 2) * nu + k, 1 + (nv - 2) * nu + j])
+    for i in range(nv - 2):
+        for j in range(nu):
+            k = (j + 1) % nu
+            a, b = 1 + i * nu + j, 1 + i * nu + k
+            c, d = a + nu, b + nu
+            faces += [[a, c, b], [b, c, d]]
+    return pts, np.array(faces)
+
+
+def _two_spheres():
+    p1, f1 = _sphere()
+    p2, f2 = _sphere(center=(12.0, 3.0, 1.0), radius=8.0)
+    return np.vstack([p1, p2]), np.vstack([f1, f2 + len(p1)])
+
+
+def test_closed_sphere_is_clean():
+    pts, faces = _sphere()
+    assert not self_intersecting_faces(pts, faces).any()
+
+
+def test_overlapping_spheres_flag_the_seam_only():
+    pts, faces = _two_spheres()
+    mask = self_intersecting_faces(pts, faces)
+    n1 = len(_sphere()[1])
+    # both shells take part, but only along the intersection curve
+    assert mask[:n1].any() and mask[n1:].any()
+    assert mask.sum() < len(faces) // 4
+
+
+def test_mask_independent_of_scale_and_chunk():
+    pts, faces = _two_spheres()
+    pts = pts + np.random.default_rng(0).normal(0, 0.05, pts.shape)
+    mask = self_intersecting_faces(pts, faces)
+    for scale in (1e-3, 1e3):
+        np.testing.assert_array_equal(self_intersecting_faces(pts * scale, faces), mask)
+    np.testing.assert_array_equal(self_intersecting_faces(pts, faces, chunk=97), mask)
+
+
+def test_shared_vertex_rules():
+    pts = np.array([[0, 0, 0], [4, 0, 0], [0, 4, 0],      # flat base triangle
+                    [4, 4, 0],                             # fan neighbour
+                    [1, 1, -1], [1, 1, 3], [6, 6, 6]], float)
+    # plain fan around a shared vertex / shared edge -> clean
+    assert not self_intersecting_faces(pts, [[0, 1, 2], [0, 3, 2]]).any()
+    assert not self_intersecting_faces(pts, [[0, 1, 2], [1, 3, 2]]).any()
+    # one shared vertex, the other face folds back through the base -> both
+    mask = self_intersecting_faces(pts, [[0, 1, 2], [0, 4, 5], [1, 6, 3]])
+    np.testing.assert_array_equal(mask, [True, True, False])
+    # two shared vertices is an edge neighbour even when folded flat onto it
+    folded = np.vstack([pts, [[1, 1, 0]]])
+    assert not self_intersecting_faces(folded, [[0, 1, 2], [0, 1, 7]]).any()
+
+
+def test_duplicate_and_crossing_faces():
+    pts = np.array([[0, 0, 0], [4, 0, 0], [0, 4, 0],
+                    [1, 1, -2], [1, 1, 2], [3, 3, 2], [9, 9, 9]], float)
+    mask = self_intersecting_faces(pts, [[0, 1, 2], [2, 1, 0], [1, 6, 5]])
+    np.testing.assert_array_equal(mask, [True, True, False])
+    # disjoint vertex sets, one triangle stabbing the other
+    mask = self_intersecting_faces(pts, [[0, 1, 2], [3, 4, 5]])
+    np.testing.assert_array_equal(mask, [True, True])
+
+
+def test_matches_pymeshlab_selection():
+    pymeshlab = pytest.importorskip("pymeshlab")
+    pts, faces = _two_spheres()
+    pts = pts + np.random.default_rng(1).normal(0, 0.3, pts.shape)
+    ms = pymeshlab.MeshSet()
+    ms.add_mesh(pymeshlab.Mesh(pts, faces))
+    ms.compute_selection_by_self_intersections_per_face()
+    ref = ms.current_mesh().face_selection_array()
+    mask = self_intersecting_faces(pts, faces)
+    assert mask.sum() > 0
+    np.testing.assert_array_equal(mask, ref)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, "-v"]))
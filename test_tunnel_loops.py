@@ -24,6 +24,7 @@ empirically discovered while prototyping:
 Run with:   pytest test_tunnel_loops.py -v
 or simply:  python test_tunnel_loops.py
 """
+import json
 import numpy as np
 import networkx as nx
 import pytest
@@ -31,9 +32,10 @@ import pytest
 import os
 
 from tunnel_loop_extractor import (
-    mesh_genus, _genus_after_cut, _build_edges, _primal_forest,
+    mesh_genus, _genus_after_cut, build_topology, _primal_forest,
     _dual_forest, _generators, _loose_loop, extract_tight_cut_loops,
-    dual_crossing_loop,
+    dual_crossing_loop, homology_generators, _CutVerifier, _handle_patch,
+    _edge_csr, _tighten_loop,
 )
 
 
@@ -50,10 +52,10 @@ def _torus(major=3.0, minor=1.0, ms=48, ns=24):
     return pts, faces
 
 
-def _pinched_torus():
+def _pinched_torus(**torus_kw):
     """Torus with one minor-ring squeezed to a thin neck -> mimics the
     pierced-ear scanning artifact. The neck sits at theta == 0."""
-    pts, faces = _torus()
+    pts, faces = _torus(**torus_kw)
     th = np.arctan2(pts[:, 1], pts[:, 0])
     pinch = 0.15 + 0.85 * (1 - np.exp(-(th ** 2) / (2 * 0.12 ** 2)))
     cx, cy = 3.0 * np.cos(th), 3.0 * np.sin(th)
@@ -188,20 +190,20 @@ def test_extractor_returns_one_loop_for_genus1():
 
 
 def _tree_cotree_first_gen(pts, faces):
-    """Helper: return (gen_edge, elist, parent) for the first generator, so a
+    """Helper: return (gen_edge, edges, parent) for the first generator, so a
     test can reconstruct the loose loop for comparison."""
-    eid, elist, e2f, adj = _build_edges(pts, faces)
-    parent, intree = _primal_forest(len(pts), adj)
-    cotree = _dual_forest(len(faces), elist, e2f, intree)
-    gens = _generators(elist, e2f, intree, cotree)
+    topo = build_topology(pts, faces)
+    parent, intree = _primal_forest(topo)
+    cotree = _dual_forest(topo, intree)
+    gens = _generators(topo, intree, cotree)
     # return the first SEVERING generator to match the extractor's choice
     g0 = mesh_genus(pts, faces)
     for g in gens:
-        ll = _loose_loop(g, elist, parent)
+        ll = _loose_loop(g, topo.edges, parent)
         res = _genus_after_cut(pts, faces, ll)
         if res and res[0] < g0 and res[1] >= 2 and res[2] == 1:
-            return g, elist, parent
-    return gens[0], elist, parent
+            return g, topo.edges, parent
+    return gens[0], topo.edges, parent
 
 
 # ===========================================================================
@@ -326,6 +328,119 @@ def test_accept_condition_is_specific():
         assert is_sever(bad) is False
 
 
+# ===========================================================================
+# TOPOLOGY — the array-backed incidence every stage shares
+# ===========================================================================
+def test_mesh_topology_matches_face_incidence():
+    """MeshTopology must agree with a plain per-face edge count: every edge of
+    a closed torus has exactly 2 faces, edge ids are sorted (u < v) and
+    edge_ids() round-trips / rejects non-edges."""
+    pts, faces = _torus(ms=12, ns=8)
+    topo = build_topology(pts, faces)
+    ref = {}
+    for tri in faces:
+        a, b, c = int(tri[0]), int(tri[1]), int(tri[2])
+        for u, v in ((a, b), (b, c), (a, c)):
+            k = (min(u, v), max(u, v))
+            ref[k] = ref.get(k, 0) + 1
+    assert topo.n_e == len(ref)
+    assert [tuple(e) for e in topo.edges.tolist()] == sorted(ref)
+    assert np.all(topo.edge_face_count() == 2)
+    assert np.array_equal(
+        topo.edge_ids(topo.edges[:, 1], topo.edges[:, 0]), np.arange(topo.n_e))
+    assert topo.edge_ids([0], [0])[0] == -1
+    for fi in (0, len(faces) // 2, len(faces) - 1):
+        for ei in topo.face_edges[fi]:
+            assert fi in topo.edge_faces(ei)
+    nbr, eids = topo.vertex_edges(0)
+    assert np.all(np.diff(eids) > 0)
+    assert set(nbr.tolist()) == {v for (u, v) in ref if u == 0} | \
+        {u for (u, v) in ref if v == 0}
+
+
+def test_vectorized_generators_match_python_forests():
+    """homology_generators must build the SAME primal tree and cotree as the
+    deque BFS, hence the same b1 = 2g generator edges, also with shuffled
+    vertex/face order and several components."""
+    pts, faces = _torus(ms=20, ns=10)
+    rng = np.random.default_rng(0)
+    perm = rng.permutation(len(pts))
+    pts = pts[perm]
+    faces = np.argsort(perm)[faces][rng.permutation(len(faces))]
+    pts2 = np.vstack([pts, pts + 10.0])
+    faces2 = np.vstack([faces, faces + len(pts)])[:-7]   # second copy has a hole
+    for p, f in ((pts, faces), (pts2, faces2)):
+        topo = build_topology(p, f)
+        parent, intree = _primal_forest(topo)
+        cotree = _dual_forest(topo, intree)
+        gens = _generators(topo, intree, cotree)
+        v_parent, v_intree, v_cotree, v_gens = homology_generators(topo)
+        assert v_parent.tolist() == parent
+        assert set(np.flatnonzero(v_intree).tolist()) == intree
+        assert set(np.flatnonzero(v_cotree).tolist()) == cotree
+        assert v_gens.tolist() == gens
+    assert len(homology_generators(build_topology(pts, faces))[3]) == 2  # b1 = 2g
+
+
+def test_local_cut_verifier_matches_global_recount():
+    """_CutVerifier (band-local Euler delta) must return exactly what the
+    whole-mesh _genus_after_cut returns, for every good and bad fixture loop,
+    with and without its global component fallback."""
+    rng = np.random.default_rng(1)
+    for pts, faces in (_pinched_torus(), _sphere()):
+        topo = build_topology(pts, faces)
+        loops = [_single_triangle_loop(faces),
+                 _small_contractible_patch_loop(pts, faces),
+                 _wrong_class_dual_loop(pts, faces)]
+        loops += extract_tight_cut_loops(pts, faces, mesh_genus(pts, faces))
+        loops += [rng.choice(len(pts), k, replace=False) for k in (1, 5, 40)]
+        for budget in (None, 0):
+            verify = _CutVerifier(topo, faces, flood_budget=budget)
+            for lp in loops:
+                ref = _genus_after_cut(pts, faces, lp)
+                ref = None if ref is None else tuple(int(x) for x in ref)
+                assert verify(lp) == ref
+
+
+def test_handle_patch_tightens_locally_and_maps_back():
+    """A geodesic ball around a severing loose loop must contain the handle
+    (patch genus 1, loop severs inside it), and a loop tightened on the patch
+    must map back to mesh ids that sever the whole mesh."""
+    pts, faces = _pinched_torus()
+    gen_ei, edges, parent = _tree_cotree_first_gen(pts, faces)
+    loose = _loose_loop(gen_ei, edges, parent)
+    W = _edge_csr(pts, build_topology(pts, faces))
+    patch = _handle_patch(pts, faces, W, loose, max_frac=1.0)
+    assert patch is not None and patch.genus == 1
+    assert np.array_equal(patch.l2g[patch.local(loose)], loose)
+    tight = patch.l2g[_tighten_loop(patch.pts, patch.faces, patch.local(loose),
+                                    patch.W, patch.genus, verifier=patch.verifier)]
+    g_after, n_holes, n_comp = _genus_after_cut(pts, faces, tight)
+    assert g_after == 0 and n_holes == 2 and n_comp == 1
+    # the public switch: per-handle fallback keeps the result severing
+    lp = extract_tight_cut_loops(pts, faces, genus=1, local=True)[0]
+    assert _genus_after_cut(pts, faces, lp) == (0, 2, 1)
+
+
+def test_local_select_cuts_each_handle_ball_once(monkeypatch):
+    """With local=True the ball cut while tightening a handle is reused by its
+    dual-loop search, not cut (two Dijkstras, patch build, genus) again."""
+    import tunnel_loop_extractor as tle
+    from tunnel_loop_locator import select_cut_loop
+
+    pts, faces = _pinched_torus()
+    calls = []
+    real = tle._handle_patch
+
+    def counting(*args, **kw):
+        calls.append(1)
+        return real(*args, **kw)
+    monkeypatch.setattr(tle, "_handle_patch", counting)
+    pairs = select_cut_loop(pts, faces, 1, local=True)
+    assert len(pairs) == 1 and pairs[0]["B"] is not None
+    assert len(calls) == 1
+
+
 # ===========================================================================
 # DUAL LOOP B — the shortest loop crossing A at exactly one vertex
 # ===========================================================================
@@ -391,6 +506,349 @@ def test_dual_loop_matches_ground_truth_cut():
     assert dist < 2.0, f"cut loop centroid must match ground truth (got {dist:.2f} mm)"
 
 
+def test_parallel_select_matches_serial():
+    """workers>1 tightens handles in a process pool over a shared-memory mesh;
+    the result (loops, their order, classification) must equal the serial run."""
+    from tunnel_loop_locator import select_cut_loop
+    from shared_mesh import SharedMesh, attach_mesh
+
+    pts, faces = _pinched_torus()
+    with SharedMesh(pts, faces) as shm:
+        p2, f2 = attach_mesh(shm.handle)
+        assert np.array_equal(p2, pts) and np.array_equal(f2, faces)
+
+    serial = select_cut_loop(pts, faces, 1)
+    parallel = select_cut_loop(pts, faces, 1, workers=2)
+    assert len(parallel) == len(serial) == 1
+    for a, b in zip(serial, parallel):
+        assert list(a["cut"]) == list(b["cut"])
+        assert (a["avoid"] is None) == (b["avoid"] is None)
+        if a["avoid"] is not None:
+            assert list(a["avoid"]) == list(b["avoid"])
+
+
+def test_shared_mesh_topology_handle_and_cleanup():
+    """A handle carries the topology arrays (no rebuild in the consumer), the
+    locator accepts the handle in place of arrays, and the blocks are unlinked
+    on close() -- or when the owner is dropped without closing."""
+    import gc
+    from multiprocessing import shared_memory
+    from tunnel_loop_locator import select_cut_loop
+    from shared_mesh import SharedMesh, attach_topology
+
+    pts, faces = _pinched_torus()
+    topo = build_topology(pts, faces)
+    with SharedMesh(pts, faces, topo=topo) as shm:
+        t2 = attach_topology(shm.handle)
+        for name in topo.ARRAYS:
+            assert np.array_equal(getattr(t2, name), getattr(topo, name))
+        assert (t2.n_v, t2.n_f, t2.n_e) == (topo.n_v, topo.n_f, topo.n_e)
+        ref = select_cut_loop(pts, faces, 1)
+        got = select_cut_loop(shm.handle, None, 1)
+        assert [list(p["cut"]) for p in got] == [list(p["cut"]) for p in ref]
+        name = shm.handle["pts"][0]
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+    shm = SharedMesh(pts, faces)
+    name = shm.handle["faces"][0]
+    del shm
+    gc.collect()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_batched_disks_in_solid_match_per_loop_query():
+    """One batched inside/outside query over all loops gives exactly the
+    per-loop fractions (None loops pass through)."""
+    pv = pytest.importorskip("pyvista")
+    from tunnel_loop_locator import _as_pv, _disk_samples, disks_in_solid
+
+    pts, faces = _pinched_torus()
+    mesh_pv = _as_pv(pts, faces)
+    rng = np.random.default_rng(0)
+    loops = [rng.choice(len(pts), size=int(rng.integers(3, 30)), replace=False)
+             for _ in range(12)]
+    single = []
+    for lp in loops:
+        sel = pv.PolyData(_disk_samples(pts, lp, 7)).select_enclosed_points(
+            mesh_pv, tolerance=1e-6, check_surface=False)
+        single.append(float(np.asarray(sel["SelectedPoints"]).mean()))
+    batched = disks_in_solid(mesh_pv, pts, loops[:6] + [None] + loops[6:])
+    assert batched[6] is None
+    assert batched[:6] + batched[7:] == single
+    assert any(0.0 < f < 1.0 for f in single)
+
+
+def _smooth_patches_reference(pre_pts, keep_faces, new_pts, new_faces,
+                              *, iters, ring, lam, mu):
+    """Verbatim logic of the old per-vertex Python _smooth_patches."""
+    from scipy.spatial import cKDTree
+    edge_count = {}
+    for tri in keep_faces:
+        for a, b in ((tri[0], tri[1]), (tri[1], tri[2]), (tri[0], tri[2])):
+            k = (int(min(a, b)), int(max(a, b)))
+            edge_count[k] = edge_count.get(k, 0) + 1
+    rim_verts = {v for (a, b), c in edge_count.items() if c == 1 for v in (a, b)}
+    if not rim_verts:
+        return new_pts.copy()
+    _, idx = cKDTree(new_pts).query(pre_pts[sorted(rim_verts)], k=1)
+    sel = set(int(i) for i in idx)
+    adj = [set() for _ in range(len(new_pts))]
+    for tri in new_faces:
+        a, b, c = int(tri[0]), int(tri[1]), int(tri[2])
+        adj[a].update((b, c)); adj[b].update((a, c)); adj[c].update((a, b))
+    frontier = set(sel)
+    for _ in range(ring):
+        next_ring = set()
+        for v in frontier:
+            next_ring.update(adj[v])
+        next_ring -= sel
+        sel |= next_ring
+        frontier = next_ring
+    inner = sel - frontier
+    pts = new_pts.copy()
+    for _ in range(iters):
+        for step_lam in (lam, mu):
+            new_pos = pts.copy()
+            for v in inner:
+                nb = list(adj[v])
+                if nb:
+                    new_pos[v] = pts[v] + step_lam * (pts[nb].mean(0) - pts[v])
+            pts = new_pos
+    return pts
+
+
+def test_proxy_locate_projects_tight_loop_to_full_mesh():
+    """Coarse-to-fine: the loop found on a decimated proxy comes back as a
+    severing, simple loop of full-mesh vertices at the neck, no longer than its
+    projected progenitor; meshes too small to decimate use the plain search."""
+    pytest.importorskip("pymeshlab")
+    from tunnel_loop_locator import locate_cut_loops
+    from tunnel_loop_extractor import _loop_len
+
+    pts, faces = _pinched_torus(ms=160, ns=80)
+    msgs = []
+    got = locate_cut_loops(pts, faces, 1, proxy_faces=3000, with_loose=True,
+                           progress_cb=msgs.append)
+    assert any("proxy" in m for m in msgs)
+    assert len(got) == 1
+    tight, loose = got[0]
+    assert len(set(tight.tolist())) == len(tight)
+    assert _genus_after_cut(pts, faces, tight) == (0, 2, 1)
+    assert _loop_len(pts, tight) <= _loop_len(pts, loose) + 1e-9
+    c = pts[tight].mean(axis=0)
+    assert abs(np.arctan2(c[1], c[0])) < 0.3            # at the neck
+
+    small_pts, small_faces = _pinched_torus()
+    plain = locate_cut_loops(small_pts, small_faces, 1)
+    fallback = locate_cut_loops(small_pts, small_faces, 1, proxy_faces=len(small_faces))
+    assert [lp.tolist() for lp in fallback] == [lp.tolist() for lp in plain]
+
+
+def test_prepared_mesh_shares_topology_and_counts(monkeypatch):
+    """One PreparedMesh serves every tunnel entry point: the topology and the
+    Euler counts of the input mesh are computed once, and each result matches
+    the plain (pts, faces) call."""
+    import tunnel_loop_extractor as tle
+    from tunnel_loop_extractor import PreparedMesh
+    from tunnel_loop_locator import locate_cut_loops, select_cut_loop
+
+    pts, faces = _pinched_torus()
+    plain_tight = extract_tight_cut_loops(pts, faces, 1, local=True)
+    plain_locate = locate_cut_loops(pts, faces, 1, local=True)
+
+    calls = {"topo": 0, "counts": 0}
+    build, counts = tle.build_topology, tle._topo_counts
+
+    def counting_build(p, f):
+        calls["topo"] += 1
+        return build(p, f)
+
+    def counting_counts(f):
+        if len(f) == len(faces):
+            calls["counts"] += 1
+        return counts(f)
+
+    monkeypatch.setattr(tle, "build_topology", counting_build)
+    monkeypatch.setattr(tle, "_topo_counts", counting_counts)
+    mesh = PreparedMesh(pts, faces)
+    assert tle.mesh_genus(mesh, None) == mesh.genus == 1
+    tight = extract_tight_cut_loops(mesh, None, 1, local=True)
+    located = locate_cut_loops(mesh, None, 1, local=True)
+    pairs = select_cut_loop(mesh, None, 1, local=True)
+    assert calls == {"topo": 1, "counts": 1}
+    assert [lp.tolist() for lp in tight] == [lp.tolist() for lp in plain_tight]
+    assert [lp.tolist() for lp in located] == [lp.tolist() for lp in plain_locate]
+    assert len(pairs) == 1 and list(pairs[0]["A"]) == list(located[0])
+
+
+def test_sparse_smooth_patches_matches_reference():
+    """The sparse-Laplacian Taubin smoothing moves exactly the vertices the old
+    per-vertex loop moved, to the same positions."""
+    from tunnel_loop_extractor import _smooth_patches
+
+    pts, faces = _sphere(subdiv=4)
+    pts = pts + np.random.default_rng(0).normal(0, 0.01, pts.shape)
+    # "before capping": two patches removed; "after": the closed sphere
+    cen = pts[faces].mean(axis=1)
+    keep = faces[(np.abs(cen[:, 2]) < 0.8)]
+    for ring in (0, 1, 2, 3):
+        kw = dict(iters=5, ring=ring, lam=0.4, mu=0.2)
+        got = _smooth_patches(pts, keep, pts, faces, **kw)
+        ref = _smooth_patches_reference(pts, keep, pts, faces, **kw)
+        np.testing.assert_allclose(got, ref, rtol=0, atol=1e-12)
+        assert ring == 0 or not np.array_equal(got, pts)
+    # no rim: unchanged copy
+    got = _smooth_patches(pts, faces, pts, faces, iters=5, ring=2, lam=0.4, mu=0.2)
+    assert np.array_equal(got, pts) and got is not pts
+
+
+def test_local_cap_leaves_rest_of_mesh_untouched():
+    """The local cut & cap removes the handle watertight and self-intersection
+    free without going through the whole-mesh path, keeps every vertex away from
+    the neck bit-for-bit, and falls back to the whole-mesh cap when the patch
+    cannot be capped on its own."""
+    pytest.importorskip("pymeshfix")
+    pytest.importorskip("pymeshlab")
+    import tunnel_loop_extractor as tle
+    from tunnel_loop_extractor import cut_and_cap, cut_and_cap_loops, _topo_counts
+    from self_intersection import self_intersecting_faces
+
+    pts, faces = _pinched_torus()
+    pts = pts * 10.0                              # mm scale for the 1.5 mm remesh
+    th = np.abs(np.arctan2(pts[:, 1], pts[:, 0]))
+    lp = np.flatnonzero(th < th.min() + 1e-6)     # the meridian ring at the neck
+
+    def whole(*args, **kw):
+        raise AssertionError("local cap fell back to the whole mesh")
+
+    real_whole, real_local = tle._cap_whole, tle._cap_local
+    tle._cap_whole = whole
+    try:
+        new_pts, new_faces = cut_and_cap(pts, faces, lp)
+    finally:
+        tle._cap_whole = real_whole
+    assert mesh_genus(new_pts, new_faces) == 0
+    assert _topo_counts(new_faces)[3:] == (1, 0)          # one piece, no holes
+    assert not self_intersecting_faces(new_pts, new_faces).any()
+    far = th > 1.6                                # beyond the 8-ring patch
+    from scipy.spatial import cKDTree
+    dist, _ = cKDTree(new_pts).query(pts[far])
+    assert dist.max() == 0.0
+
+    tle._cap_local = lambda *args, **kw: None
+    msgs = []
+    try:
+        new_pts, new_faces = cut_and_cap_loops(pts, faces, [lp], progress_cb=msgs.append)
+    finally:
+        tle._cap_local = real_local
+    assert mesh_genus(new_pts, new_faces) == 0
+    assert tle.CAP_FALLBACK_MSG in msgs                 # the fallback is announced
+
+
+def test_cut_and_cap_cancel_and_atomic_save():
+    """The viewer's worker-side cut & cap reports its stages in order, leaves
+    the mesh file byte-for-byte untouched when cancelled at any stage or when
+    the cut fails, and only then replaces it (plus the sentinel)."""
+    pymeshlab = pytest.importorskip("pymeshlab")
+    pytest.importorskip("pymeshfix")
+    import tempfile
+    from mesh_problem_viewer import (compute_cut_and_cap, CutCapCancelled,
+                                     CUT_CAP_STAGES)
+
+    pts, faces = _pinched_torus()
+    pts = pts * 10.0
+    th = np.abs(np.arctan2(pts[:, 1], pts[:, 0]))
+    neck = np.flatnonzero(th < th.min() + 1e-6)
+
+    with tempfile.TemporaryDirectory() as md:
+        mesh_path = os.path.join(md, "aligned_head.ply")
+        ms = pymeshlab.MeshSet()
+        ms.add_mesh(pymeshlab.Mesh(pts, faces))
+        ms.save_current_mesh(mesh_path)
+        with open(mesh_path, "rb") as f:
+            original = f.read()
+
+        def untouched():
+            with open(mesh_path, "rb") as f:
+                assert f.read() == original
+            assert sorted(os.listdir(md)) == ["aligned_head.ply"]
+
+        for stop in range(CUT_CAP_STAGES + 1):      # every stage boundary
+            steps = []
+            with pytest.raises(CutCapCancelled):
+                compute_cut_and_cap(pts, faces, [neck], mesh_path,
+                                    progress_cb=lambda k, msg: steps.append(k),
+                                    cancelled=lambda: len(steps) >= stop)
+            untouched()
+
+        with pytest.raises(ValueError):
+            compute_cut_and_cap(pts, faces, [_single_triangle_loop(faces)], mesh_path)
+        untouched()
+
+        steps = []
+        new_pts, new_faces = compute_cut_and_cap(
+            pts, faces, [neck], mesh_path,
+            progress_cb=lambda k, msg: steps.append(k))
+        assert steps[0] == 1 and steps[-1] == CUT_CAP_STAGES
+        assert steps == sorted(steps) and len(set(steps)) == CUT_CAP_STAGES
+        ms = pymeshlab.MeshSet()
+        ms.load_new_mesh(mesh_path)
+        assert mesh_genus(ms.current_mesh().vertex_matrix(),
+                          ms.current_mesh().face_matrix()) == 0
+        with open(os.path.join(md, "cutcap_report.json")) as f:
+            assert json.load(f) == {"applied": True, "mesh": "aligned_head.ply"}
+
+
+def test_cut_pairs_cached_next_to_mesh():
+    """select_cut_loop results survive a JSON round trip, are served from the
+    per-mesh cache on reopen (no recomputation), and an edited mesh misses."""
+    import tempfile
+    import tunnel_loop_locator
+    from tunnel_loop_locator import (select_cut_loop, cut_pairs_to_json,
+                                     cut_pairs_from_json, cut_loop_cache_key)
+    pv = pytest.importorskip("pyvista")
+    from mesh_problem_viewer import compute_tunnel_data
+
+    pts, faces = _pinched_torus()
+    ref = select_cut_loop(pts, faces, 1)
+    assert len(ref[0]["loose"]) >= len(ref[0]["A"])
+    back = cut_pairs_from_json(json.loads(json.dumps(cut_pairs_to_json(ref))))
+    for a, b in zip(ref, back):
+        for k in ("cut", "avoid", "A", "B", "loose"):
+            assert (a[k] is None) == (b[k] is None)
+            if a[k] is not None:
+                assert np.array_equal(a[k], b[k]) and b[k].dtype == np.int64
+        assert a["scores"] == b["scores"]
+
+    calls = []
+    real = tunnel_loop_locator.select_cut_loop
+
+    def counting(*args, **kw):
+        calls.append(1)
+        return real(*args, **kw)
+
+    with tempfile.TemporaryDirectory() as md:
+        mesh_path = os.path.join(md, "aligned_head.ply")
+        tunnel_loop_locator.select_cut_loop = counting
+        try:
+            first = compute_tunnel_data(pts, faces, 1, mesh_path=mesh_path)
+            again = compute_tunnel_data(pts, faces, 1, mesh_path=mesh_path)
+            assert len(calls) == 1
+            assert os.path.exists(os.path.join(md, "aligned_head_tunnel_cache.json"))
+            assert [list(p["cut"]) for p in again["pairs"]] == \
+                [list(p["cut"]) for p in first["pairs"]]
+            moved = pts.copy()
+            moved[0] += 1e-3
+            assert (cut_loop_cache_key(moved, faces, 1)
+                    != cut_loop_cache_key(pts, faces, 1))
+            compute_tunnel_data(moved, faces, 1, mesh_path=mesh_path)
+            assert len(calls) == 2
+        finally:
+            tunnel_loop_locator.select_cut_loop = real
+
+
 # ---------------------------------------------------------------------------
 # Allow running without pytest
 # ---------------------------------------------------------------------------
@@ -0,0 +1,120 @@
+"""
+test_winding_number.py
+======================
+
+Tests for winding_number.WindingNumberTree, the hierarchical generalized
+winding-number engine behind point-in-solid queries. The exact sum
+(beta=inf) must reproduce the analytic 1 / 0 of a closed sphere, the far-field
+approximation must stay within its documented error at the default beta, and
+the inside decision must survive the small holes that break ray parity.
+
+Run with:   pytest test_winding_number.py -v
+or simply:  python test_winding_number.py
+"""
+import numpy as np
+import pytest
+
+from winding_number import WindingNumberTree, winding_numbers, points_inside
+
+
+def _sphere(radius=1.0, nu=64, nv=32):
+    """Closed UV sphere, outward-facing."""
+    th = np.linspace(0, np.pi, nv + 1)[1:-1]
+    ph = np.linspace(0, 2 * np.pi, nu, endpoint=False)
+    T, P = np.meshgrid(th, ph, indexing="ij")
+    ring = np.c_[(np.sin(T) * np.cos(P)).ravel(), (np.sin(T) * np.sin(P)).ravel(),
+                 np.cos(T).ravel()]
+    pts = np.vstack([[0, 0, 1], ring, [0, 0, -1]]) * radius
+    south = len(pts) - 1
+    faces = []
+    for j in range(nu):
+        k = (j + 1) % nu
+        faces.append([0, 1 + j, 1 + k])
+        faces.append([south, 1 + (nv - 2) * nu + k, 1 + (nv - 2) * nu + j])
+    for i in range(nv - 2):
+        for j in range(nu):
+            k = (j + 1) % nu
+            a, b = 1 + i * nu + j, 1 + i * nu + k
+            c, d = a + nu, b + nu
+            faces += [[a, c, b], [b, c, d]]
+    return pts, np.array(faces)
+
+
+def _queries(n=600, seed=0):
+    """Random points in and around the unit sphere, none within 0.05 of it
+    (the faceted surface sits up to ~0.005 inside the true one)."""
+    q = np.random.default_rng(seed).uniform(-1.5, 1.5, (n, 3))
+    r = np.linalg.norm(q, axis=1)
+    return q[np.abs(r - 1.0) > 0.05]
+
+
+def test_exact_sum_is_one_inside_zero_outside():
+    pts, faces = _sphere()
+    q = _queries()
+    w = WindingNumberTree(pts, faces)(q, beta=np.inf)
+    inside = np.linalg.norm(q, axis=1) < 1.0
+    np.testing.assert_allclose(w, inside.astype(float), atol=1e-9)
+
+
+def test_far_field_error_and_beta_knob():
+    pts, faces = _sphere()
+    q = _queries()
+    tree = WindingNumberTree(pts, faces)
+    exact = tree(q, beta=np.inf)
+    err = {beta: np.abs(tree(q, beta=beta) - exact).max() for beta in (1.5, 2.0, 3.0)}
+    assert err[2.0] < 0.05
+    assert err[3.0] <= err[2.0] <= err[1.5]
+    # chunking the queries never changes the answer
+    np.testing.assert_array_equal(tree(q, chunk=7), tree(q))
+
+
+def test_contains_and_orientation():
+    pts, faces = _sphere()
+    q = _queries()
+    inside = np.linalg.norm(q, axis=1) < 1.0
+    np.testing.assert_array_equal(points_inside(pts, faces, q), inside)
+    # flipped faces: the winding number changes sign
+    w = winding_numbers(pts, faces, q, beta=np.inf)
+    np.testing.assert_allclose(winding_numbers(pts, faces[:, ::-1], q, beta=np.inf),
+                               -w, atol=1e-9)
+
+
+def test_small_hole_keeps_decision():
+    pts, faces = _sphere()
+    # punch out a patch near the north pole: the surface is no longer closed
+    cen = pts[faces].mean(axis=1)
+    holed = faces[cen[:, 2] < 0.97]
+    assert len(holed) < len(faces)
+    q = _queries()
+    inside = np.linalg.norm(q, axis=1) < 1.0
+    away = q[:, 2] < 0.6                       # not looking through the hole
+    got = points_inside(pts, holed, q)
+    np.testing.assert_array_equal(got[away], inside[away])
+
+
+def test_degenerate_inputs():
+    pts, faces = _sphere(nu=8, nv=4)
+    q = _queries(50)
+    assert not WindingNumberTree(pts, faces[:0])(q).any()
+    # a mesh smaller than one leaf is summed exactly
+    w = WindingNumberTree(pts, faces, leaf_size=10 ** 6)(q)
+    np.testing.assert_allclose(w, WindingNumberTree(pts, faces)(q, beta=np.inf),
+                               atol=1e-12)
+
+
+def test_locator_winding_engine_matches_vtk_decision():
+    pytest.importorskip("pyvista")
+    from tunnel_loop_locator import select_cut_loop
+    from test_tunnel_loops import _pinched_torus
+
+    pts, faces = _pinched_torus()
+    vtk = select_cut_loop(pts, faces, 1)
+    wind = select_cut_loop(pts, faces, 1, inside_engine="winding")
+    assert len(vtk) == len(wind) == 1
+    assert list(vtk[0]["cut"]) == list(wind[0]["cut"])
+    assert abs(vtk[0]["scores"]["cut"] - wind[0]["scores"]["cut"]) < 0.1
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(pytest.main([__file__, "-v"]))
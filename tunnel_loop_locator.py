@@ -34,16 +34,28 @@ WHAT THIS GIVES YOU
   export_loops_for_blender(...) -> writes a .txt / .npy of loop vertex indices
   and world coordinates you can select in Blender (e.g. via a tiny bpy snippet).
 
-Depends only on numpy, scipy, networkx (already in your requirements).
+  cut_loop_cache_key / cut_pairs_to_json / cut_pairs_from_json -> persist
+  select_cut_loop results (the viewer keeps them next to the mesh, see
+  ProjectStore.read_cached_cut_pairs) so reopening the same mesh is instant.
+
+Depends only on numpy, scipy, networkx (already in your requirements);
+the optional coarse-to-fine mode (proxy_faces) also needs pymeshlab and
+silently runs at full resolution without it.
 The heavy lifting (tree-cotree, tightening, genus check) is imported from
 tunnel_loop_extractor.py so there is ONE source of truth for that logic.
 """
+import hashlib
+import json
+from itertools import islice
+
 import numpy as np
 import networkx as nx
+from scipy.sparse.csgraph import dijkstra as _scipy_dijkstra
 
 from tunnel_loop_extractor import (
-    mesh_genus, _build_edges, _primal_forest, _dual_forest, _generators,
-    _loose_loop, _tighten_loop, _genus_after_cut, _loop_len, _severs,
+    mesh_genus, build_topology, homology_generators, PreparedMesh, _prepared,
+    _loose_loop, _tighten_handle, _tighten_loop, _genus_after_cut, _loop_len,
+    _severs, _edge_csr, _PathRows, _CutVerifier, _cached_handle_patch,
     dual_crossing_loop,
 )
 
@@ -52,7 +64,8 @@ from tunnel_loop_extractor import (
 # LOCATE + TIGHTEN  (the reliable part)
 # ---------------------------------------------------------------------------
 def locate_cut_loops(pts, faces, genus, *, max_loops=5, progress_cb=None,
-                     with_loose=False):
+                     with_loose=False, topo=None, local=False, workers=None,
+                     proxy_faces=None):
     """
     Return a list of tight, severing cut loops (one per handle), each an
     ordered ndarray of vertex indices. Does NOT modify the mesh.
@@ -70,52 +83,276 @@ def locate_cut_loops(pts, faces, genus, *, max_loops=5, progress_cb=None,
     progenitor — callers can use it as a fallback when the tight loop is too
     small for dual-loop generation (e.g. degenerate 3-4 vertex rings produced
     by heavily-cleaned meshes). Default False preserves the original signature.
+
+    topo: optional prebuilt MeshTopology (tunnel_loop_extractor.build_topology)
+    shared with the caller's other per-mesh work.
+
+    local: tighten each handle on a geodesic ball around its loose loop instead
+    of the whole scan (see tunnel_loop_extractor._handle_patch); per-handle
+    fallback to the whole mesh when the ball does not contain the handle.
+
+    workers: tighten the candidate loops in a process pool of this size (mesh
+    arrays shared, not pickled -- see shared_mesh). Same loops, same order as
+    the serial path. None / 1 = serial.
+
+    proxy_faces: coarse-to-fine mode. Generators and tightening run on a
+    topology-preserving decimation of the mesh to about this many faces; each
+    tight proxy loop is projected back onto the full mesh, re-tightened in a
+    thin corridor around itself and sever-checked there (see _locate_proxy).
+    The full-resolution work then follows handle count, not scan density.
+    Falls back to the full-resolution search when the mesh is already small,
+    pymeshlab is missing, the decimation changes the genus or no projected
+    loop survives. workers is not used for the proxy search.
+
+    pts may instead be a shared_mesh.SharedMesh or its handle (faces=None):
+    the arrays -- and the topology, if one was published -- are attached
+    rather than copied, and a process pool reuses the same blocks. It may
+    also be a tunnel_loop_extractor.PreparedMesh (faces=None), whose topology
+    and genus are reused rather than recomputed.
     """
+    mesh, shared = _resolve_mesh(pts, faces, topo)
+    if proxy_faces:
+        loops = _locate_proxy(mesh, genus, proxy_faces, max_loops=max_loops,
+                              emit=_emitter(progress_cb), with_loose=with_loose,
+                              local=local)
+        if loops is not None:
+            return loops
+    if not (workers and workers > 1):
+        return _locate(mesh, genus, max_loops=max_loops, emit=_emitter(progress_cb),
+                       with_loose=with_loose, local=local)
+    with _HandlePool(mesh.pts, mesh.faces, workers, topo=mesh.topo,
+                     shared=shared) as pool:
+        return _locate(mesh, genus, max_loops=max_loops, emit=_emitter(progress_cb),
+                       with_loose=with_loose, local=local, pool=pool)
+
+
+def _resolve_mesh(pts, faces, topo):
+    """(PreparedMesh, handle) from arrays, a PreparedMesh or a shared-mesh
+    handle; handle is None unless a shared mesh was given."""
+    from shared_mesh import as_handle, attach_mesh, attach_topology
+    handle = as_handle(pts)
+    if handle is None:
+        return _prepared(pts, faces, topo), None
+    pts, faces = attach_mesh(handle)
+    if topo is None:
+        topo = attach_topology(handle)
+    return PreparedMesh(pts, faces, topo=topo), handle
+
+
+def _emitter(progress_cb):
     def _emit(msg):
         if progress_cb is not None:
             try:
                 progress_cb(msg)
             except Exception:
                 pass
+    return _emit
 
-    pts = np.asarray(pts, dtype=np.float64)
-    faces = np.asarray(faces)
-    g0 = mesh_genus(pts, faces)
+
+def _locate(mesh, genus, *, max_loops, emit, with_loose, local, pool=None,
+            patches=None):
+    """locate_cut_loops body on a PreparedMesh; with a _HandlePool the
+    candidates are tightened in parallel and then deduplicated in generator
+    order, which yields exactly the serial result. patches: handle-ball cache
+    for the serial path (see _tighten_handle); workers keep their own."""
+    pts, faces = mesh.arrays()
+    g0 = mesh.genus
     if g0 <= 0:
         return []
 
-    _emit("Building tree-cotree homology...")
-    eid, elist, e2f, adj = _build_edges(pts, faces)
-    parent, intree = _primal_forest(len(pts), adj)
-    cotree = _dual_forest(len(faces), elist, e2f, intree)
-    gens = _generators(elist, e2f, intree, cotree)
-    if not gens:
+    emit("Building tree-cotree homology...")
+    topo = mesh.topo
+    parent, _, _, gens = homology_generators(topo)
+    if not len(gens):
         return []
 
-    G = nx.Graph()
-    for (u, v) in elist:
-        G.add_edge(u, v, weight=float(np.linalg.norm(pts[u] - pts[v])))
+    W = _edge_csr(pts, topo)
+    rows = _PathRows(W)
+    verifier = _CutVerifier(topo, faces)
 
     want = min(genus, max_loops)
+    severing = (loose for loose in (_loose_loop(g, topo.edges, parent)
+                                    for g in gens.tolist())
+                if _severs(pts, faces, loose, g0, verifier))
     loops, centroids = [], []
-    for g in gens:
-        loose = _loose_loop(g, elist, parent)
-        if not _severs(pts, faces, loose, g0):
-            continue
-        _emit(f"Tightening cut loop {len(loops) + 1}/{want}...")
-        tight = _tighten_loop(pts, faces, loose, G, g0)
-        if not _severs(pts, faces, tight, g0):
-            tight = loose
-        c = pts[tight].mean(axis=0)
-        if any(np.linalg.norm(c - fc) < _loop_len(pts, tight) for fc in centroids):
-            continue
-        loops.append((tight, loose) if with_loose else tight)
-        centroids.append(c)
-        if len(loops) >= want:
+    if pool is None:
+        for loose in severing:
+            emit(f"Tightening cut loop {len(loops) + 1}/{want}...")
+            tight = _tighten_handle(pts, faces, loose, W, g0, verifier, rows,
+                                    local=local, patches=patches)
+            tight = _accept_loop(pts, faces, tight, loose, g0, verifier, centroids)
+            if tight is None:
+                continue
+            loops.append((tight, loose) if with_loose else tight)
+            if len(loops) >= want:
+                break
+        return loops
+
+    # parallel: tighten the next wave of candidates (at least one per worker),
+    # then accept/deduplicate them in generator order exactly as above
+    while len(loops) < want:
+        wave = list(islice(severing, max(want - len(loops), pool.workers)))
+        if not wave:
             break
+        emit(f"Tightening {len(wave)} candidate loop(s) on {pool.workers} workers...")
+        tights = pool.map(_tighten_task, [(lp, g0, local) for lp in wave],
+                          lambda n, tot: emit(f"Tightened candidate loop {n}/{tot}"))
+        for loose, tight in zip(wave, tights):
+            tight = _accept_loop(pts, faces, tight, loose, g0, verifier, centroids)
+            if tight is None:
+                continue
+            loops.append((tight, loose) if with_loose else tight)
+            if len(loops) >= want:
+                break
     return loops
 
 
+def _accept_loop(pts, faces, tight, loose, g0, verifier, centroids):
+    """Final sever check (fall back to the loose loop if tightening drifted)
+    and location dedup. Returns the loop to keep -- recording its centroid --
+    or None if an earlier loop already captured this handle."""
+    if not _severs(pts, faces, tight, g0, verifier):
+        tight = loose
+    c = pts[tight].mean(axis=0)
+    if any(np.linalg.norm(c - fc) < _loop_len(pts, tight) for fc in centroids):
+        return None
+    centroids.append(c)
+    return tight
+
+
+# ---------------------------------------------------------------------------
+# COARSE-TO-FINE: search a decimated proxy, refine on the full mesh
+# ---------------------------------------------------------------------------
+def _locate_proxy(mesh, genus, target, *, max_loops, emit, with_loose, local):
+    """locate_cut_loops on a decimated proxy, mapped back to `mesh`.
+
+    The proxy keeps a subset of the original vertices (_decimated_proxy), so
+    each tight proxy loop is a sequence of full-mesh vertices; consecutive
+    ones are joined by full-mesh shortest paths (_project_loop). That
+    projected loop is the `loose` progenitor: it must sever on the full mesh,
+    and it is then tightened only within a corridor a few proxy edges wide
+    (_refine_in_corridor) before the usual _accept_loop check and dedup.
+    Returns None when the caller should search at full resolution instead.
+    """
+    pts, faces = mesh.arrays()
+    g0 = mesh.genus
+    if g0 <= 0:
+        return []
+    emit(f"Decimating to a ~{int(target)}-face proxy...")
+    proxy = _decimated_proxy(pts, faces, target, g0)
+    if proxy is None:
+        return None
+    p_pts, p_faces, p2f = proxy
+    found = _locate(PreparedMesh(p_pts, p_faces), genus, max_loops=max_loops,
+                    emit=emit, with_loose=False, local=local)
+    if not found:
+        return None
+
+    emit("Refining proxy loop(s) on the full mesh...")
+    topo = mesh.topo
+    W = _edge_csr(pts, topo)
+    rows = _PathRows(W)
+    verifier = _CutVerifier(topo, faces)
+    # the projection error is about one proxy edge; give the corridor two
+    e = p_pts[p_faces[:, [1, 2, 0]]] - p_pts[p_faces]
+    width = 2.0 * float(np.linalg.norm(e, axis=2).mean())
+
+    loops, centroids = [], []
+    for k, p_loop in enumerate(found):
+        emit(f"Refining cut loop {k + 1}/{len(found)} at full resolution...")
+        loose = _project_loop(pts, p2f[np.asarray(p_loop)], rows)
+        if loose is None or not _severs(pts, faces, loose, g0, verifier):
+            continue
+        tight = _refine_in_corridor(pts, loose, W, g0, verifier, width)
+        tight = _accept_loop(pts, faces, tight, loose, g0, verifier, centroids)
+        if tight is not None:
+            loops.append((tight, loose) if with_loose else tight)
+    return loops or None
+
+
+def _decimated_proxy(pts, faces, target, g0):
+    """(proxy_pts, proxy_faces, proxy_to_full) from a topology-preserving
+    quadric decimation to ~target faces, or None when it is not worth it
+    (mesh under 2x target), pymeshlab is missing or the genus changed.
+
+    optimalplacement=False collapses every edge onto one of its endpoints, so
+    each proxy vertex IS a mesh vertex and proxy_to_full is an exact lookup."""
+    if len(faces) <= 2 * int(target):
+        return None
+    try:
+        import pymeshlab
+        from scipy.spatial import cKDTree
+        ms = pymeshlab.MeshSet()
+        ms.add_mesh(pymeshlab.Mesh(pts, np.asarray(faces, dtype=np.int32)))
+        ms.meshing_decimation_quadric_edge_collapse(
+            targetfacenum=int(target), preservetopology=True,
+            optimalplacement=False, preserveboundary=True, planarquadric=True)
+        cm = ms.current_mesh()
+        p_pts = np.asarray(cm.vertex_matrix(), dtype=np.float64)
+        p_faces = np.asarray(cm.face_matrix(), dtype=np.int64)
+    except Exception:
+        return None
+    if not len(p_faces) or mesh_genus(p_pts, p_faces) != g0:
+        return None
+    dist, p2f = cKDTree(pts).query(p_pts, k=1)
+    diag = float(np.linalg.norm(pts.max(axis=0) - pts.min(axis=0)))
+    if dist.max() > 1e-9 * max(diag, 1.0):
+        return None
+    return p_pts, p_faces, p2f.astype(np.int64)
+
+
+def _project_loop(pts, seq, rows, *, tries=4):
+    """Join consecutive mesh vertices `seq` (a proxy loop) into a closed
+    full-mesh loop with shortest paths, each first searched within 3x the
+    straight-line gap (doubled on a miss; sources solved in _PathRows
+    batches). Repeated vertices are shortcut so the loop stays simple. None
+    if some gap cannot be bridged."""
+    seq = seq[np.r_[True, seq[1:] != seq[:-1]]]
+    if len(seq) > 1 and seq[0] == seq[-1]:
+        seq = seq[:-1]
+    if len(seq) < 3:
+        return None
+    nxt = np.roll(seq, -1)
+    lim = 3.0 * np.linalg.norm(pts[nxt] - pts[seq], axis=1) + 1e-12
+    paths = [None] * len(seq)
+    todo = np.arange(len(seq))
+    for _ in range(tries):
+        rows.solve(seq[todo].tolist(), lim[todo].tolist())
+        for i in todo.tolist():
+            paths[i] = rows.path(int(seq[i]), int(nxt[i]))[1]
+        todo = np.array([i for i in todo.tolist() if paths[i] is None], dtype=np.int64)
+        if not len(todo):
+            break
+        lim[todo] *= 2.0
+    if len(todo):
+        return None
+    simple, at = [], {}
+    for x in (v for path in paths for v in path[:-1]):
+        if x in at:
+            for y in simple[at[x] + 1:]:
+                del at[y]
+            del simple[at[x] + 1:]
+        else:
+            at[x] = len(simple)
+            simple.append(x)
+    return np.array(simple, dtype=np.int64) if len(simple) >= 3 else None
+
+
+def _refine_in_corridor(pts, loose, W, g0, verifier, width):
+    """Tighten a projected loop on the vertices within `width` of it only: the
+    proxy already fixed which handle and roughly where, so the full-mesh
+    search is a thin band re-indexed as its own small graph, not a ball around
+    the whole handle. Severing is still checked on the whole mesh (verifier,
+    fed mesh ids); the corridor has no faces of its own, so none are passed."""
+    near = np.flatnonzero(np.isfinite(_scipy_dijkstra(
+        W, directed=False, indices=np.unique(loose), min_only=True, limit=width)))
+    g2l = np.full(len(pts), -1, dtype=np.int64)
+    g2l[near] = np.arange(len(near))
+    tight = _tighten_loop(pts[near], None, g2l[loose], W[near][:, near], g0,
+                          rounds=3, verifier=lambda lp: verifier(near[lp]))
+    return near[tight]
+
+
 # ---------------------------------------------------------------------------
 # CLASSIFY + SELECT  (calibrated against the user's ground-truth cut)
 # ---------------------------------------------------------------------------
@@ -128,7 +365,11 @@ def _as_pv(pts, faces):
     return pv.PolyData(np.asarray(pts, dtype=np.float64), cells)
 
 
-def disk_in_solid(mesh_pv, pts, loop, grid=7):
+# inside/outside engines for disks_in_solid
+INSIDE_ENGINES = ("vtk", "winding")
+
+
+def disk_in_solid(mesh_pv, pts, loop, grid=7, *, engine="vtk"):
     """Fraction of the loop's spanning disk that lies INSIDE the solid.
 
     Fan the loop to its centroid, sample each fan triangle on a barycentric
@@ -142,25 +383,89 @@ def disk_in_solid(mesh_pv, pts, loop, grid=7):
 
     Polarity pinned from the ground-truth cut (mesh-genus-1-cut-tunnel.ply):
     the user's chosen loop measured 1.0, the funnel loop 0.0. Threshold 0.5.
+
+    One loop; disks_in_solid classifies many in a single query.
     """
+    return disks_in_solid(mesh_pv, pts, [loop], grid=grid, engine=engine)[0]
+
+
+def disks_in_solid(mesh_pv, pts, loops, grid=7, *, engine="vtk"):
+    """disk_in_solid for every loop in `loops` (None entries give None) with ONE
+    inside/outside query over all their samples, so the surface's locator is
+    built once instead of once per loop. Each point's inside test is
+    independent, so the fractions equal the per-loop calls.
+
+    engine: "vtk" -- select_enclosed_points (ray parity; the calibrated
+    default); "winding" -- winding_number.WindingNumberTree (winding number
+    >= 0.5), which tolerates the small holes and flipped patches that flip a
+    parity test."""
+    if engine not in INSIDE_ENGINES:
+        raise ValueError(f"engine must be one of {INSIDE_ENGINES}, got {engine!r}")
     pts = np.asarray(pts, dtype=np.float64)
+    sets = [None if lp is None else _disk_samples(pts, lp, grid) for lp in loops]
+    live = [S for S in sets if S is not None]
+    if not live:
+        return [None] * len(loops)
+    if engine == "winding":
+        from winding_number import WindingNumberTree
+        tree = WindingNumberTree(np.asarray(mesh_pv.points),
+                                 mesh_pv.faces.reshape(-1, 4)[:, 1:])
+        inside = tree.contains(np.concatenate(live)).astype(np.float64)
+    else:
+        import pyvista as pv
+        sel = pv.PolyData(np.concatenate(live)).select_enclosed_points(
+            mesh_pv, tolerance=1e-6, check_surface=False)
+        inside = np.asarray(sel["SelectedPoints"], dtype=np.float64)
+    bounds = np.cumsum([0] + [len(S) for S in live])
+    fracs = iter(float(inside[i:j].mean()) for i, j in zip(bounds[:-1], bounds[1:]))
+    return [None if S is None else next(fracs) for S in sets]
+
+
+def _fan_weights(grid):
+    """(K, 2) barycentric (u, v) of the fan-triangle samples: a grid over
+    [0.08, 0.92]^2 kept where u + v < 1, u-major like the original loops."""
+    t = np.linspace(0.08, 0.92, grid)
+    u, v = np.meshgrid(t, t, indexing="ij")
+    keep = (u + v < 1.0).ravel()
+    return np.column_stack([u.ravel()[keep], v.ravel()[keep]])
+
+
+def _disk_samples(pts, loop, grid):
+    """(m*K, 3) samples of the loop's centroid fan, fan triangle by triangle."""
     P = pts[np.asarray(loop)]
     c = P.mean(0)
-    m = len(P)
-    samples = []
-    for i in range(m):
-        a, b = P[i], P[(i + 1) % m]
-        for u in np.linspace(0.08, 0.92, grid):
-            for v in np.linspace(0.08, 0.92, grid):
-                if u + v < 1.0:
-                    samples.append(c + u * (a - c) + v * (b - c))
-    import pyvista as pv
-    sel = pv.PolyData(np.asarray(samples)).select_enclosed_points(
-        mesh_pv, tolerance=1e-6, check_surface=False)
-    return float(np.asarray(sel["SelectedPoints"]).mean())
-
-
-def select_cut_loop(pts, faces, genus, *, threshold=0.5, max_loops=5, progress_cb=None):
+    a, b = P - c, np.roll(P, -1, axis=0) - c
+    w = _fan_weights(grid)
+    S = c + w[None, :, :1] * a[:, None, :] + w[None, :, 1:] * b[:, None, :]
+    return S.reshape(-1, 3)
+
+
+def _local_dual_loop(pts, faces, W, A, loose, patches=None):
+    """dual_crossing_loop(A) on the geodesic ball around the handle, mapped
+    back to mesh ids; None when no ball contains the handle or B is not found
+    inside it (the caller then searches the whole mesh). The ball comes from
+    `patches` when tightening already cut it."""
+    patch = _cached_handle_patch(pts, faces, W, loose, patches)
+    if patch is None or patch.local(A) is None:
+        return None
+    B = dual_crossing_loop(patch.pts, patch.faces, patch.local(A), topo=patch.topo)
+    return None if B is None else patch.l2g[B]
+
+
+def _dual_pair(pts, faces, topo, W, A, loose, local, emit, patches=None):
+    """Step 2 of select_cut_loop for ONE handle: the dual loop B (or None)."""
+    B = _local_dual_loop(pts, faces, W, A, loose, patches) if local else None
+    if B is None:
+        B = dual_crossing_loop(pts, faces, A, topo=topo)
+    if B is None and loose is not None and len(loose) > len(A):
+        # Tight loop A too degenerate for fan-split; retry on the loose loop.
+        emit(f"Dual loop retry on loose progenitor ({len(loose)} verts)...")
+        B = dual_crossing_loop(pts, faces, loose, topo=topo)
+    return B
+
+
+def select_cut_loop(pts, faces, genus, *, threshold=0.5, max_loops=5, progress_cb=None,
+                    local=False, workers=None, inside_engine="vtk", proxy_faces=None):
     """For each handle, return the dual loop pair labelled cut vs avoid.
 
     Pipeline:
@@ -174,51 +479,176 @@ def select_cut_loop(pts, faces, genus, *, threshold=0.5, max_loops=5, progress_c
          construction so it needs no further tightening.
       3. disk_in_solid classifies each; the loop with disk_in_solid >= threshold
          is the bridge-neck loop to CUT, the other is the funnel loop to AVOID.
+         All loops of all handles are scored in one batched query
+         (disks_in_solid).
 
     Returns a list (one entry per handle) of dicts:
       {"cut": ndarray, "avoid": ndarray, "scores": {"cut": float, "avoid": float},
-       "A": ndarray, "B": ndarray, "disk_A": float, "disk_B": float}
+       "A": ndarray, "B": ndarray, "loose": ndarray,
+       "disk_A": float, "disk_B": float}
+    `loose` is A's unshortened tree-cotree progenitor.
     If B cannot be generated even from the loose loop, falls back to
     {"cut": A, "avoid": None, ...} so the caller still gets the located loop.
-    """
-    def _emit(msg):
-        if progress_cb is not None:
-            try:
-                progress_cb(msg)
-            except Exception:
-                pass
 
-    pts = np.asarray(pts, dtype=np.float64)
-    faces = np.asarray(faces)
-    mesh_pv = _as_pv(pts, faces)
-    located = locate_cut_loops(pts, faces, genus, max_loops=max_loops,
-                               progress_cb=progress_cb, with_loose=True)
+    local: run tightening AND the dual-loop search on a geodesic ball around
+    each handle (ids mapped back to the full mesh); falls back to the whole
+    mesh per handle when the ball does not contain the handle.
+
+    workers: process-pool size for the per-handle work (tightening, then the
+    dual loop; scoring stays one batched query here). Workers read the mesh from shared
+    memory; progress_cb is still called from this process and the result
+    order matches the serial path. None / 1 = serial.
+
+    pts may instead be a shared_mesh.SharedMesh or its handle, or a
+    PreparedMesh (faces=None), as for locate_cut_loops.
+
+    inside_engine: point-in-solid test behind disk_in_solid ("vtk" or
+    "winding", see disks_in_solid).
+
+    proxy_faces: find the A loops coarse-to-fine on a decimated proxy, as in
+    locate_cut_loops; the dual loops and scores are computed on the full mesh.
+    """
+    _emit = _emitter(progress_cb)
+    mesh, shared = _resolve_mesh(pts, faces, None)
+    pts, faces = mesh.arrays()
+    topo = mesh.topo
+    W = _edge_csr(pts, topo) if local else None
+    located = None
+    if proxy_faces:
+        located = _locate_proxy(mesh, genus, proxy_faces, max_loops=max_loops,
+                                emit=_emit, with_loose=True, local=local)
+    if workers and workers > 1:
+        with _HandlePool(pts, faces, workers, topo=topo, shared=shared) as pool:
+            if located is None:
+                located = _locate(mesh, genus, max_loops=max_loops, emit=_emit,
+                                  with_loose=True, local=local, pool=pool)
+            _emit(f"Computing {len(located)} dual loop(s) on {pool.workers} workers...")
+            duals = pool.map(_pair_task, [(A, loose, local) for A, loose in located],
+                             lambda n, tot: _emit(f"Dual loop {n}/{tot} done"))
+    else:
+        patches = {}        # each handle's ball: cut while tightening, reused here
+        if located is None:
+            located = _locate(mesh, genus, max_loops=max_loops, emit=_emit,
+                              with_loose=True, local=local, patches=patches)
+        duals = []
+        for hi, (A, loose) in enumerate(located):
+            _emit(f"Computing dual loop {hi + 1}/{len(located)}...")
+            duals.append(_dual_pair(pts, faces, topo, W, A, loose, local, _emit,
+                                    patches))
+
+    # step 3: every A and B of every handle in one inside/outside query
+    if located:
+        _emit(f"Classifying {len(located)} loop pair(s)...")
+        disks = disks_in_solid(_as_pv(pts, faces), pts,
+                               [lp for (A, _), B in zip(located, duals) for lp in (A, B)],
+                               engine=inside_engine)
     results = []
-    for hi, (A, loose) in enumerate(located):
-        _emit(f"Computing dual loop {hi + 1}/{len(located)}...")
-        B = dual_crossing_loop(pts, faces, A)
-        if B is None and loose is not None and len(loose) > len(A):
-            # Tight loop A too degenerate for fan-split; retry on the loose loop.
-            _emit(f"Dual loop retry on loose progenitor ({len(loose)} verts)...")
-            B = dual_crossing_loop(pts, faces, loose)
-        disk_A = disk_in_solid(mesh_pv, pts, A)
+    for hi, ((A, loose), B) in enumerate(zip(located, duals)):
+        disk_A, disk_B = disks[2 * hi], disks[2 * hi + 1]
         if B is None:
             results.append({"cut": A, "avoid": None, "A": A, "B": None,
-                            "disk_A": disk_A, "disk_B": None,
+                            "loose": loose, "disk_A": disk_A, "disk_B": None,
                             "scores": {"cut": disk_A, "avoid": None}})
             continue
-        disk_B = disk_in_solid(mesh_pv, pts, B)
         # the loop to cut is the one whose spanning disk is inside the solid
         if disk_B >= disk_A:
             cut, avoid, sc, sa = B, A, disk_B, disk_A
         else:
             cut, avoid, sc, sa = A, B, disk_A, disk_B
         results.append({"cut": cut, "avoid": avoid, "A": A, "B": B,
-                        "disk_A": disk_A, "disk_B": disk_B,
+                        "loose": loose, "disk_A": disk_A, "disk_B": disk_B,
                         "scores": {"cut": sc, "avoid": sa}})
     return results
 
 
+# ---------------------------------------------------------------------------
+# PARALLEL: per-handle work in a process pool over a shared-memory mesh
+# ---------------------------------------------------------------------------
+class _HandlePool:
+    """ProcessPoolExecutor + SharedMesh for the per-handle tasks below.
+
+    Tasks receive the shared-mesh handle, never the arrays themselves; map()
+    returns results in submission order (so output is deterministic) and
+    reports completions through on_done(n_done, n_total) in THIS process.
+
+    The mesh (and `topo`, so workers skip the rebuild) is published for the
+    life of the pool, unless the caller already holds a handle (`shared`),
+    which is reused and left for the caller to close.
+    """
+
+    def __init__(self, pts, faces, workers, *, topo=None, shared=None):
+        from concurrent.futures import ProcessPoolExecutor
+        from shared_mesh import SharedMesh
+        self.workers = int(workers)
+        self.shm = None if shared is not None else SharedMesh(pts, faces, topo=topo)
+        self.handle = shared if shared is not None else self.shm.handle
+        try:
+            self.ex = ProcessPoolExecutor(max_workers=self.workers)
+        except Exception:
+            self.close()
+            raise
+
+    def map(self, fn, arg_tuples, on_done=None):
+        from concurrent.futures import as_completed
+        futs = [self.ex.submit(fn, self.handle, *args) for args in arg_tuples]
+        index = {f: i for i, f in enumerate(futs)}
+        out = [None] * len(futs)
+        for n, f in enumerate(as_completed(futs), 1):
+            out[index[f]] = f.result()
+            if on_done is not None:
+                on_done(n, len(futs))
+        return out
+
+    def close(self):
+        try:
+            if getattr(self, "ex", None) is not None:
+                self.ex.shutdown(wait=True, cancel_futures=True)
+        finally:
+            if self.shm is not None:
+                self.shm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# per-worker-process cache: derived structures for the attached mesh, built
+# once per process rather than once per task
+_WORKER_MESH = {}
+
+
+def _worker_mesh(handle):
+    from shared_mesh import attach_mesh, attach_topology
+    key = handle["pts"][0]
+    st = _WORKER_MESH.get(key)
+    if st is None:
+        _WORKER_MESH.clear()
+        pts, faces = attach_mesh(handle)
+        topo = attach_topology(handle) or build_topology(pts, faces)
+        st = {"pts": pts, "faces": faces, "topo": topo, "W": _edge_csr(pts, topo)}
+        _WORKER_MESH[key] = st
+    return st
+
+
+def _tighten_task(handle, loose, g0, local):
+    st = _worker_mesh(handle)
+    if "verifier" not in st:
+        st["verifier"] = _CutVerifier(st["topo"], st["faces"])
+    return _tighten_handle(st["pts"], st["faces"], loose, st["W"], g0,
+                           st["verifier"], _PathRows(st["W"]), local=local,
+                           patches=st.setdefault("patches", {}))
+
+
+def _pair_task(handle, A, loose, local):
+    # a ball this worker cut while tightening is reused; another worker's is not
+    st = _worker_mesh(handle)
+    return _dual_pair(st["pts"], st["faces"], st["topo"], st["W"],
+                      A, loose, local, lambda msg: None,
+                      st.setdefault("patches", {}))
+
+
 # ---------------------------------------------------------------------------
 # EXPERIMENTAL: score which loop of a handle pair is the 'bridge neck'
 # ---------------------------------------------------------------------------
@@ -295,6 +725,56 @@ def score_loop_quality(pts, faces, loop, vertex_normals=None):
     }
 
 
+# ---------------------------------------------------------------------------
+# RESULT CACHE  (select_cut_loop output, persisted by the viewer)
+# ---------------------------------------------------------------------------
+# Bump whenever a change here alters what select_cut_loop returns for the same
+# mesh; every cached result then misses.
+CUT_LOOP_VERSION = 1
+
+_PAIR_LOOPS = ("cut", "avoid", "A", "B", "loose")
+
+
+def cut_loop_cache_key(pts, faces, genus, **params):
+    """blake2b of the (cleaned) pts/faces bytes + CUT_LOOP_VERSION + genus and
+    every select_cut_loop parameter that changes the result."""
+    pts = np.ascontiguousarray(pts, dtype=np.float64)
+    faces = np.ascontiguousarray(faces, dtype=np.int64)
+    h = hashlib.blake2b(digest_size=20)
+    h.update(np.asarray(pts.shape + faces.shape, dtype=np.int64).tobytes())
+    h.update(pts.tobytes())
+    h.update(faces.tobytes())
+    params = dict(params, genus=int(genus))
+    return f"v{CUT_LOOP_VERSION}:{h.hexdigest()}:{json.dumps(params, sort_keys=True)}"
+
+
+def cut_pairs_to_json(pairs):
+    """select_cut_loop output -> JSON-safe list (loops as int lists)."""
+    out = []
+    for p in pairs:
+        d = {k: (None if p.get(k) is None else [int(v) for v in p[k]])
+             for k in _PAIR_LOOPS}
+        for k in ("disk_A", "disk_B"):
+            d[k] = None if p.get(k) is None else float(p[k])
+        d["scores"] = {k: (None if v is None else float(v))
+                       for k, v in p["scores"].items()}
+        out.append(d)
+    return out
+
+
+def cut_pairs_from_json(data):
+    """Inverse of cut_pairs_to_json: loops back to int64 ndarrays."""
+    out = []
+    for d in data:
+        p = dict(d)
+        for k in _PAIR_LOOPS:
+            if p.get(k) is not None:
+                p[k] = np.asarray(p[k], dtype=np.int64)
+        p["scores"] = dict(d["scores"])
+        out.append(p)
+    return out
+
+
 # ---------------------------------------------------------------------------
 # EXPORT for manual cutting in Blender
 # ---------------------------------------------------------------------------
@@ -361,18 +841,18 @@ if __name__ == "__main__":
     ap.add_argument("--out", default="cut", help="output prefix")
     ap.add_argument("--score", action="store_true",
                     help="also print experimental loop-quality descriptors")
+    ap.add_argument("--proxy-faces", type=int, default=None,
+                    help="locate loops on a decimated proxy of ~N faces first "
+                         "(coarse-to-fine; for dense scans)")
     args = ap.parse_args()
 
-    import pyvista as pv
-    from tunnel_loop_extractor import load_mesh
-    m = pv.read(args.mesh).triangulate().clean()
-    pts = np.asarray(m.points, dtype=np.float64)
-    faces = m.faces.reshape(-1, 4)[:, 1:].astype(np.int64)
-    g = args.genus if args.genus is not None else mesh_genus(pts, faces)
-    print(f"V={len(pts)} F={len(faces)} genus={mesh_genus(pts, faces)} "
+    mesh = PreparedMesh.load(args.mesh)
+    pts, faces = mesh.arrays()
+    g = args.genus if args.genus is not None else mesh.genus
+    print(f"V={len(pts)} F={len(faces)} genus={mesh.genus} "
           f"(using genus={g})")
 
-    pairs = select_cut_loop(pts, faces, g)
+    pairs = select_cut_loop(mesh, None, g, proxy_faces=args.proxy_faces)
     print(f"located {len(pairs)} handle(s); for each, the dual loop pair "
           f"(disk_in_solid >= 0.5 = CUT this, the bridge neck):")
     cut_loops = []
@@ -0,0 +1,198 @@
+"""winding_number — inside/outside queries against a triangle mesh.
+
+Generalized winding number (Jacobson et al. 2013) of many query points at
+once, with the hierarchical far-field approximation of Barill et al. 2018
+("Fast Winding Numbers for Soups and Clouds"):
+
+    w(q) = 1/(4 pi) * sum over faces of the solid angle the face subtends at q
+
+w is ~1 inside a closed, outward-oriented surface and ~0 outside, and it
+degrades gracefully on the defects raw scans have (small holes, slivers,
+duplicated or flipped patches) -- where a ray-parity test such as
+select_enclosed_points flips whole regions, w just drifts away from 0/1.
+
+    tree = WindingNumberTree(pts, faces)         # build once per mesh
+    w = tree(queries)                            # (Q,) float
+    inside = tree.contains(queries)              # (Q,) bool, w >= 0.5
+
+    winding_numbers(pts, faces, queries)         # one-shot helpers
+    points_inside(pts, faces, queries)
+
+Tree: faces are sorted along a Morton curve of their centroids and split into
+an IMPLICIT balanced binary tree -- node k of level L holds the sorted range
+[k*F / 2^L, (k+1)*F / 2^L) -- so every level's aggregates (area-weighted
+normal sum, area-weighted centre, bounding radius) are one np.add.reduceat.
+
+Query: a level-synchronous traversal of (query, node) pairs. A node whose
+centre is farther than beta * radius from the query contributes its dipole
+term N . (c - q) / (4 pi |c - q|^3); nearer nodes open; leaves are summed
+exactly (Van Oosterom-Strackee solid angle). The expansion stops at the
+dipole: at the acceptance ratios used here the second-order term overshoots
+on curved patches and measured no better.
+
+Precision/speed knob: beta. Larger is more accurate and slower; beta=inf is
+the exact O(Q*F) sum. On a 180k-face sphere the worst error over points
+anywhere inside or near it is ~0.09 at beta=1.5, ~0.04 at the default 2.0
+and ~0.016 at 3.0 (median ~1e-3) -- far from the 0.5 inside/outside
+threshold except for points practically on the surface.
+
+numpy only; never imports pymeshlab / VTK.
+"""
+
+import numpy as np
+
+_FOUR_PI = 4.0 * np.pi
+
+
+class WindingNumberTree:
+    """Far-field hierarchy for one mesh; call it with query points.
+
+    leaf_size: faces per leaf (at most); smaller leaves mean more far-field
+    nodes and less exact work, at a deeper traversal.
+    """
+
+    def __init__(self, pts, faces, *, leaf_size=8):
+        pts = np.asarray(pts, dtype=np.float64)
+        faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+        leaf_size = max(int(leaf_size), 2)
+        tri = pts[faces]
+        self.starts, self.centers, self.normals, self.radii = [], [], [], []
+        self.tri, self.n_f, self.depth = tri, len(tri), 0
+        if not len(tri):
+            return
+        cen = tri.mean(axis=1)
+        order = np.argsort(_morton_codes(cen), kind="stable")
+        tri, cen = tri[order], cen[order]
+        self.tri = tri                                   # (F, 3, 3) sorted
+        n_f = self.n_f
+
+        # area-weighted normals (the dipole moments) and areas
+        an = 0.5 * np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+        area = np.linalg.norm(an, axis=1)
+
+        # deepest level whose nodes still hold >= leaf_size / 2 >= 1 faces
+        self.depth = depth = (int(np.ceil(np.log2(n_f / leaf_size)))
+                              if n_f > leaf_size else 0)
+        for level in range(depth + 1):
+            n_nodes = 1 << level
+            starts = (np.arange(n_nodes + 1, dtype=np.int64) * n_f) >> level
+            s = starts[:-1]
+            a_sum = np.add.reduceat(area, s)
+            c_sum = np.add.reduceat(area[:, None] * cen, s, axis=0)
+            sizes = np.diff(starts)
+            plain = np.add.reduceat(cen, s, axis=0) / sizes[:, None]
+            # area-weighted centre; the plain centroid for all-degenerate nodes
+            center = np.where(a_sum[:, None] > 0,
+                              c_sum / np.where(a_sum > 0, a_sum, 1.0)[:, None], plain)
+            node = np.repeat(np.arange(n_nodes), sizes)
+            far = np.linalg.norm(tri - center[node][:, None, :], axis=2).max(axis=1)
+            self.starts.append(starts)
+            self.centers.append(center)
+            self.normals.append(np.add.reduceat(an, s, axis=0))
+            self.radii.append(np.maximum.reduceat(far, s))
+
+    def __call__(self, queries, *, beta=2.0, chunk=8192):
+        """Winding number at each query point, (Q,) float.
+
+        beta: far-field acceptance ratio (node used as a dipole once the query
+        is beyond beta * its radius). np.inf gives the exact sum.
+        chunk: queries traversed together (bounds the frontier's memory).
+        """
+        q = np.asarray(queries, dtype=np.float64).reshape(-1, 3)
+        out = np.zeros(len(q))
+        if self.n_f == 0:
+            return out
+        for i in range(0, len(q), chunk):
+            out[i:i + chunk] = self._query(q[i:i + chunk], float(beta))
+        return out
+
+    def contains(self, queries, *, beta=2.0, threshold=0.5):
+        """Boolean inside mask: winding number >= threshold."""
+        return self(queries, beta=beta) >= threshold
+
+    def _query(self, q, beta):
+        n = len(q)
+        w = np.zeros(n)
+        qi = np.arange(n)
+        node = np.zeros(n, dtype=np.int64)
+        for level in range(self.depth + 1):
+            if not len(qi):
+                break
+            d = self.centers[level][node] - q[qi]
+            r2 = np.einsum("ij,ij->i", d, d)
+            far = r2 > (beta * self.radii[level][node]) ** 2
+            if far.any():
+                df, rf = d[far], r2[far]
+                dip = np.einsum("ij,ij->i", df, self.normals[level][node[far]])
+                w += np.bincount(qi[far], weights=dip / (rf * np.sqrt(rf)),
+                                 minlength=n) / _FOUR_PI
+            qi, node = qi[~far], node[~far]
+            if level < self.depth:
+                qi = np.repeat(qi, 2)
+                node = (2 * node[:, None] + np.array([0, 1])).ravel()
+        if len(qi):
+            w += self._exact_leaves(q, qi, node)
+        return w
+
+    def _exact_leaves(self, q, qi, leaf, batch=1 << 20):
+        """Exact solid-angle sum over the faces of each (query, leaf) pair,
+        ~batch (query, face) pairs at a time."""
+        starts = self.starts[self.depth]
+        w = np.zeros(len(q))
+        cnt = starts[leaf + 1] - starts[leaf]
+        csum = np.cumsum(cnt)
+        i0 = 0
+        while i0 < len(qi):
+            base = csum[i0 - 1] if i0 else 0
+            i1 = max(int(np.searchsorted(csum, base + batch, side="right")), i0 + 1)
+            c = cnt[i0:i1]
+            face = (np.repeat(starts[leaf[i0:i1]] - (np.cumsum(c) - c), c)
+                    + np.arange(int(c.sum())))
+            qq = np.repeat(qi[i0:i1], c)
+            w += np.bincount(qq, weights=_solid_angles(self.tri[face], q[qq]),
+                             minlength=len(q))
+            i0 = i1
+        return w / _FOUR_PI
+
+
+def winding_numbers(pts, faces, queries, *, beta=2.0, leaf_size=8):
+    """One-shot: build the tree and return the (Q,) winding numbers."""
+    return WindingNumberTree(pts, faces, leaf_size=leaf_size)(queries, beta=beta)
+
+
+def points_inside(pts, faces, queries, *, beta=2.0, threshold=0.5):
+    """One-shot boolean inside mask (winding number >= threshold)."""
+    return WindingNumberTree(pts, faces).contains(queries, beta=beta,
+                                                  threshold=threshold)
+
+
+def _solid_angles(T, q):
+    """Signed solid angle of each triangle T[i] seen from q[i] (Van Oosterom &
+    Strackee); positive when the face's normal points away from q."""
+    a, b, c = T[:, 0] - q, T[:, 1] - q, T[:, 2] - q
+    la, lb, lc = (np.linalg.norm(x, axis=1) for x in (a, b, c))
+    num = np.einsum("ij,ij->i", a, np.cross(b, c))
+    den = (la * lb * lc + np.einsum("ij,ij->i", a, b) * lc
+           + np.einsum("ij,ij->i", b, c) * la + np.einsum("ij,ij->i", c, a) * lb)
+    return 2.0 * np.arctan2(num, den)
+
+
+def _morton_codes(p):
+    """63-bit Morton codes of points quantised to 21 bits per axis."""
+    lo = p.min(axis=0)
+    ext = float((p.max(axis=0) - lo).max()) or 1.0
+    g = np.minimum(((p - lo) / ext * (1 << 21)).astype(np.uint64), (1 << 21) - 1)
+    code = np.zeros(len(p), dtype=np.uint64)
+    for axis in range(3):
+        code |= _spread_bits(g[:, axis]) << np.uint64(axis)
+    return code
+
+
+def _spread_bits(x):
+    """Insert two zero bits between each of the low 21 bits of x."""
+    x = x & np.uint64(0x1FFFFF)
+    for shift, mask in ((32, 0x1F00000000FFFF), (16, 0x1F0000FF0000FF),
+                        (8, 0x100F00F00F00F00F), (4, 0x10C30C30C30C30C3),
+                        (2, 0x1249249249249249)):
+        x = (x | (x << np.uint64(shift))) & np.uint64(mask)
+    return x